@@ -10,7 +10,16 @@ from akgraph.components import *
 from akgraph.core import *
 from akgraph.degree import *
 from akgraph.generators import *
+from akgraph.hubs import *
+from akgraph.ingest import *
+from akgraph.laplacian import *
 from akgraph.mis import *
 from akgraph.msf import *
+from akgraph.ordering import *
+from akgraph.outofcore import *
+from akgraph.planning import *
+from akgraph.summary import *
 from akgraph.traversal import *
 from akgraph.util import *
+from akgraph.vertex_program import *
+from akgraph.walks import *
@@ -3,13 +3,16 @@
 __all__ = ["eigenvector_centrality", "hub_auth", "pagerank"]
 
 
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 from warnings import warn
 
 import numpy as np
 
 import arkouda as ak
 
+from akgraph.hubs import adjacency
+from akgraph.util import graph_index
+
 
 def eigenvector_centrality(
     V: ak.pdarray,
@@ -17,6 +20,7 @@ def eigenvector_centrality(
     W: Optional[ak.pdarray] = None,
     max_iter: int = 100,
     tol: float = 1e-08,
+    hub_threshold: Union[int, str, None] = 'auto'
 ) -> Tuple[float, ak.pdarray]:
     """
     Compute the eigenvector centrality a graph.
@@ -43,6 +47,8 @@ def eigenvector_centrality(
         maximum number of iterations in power method
     tol : float (default 1.0e-8)
         tolerance for convergence test
+    hub_threshold : { int | 'auto' | None } (default 'auto')
+        split nodes with larger degree into sub-nodes, see `adjacency`
 
     Returns
     -------
@@ -66,24 +72,19 @@ def eigenvector_centrality(
     Power and Centrality: A Family of Measures.
         Phillip Bonacich. American Journal of Sociology 92(5):1170-1182, 1986
     """
-    n = max(V.max(), U.max()) + 1
-
-    v_sorted, u_sorted = V.is_sorted(), U.is_sorted()
-    gV = ak.GroupBy(V, assume_sorted=v_sorted)
-    gU = ak.GroupBy(U, assume_sorted=u_sorted)
-    v_nodes, u_nodes = gV.unique_keys, gU.unique_keys
+    index = graph_index(V, U, W)
+    n = index.n
+    A = adjacency(V, U, W, shape=(n, n), hub_threshold=hub_threshold,
+                  index=index)
 
     e = ak.ones(n, 'float64') / np.sqrt(n)
     e_prev = ak.zeros_like(e)
 
     for _ in range(max_iter):
         e_prev[:] = e[:]
-        e[:] = 0
 
         # e = A @ e
-        e_edge = gU.broadcast(e_prev[u_nodes], permute=(not u_sorted))
-        _, new_e = gV.sum(W * e_edge) if W is not None else gV.sum(e_edge)
-        e[v_nodes] = new_e
+        A(e_prev, out=e, sparse=False)
 
         # calculate eigenvalue and normalize
         # assuming e_prev == e and |e| == 1 ==> e.T @ A @ e = lambda
@@ -105,7 +106,8 @@ def hub_auth(
     U: ak.pdarray,
     W: Optional[ak.pdarray] = None,
     max_iter: int = 100,
-    tol: float = 1.0e-8
+    tol: float = 1.0e-8,
+    hub_threshold: Union[int, str, None] = 'auto'
 ) -> Tuple[ak.pdarray]:
     """
     Returns HITS hubs and authorities values for nodes.
@@ -126,6 +128,8 @@ def hub_auth(
         maximum number of iterations in power method
     tol : float (default 1.0e-8)
         tolerance for convergence test
+    hub_threshold : { int | 'auto' | None } (default 'auto')
+        split nodes with larger degree into sub-nodes, see `adjacency`
 
     Returns
     -------
@@ -161,30 +165,24 @@ def hub_auth(
         doi:10.1145/324133.324140.
         http://www.cs.cornell.edu/home/kleinber/auth.pdf.
     """
-    n = max(V.max(), U.max()) + 1
-
-    v_sorted, u_sorted = V.is_sorted(), U.is_sorted()
-    gV = ak.GroupBy(V, assume_sorted=v_sorted)
-    gU = ak.GroupBy(U, assume_sorted=u_sorted)
-    v_nodes, u_nodes = gV.unique_keys, gU.unique_keys
-
-    h, a_prev = ak.zeros(n, 'float64'), ak.zeros(n, 'float64')
+    index = graph_index(V, U, W)
+    n = index.n
+    A = adjacency(V, U, W, shape=(n, n), hub_threshold=hub_threshold,
+                  index=index)
+    A_T = adjacency(U, V, W, shape=(n, n), hub_threshold=hub_threshold,
+                    index=index)
+
+    a_prev = ak.zeros(n, 'float64')
     a = ak.ones(n, 'float64') / np.sqrt(n)
 
     for _ in range(max_iter):
         a_prev[:] = a[:]
-        a[:] = 0
-        h[:] = 0
 
         # O operation: h = A @ a
-        a_edge = gU.broadcast(a_prev[u_nodes], permute=(not u_sorted))
-        _, new_h = gV.sum(W * a_edge) if W is not None else gV.sum(a_edge)
-        h[v_nodes] = new_h
+        h = A(a_prev, sparse=False)
 
         # I operation: a = A.T @ h
-        h_edge = gV.broadcast(h[v_nodes], permute=(not v_sorted))
-        _, new_a = gU.sum(W * h_edge) if W is not None else gU.sum(h_edge)
-        a[u_nodes] = new_a
+        a = A_T(h, sparse=False)
 
         # normalize results
         a_norm, h_norm = np.sqrt(ak.sum(a * a)), np.sqrt(ak.sum(h * h))
@@ -208,7 +206,8 @@ def pagerank(
     x_start: Optional[ak.pdarray] = None,
     max_iter: int = 100,
     alpha: float = 0.85,
-    tol: float = 1.0e-8
+    tol: float = 1.0e-8,
+    hub_threshold: Union[int, str, None] = 'auto'
 ) -> ak.pdarray:
     """
     Compute the PageRank centrality for all nodes.
@@ -237,6 +236,8 @@ def pagerank(
         damping factor
     tol : float (default 1.0e-8)
         tolerance for convergance test
+    hub_threshold : { int | 'auto' | None } (default 'auto')
+        split nodes with larger degree into sub-nodes, see `adjacency`
 
     Return
     ------
@@ -275,27 +276,20 @@ def pagerank(
             raise ValueError(f'Bad starting vector.')
         y = x_start / x_start.sum()
 
-    v_sorted = V.is_sorted()
-    gV = ak.GroupBy(V, assume_sorted=v_sorted)
-    gU = ak.GroupBy(U, assume_sorted=U.is_sorted())
-    if W is None:
-        v_nodes, deg = gV.count()
-        W = gV.broadcast(1.0 / deg, permute=(not v_sorted))
-    else:
-        v_nodes, deg = gV.sum(W)
-        W = W * gV.broadcast(1.0 / deg, permute=(not v_sorted))
-    is_dangling = ak.ones(n, 'bool')
-    is_dangling[v_nodes] = 0
+    # (weighted) out degrees and the transposed random walk matrix
+    index = graph_index(V, U, W)
+    deg = index.out_weight
+    is_dangling = (deg == 0)
+    W = (W if W is not None else 1.0) / deg[V]
+    L_rw = adjacency(U, V, W, shape=(n, n), hub_threshold=hub_threshold,
+                     index=index)
 
     x = ak.zeros_like(y)
     for _ in range(max_iter):
         x[:] = y[:]
-        y[:] = 0
 
         # y = a * x @ L_rw
-        x_edge = gV.broadcast(x[v_nodes], permute=(not v_sorted))
-        u_nodes, xu = gU.sum(x_edge * W)
-        y[u_nodes] = xu
+        L_rw(x, out=y, sparse=False)
         y *= alpha
 
         # y += a * w_dangling * p  - (1 - a) * p
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Algorithms for determining connected components of graphs.
 
-Edges must be symmetric (u, v) <==> (v, u).
+Edges must be symmetric (u, v) <==> (v, u), except for `scc` which finds the
+strongly connected components of a directed graph.
 
 TODOS
 -----
@@ -9,7 +10,7 @@ TODOS
 - Create generic `concomp` method (maybe use fast_sv for a few iterations then
   seed that to bfs_lp_rs).
 """
-__all__ = ["bfs_lp", "bfs_lp_rs", "fast_sv", "lps"]
+__all__ = ["bfs_lp", "bfs_lp_rs", "fast_sv", "lps", "scc"]
 
 
 from typing import Tuple, Union
@@ -18,8 +19,9 @@ from warnings import warn
 import numpy as np
 
 import arkouda as ak
+from aksolve.semiring import MIN_SELECT2ND, OR_AND, SpMV
 
-from akgraph.util import get_perm, minimum
+from akgraph.util import get_perm, graph_index, minimum
 
 
 _WARN = ("Componenents likely incorrect.\n"
@@ -110,7 +112,8 @@ def bfs_lp_rs(V: ak.pdarray, U: ak.pdarray, max_steps=100) -> Tuple[int, ak.pdar
 def fast_sv(
     V: ak.pdarray,
     U: ak.pdarray,
-    max_steps: Union[int, None] = 100
+    max_steps: Union[int, None] = 100,
+    symmetrize: bool = False
 ) -> Tuple[int, ak.pdarray]:
     """
     Calculate connected components of a graph.
@@ -125,6 +128,10 @@ def fast_sv(
         in nodes
     max_steps :  Union[int, None] (default 100)
         quit after this many steps
+    symmetrize : bool (default False)
+        follow edges both ways (weak components of a directed graph). Hooks
+        through A and A.T of the same `graph_index` instead of building the
+        symmetric edge list.
 
     Returns
     -------
@@ -143,16 +150,20 @@ def fast_sv(
         algebra. Yongzhe Zhang, Ariful Azad, Aydin Buluc.  Journal of Parallel
         and Distributed Computing, Volume 144, 2020, pp. 14-27.
     """
-    n = ak.max(V) + 1
+    index = graph_index(V, U)
+    A = index.spmv()
+    n = A.shape[0]
     nf, ng = ak.arange(n), ak.arange(n)
     f, g = ak.zeros_like(nf), ak.zeros_like(ng)
 
-    if not V.is_sorted():
-        pi = ak.argsort(V)
-        V, U = V[pi], U[pi]
-
-    gV = ak.GroupBy(V, assume_sorted=True)
-    gU = ak.GroupBy(U, assume_sorted=False)
+    lonely = (A.row_counts == 0)
+    has_lonely = lonely.any()
+    f_k = ak.zeros_like(nf)
+    if symmetrize:
+        A_T = index.spmv(transpose=True)
+        lonely_T = (A_T.row_counts == 0)
+        has_lonely_T = lonely_T.any()
+        f_kT = ak.zeros_like(nf)
 
     k = 0
     converged, n_comps = False, nf.size
@@ -167,8 +178,14 @@ def fast_sv(
 
         # hooking phase
         # f_k = A @ g using (Select2nd, min) semiring
-        grand_U = gU.broadcast(g, permute=True)
-        _, f_k = gV.min(grand_U)
+        A(g, MIN_SELECT2ND, out=f_k, sparse=False)
+        if has_lonely:
+            f_k[lonely] = g[lonely]
+        if symmetrize:
+            A_T(g, MIN_SELECT2ND, out=f_kT, sparse=False)
+            if has_lonely_T:
+                f_kT[lonely_T] = g[lonely_T]
+            f_k = minimum(f_k, f_kT)
         f[f] = f_k              # stochastic hooking
         f = minimum(f, f_k)     # aggressive hooking
 
@@ -251,3 +268,120 @@ def lps(
     return (k, lbl_nxt)
 
 
+def scc(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    max_steps: Union[int, None] = None,
+    verbose: bool = False
+) -> Tuple[int, ak.pdarray]:
+    """
+    Calculate strongly connected components of a directed graph.
+
+    Every round does three things on the remaining nodes:
+
+    1. trimming: nodes with no remaining in or out edges are their own
+       component, repeated until none are left.
+    2. coloring: every node takes the minimum label that reaches it. Nodes of
+       one component share a color, so edges between colors are dropped.
+    3. backward search: every node whose color is its own label is a pivot.
+       The nodes reaching a pivot within its color are its component. All
+       pivots search at the same time.
+
+    Found components are removed and the next round runs on what is left.
+    The work per round is a few sparse products, independent of the number
+    of components.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    max_steps :  Union[int, None] (default None)
+        quit after this many rounds
+    verbose : bool (default False)
+        print progress
+
+    Returns
+    -------
+    k : int
+        number of rounds
+    L : ak.pdarray[int64]
+        component label for each node (minimal node in its component)
+
+    References
+    ----------
+    BFS and Coloring-based Parallel Algorithms for Strongly Connected
+        Components and Related Problems. George M. Slota, Sivasankaran
+        Rajamanickam, Kamesh Madduri. IPDPS 2014.
+
+    On Identifying Strongly Connected Components in Parallel. Lisa K.
+        Fleischer, Bruce Hendrickson, Ali Pinar. IPDPS Workshops 2000.
+    """
+    n = max(V.max(), U.max()) + 1
+    nodes = ak.arange(n)
+    inf = np.iinfo(np.int64).max
+    comp = ak.zeros(n, 'int64') - 1
+    remaining = ak.ones(n, 'bool')
+    X, Y = V, U
+
+    k = 0
+    while remaining.any():
+        k += 1
+        if max_steps is not None and k > max_steps:
+            warn(f"Exceeded max_steps={max_steps} iterations.\n" + _WARN)
+            break
+
+        A = SpMV(X, Y, shape=(n, n))    # rows are out nodes
+        A_T = SpMV(Y, X, shape=(n, n))  # rows are in nodes
+
+        # trimming
+        trimmed = 0
+        while True:
+            r = ak.cast(remaining, 'int64')
+            out_deg = A(r, mask=remaining, sparse=False)
+            in_deg = A_T(r, mask=remaining, sparse=False)
+            trivial = remaining & ((out_deg == 0) | (in_deg == 0))
+            num_trivial = trivial.sum()
+            if num_trivial == 0:
+                break
+            comp[trivial] = nodes[trivial]
+            remaining &= ~trivial
+            trimmed += num_trivial
+        if not remaining.any():
+            break
+
+        # coloring: minimum label reaching each node
+        color = ak.where(remaining, nodes, inf)
+        while True:
+            c = A_T(color, MIN_SELECT2ND, mask=remaining, sparse=None)
+            changed = (c < color)
+            if not changed.any():
+                break
+            color = ak.where(changed, c, color)
+
+        # edges between colors never lie in one component
+        keep = remaining[X] & remaining[Y] & (color[X] == color[Y])
+        X, Y = X[keep], Y[keep]
+        A = SpMV(X, Y, shape=(n, n))
+
+        # backward search from every pivot within its color
+        reached = remaining & (color == nodes)
+        frontier = reached[:]
+        while frontier.any():
+            frontier = A(frontier, OR_AND, mask=(remaining & ~reached),
+                         sparse=None)
+            reached |= frontier
+        comp[reached] = color[reached]
+        remaining &= ~reached
+
+        keep = remaining[X] & remaining[Y]
+        X, Y = X[keep], Y[keep]
+
+        if verbose:
+            print(f'   k = {k}\n'
+                  f' |T| = {trimmed:,d}\n'
+                  f' |P| = {(color == nodes).sum():,d}\n'
+                  f' |R| = {remaining.sum():,d}\n')
+
+    return (k, comp)
@@ -20,6 +20,7 @@ from warnings import warn
 import arkouda as ak
 
 from akgraph.util.general import minimum
+from akgraph.util.index import graph_index
 
 
 def k_core(
@@ -50,12 +51,12 @@ def k_core(
         core[i] is True if node i in k-Core
     """
     # necessaries
-    n = V.max() + 1
-    g = ak.GroupBy(V)
+    index = graph_index(V, U)
+    n, g = index.n, index.gV
 
     # intialize
     i = 0                        # iterator
-    _, deg = g.count()           # node degree
+    deg = index.out_degree[:]    # node degree
     core = ak.ones(n, 'bool')    # nodes in the core
 
     while True:
@@ -119,14 +120,14 @@ def k_core_decomp(
         2018 IEEE International Conference on Big Data (2018) pp. 1135-1141
     """
     # necessaries
-    n = V.max() + 1
-    g = ak.GroupBy(V)
+    index = graph_index(V, U)
+    n, g = index.n, index.gV
 
     # initializations
     i = 0                              # iterators
     k, num_active = 1, n               # core number, count of active nodes
     color = ak.zeros(n, dtype='bool')  # node has been examined
-    _, deg = g.count()                 # node degree
+    deg = index.out_degree[:]          # node degree
     core = ak.ones_like(deg)           # core numbers ??
 
     while True:
@@ -218,8 +219,8 @@ def core_number(
 
     # Make initial guess at core number
     # core(v) <= min(deg(v), max(deg(u) for u in N(v)))
-    g = ak.GroupBy(V)
-    _, degree = g.count()
+    index = graph_index(V, U)
+    g, degree = index.gV, index.out_degree
     _, max_deg_nbr = g.max(degree[U])
     core = minimum(degree, max_deg_nbr)
 
@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 """Functions for performing degree calculations on edgelists."""
 __all__ = [
+    'DegreeSummary',
     'degree_order',
+    'degree_summary',
     'degree',
     'in_degree',
     'out_degree',
 ]
 
 
-from typing import Optional, Tuple
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
 
 import arkouda as ak
 
+from akgraph.util.index import graph_index
+
 
 def _dir_deg(
     inout: str,
@@ -24,12 +30,9 @@ def _dir_deg(
     if inout != 'in' and inout != 'out':
         raise ValueError(f'error: invalid inout value {inout}')
 
-    n = max(V.max(), U.max()) + 1
-    d = ak.zeros(n, dtype='int64')
-    g = ak.GroupBy(U) if inout == 'in' else ak.GroupBy(V)
-    node, deg = g.sum(W) if W is not None else g.count()
-    d[node] += deg
-    return d / d.sum() if normalize else d
+    index = graph_index(V, U, W)
+    d = index.in_weight if inout == 'in' else index.out_weight
+    return d / d.sum() if normalize else d[:]
 
 
 def in_degree(
@@ -136,24 +139,121 @@ def degree(
     -------
     d : ak.pdarray
         degree for each node
+
+    Notes
+    -----
+    Degrees come from the cached `graph_index` of (V, U, W), so repeated calls
+    on the same edge list do no GroupBy work while its index is cached.
+    Unweighted, non-symmetric degrees subtract reciprocated edges from in +
+    out degree, after dropping repeated edges.
     """
+    index = graph_index(V, U, W)
     if symmetric:
-        g = ak.GroupBy(V, assume_sorted=V.is_sorted())
-        _, d = g.sum(W) if W is not None else g.count()
+        d = index.out_weight[:]
+    elif W is not None:
+        d = index.out_weight + index.in_weight
     else:
-        V, U = (ak.concatenate([V, U], ordered=False),
-                ak.concatenate([U, V], ordered=False))
-        g = ak.GroupBy(V)
-
-        if W is not None:
-            W = ak.concatenate([W, W], ordered=False)
-            _, d = g.sum(W)
-        else:
-            _, d = g.nunique(U)
+        d = index.degree[:]
 
     return d / d.sum() if normalize else d
 
 
+class DegreeSummary(NamedTuple):
+    """Outcome of `degree_summary`, small enough to live on the client."""
+    n: int                         # number of nodes
+    m: int                         # number of edges
+    min: float                     # smallest degree
+    max: float                     # largest degree
+    mean: float                    # average degree
+    bin_edges: np.ndarray          # left edges of bins [0, 1, 2, 4, 8, ...]
+    counts: np.ndarray             # number of nodes in each bin
+    percentiles: dict              # {q: degree at the q-th percentile}
+    top_nodes: np.ndarray          # highest degree nodes, descending
+    top_degrees: np.ndarray        # their degrees
+
+
+def degree_summary(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: Optional[ak.pdarray] = None,
+    kind: str = 'out',
+    percentiles: Sequence[float] = (50, 90, 99, 99.9),
+    top_k: int = 10
+) -> DegreeSummary:
+    """
+    Summarize the degree distribution on the server.
+
+    Only scalars and arrays of length `top_k` or log2(max degree) are
+    transferred, never the degree vector itself.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : { ak.pdarray | None } (default None)
+        edge weights
+    kind : str (default 'out')
+        'out', 'in' or 'all' (as computed by `degree`)
+    percentiles : Sequence[float] (default (50, 90, 99, 99.9))
+        percentiles to report, in [0, 100]
+    top_k : int (default 10)
+        number of hubs to report
+
+    Return
+    ------
+    summary : DegreeSummary
+        statistics of the degree distribution
+
+    Notes
+    -----
+    Bins are [0, 1), [1, 2), [2, 4), [4, 8), ... so integer degrees get bins
+    {0}, {1}, {2, 3}, ... Percentiles use the nearest rank below. One sort
+    of the n degrees serves both the percentiles and the top-k.
+    """
+    if kind == 'out':
+        d = out_degree(V, U, W)
+    elif kind == 'in':
+        d = in_degree(V, U, W)
+    elif kind == 'all':
+        d = degree(V, U, W)
+    else:
+        raise ValueError(f'invalid kind: {kind}')
+    n = d.size
+
+    # log2 histogram, one comparison per bin
+    max_d = d.max()
+    edges = [0, 1]
+    while edges[-1] * 2 <= max_d:
+        edges.append(edges[-1] * 2)
+    b = ak.zeros(n, 'int64')
+    for e in edges[1:]:
+        b += (d >= e)
+    bins, count = ak.GroupBy(b).count()
+    counts = np.zeros(len(edges), 'int64')
+    counts[bins.to_ndarray()] = count.to_ndarray()
+
+    perm = ak.argsort(d)
+    ranked = d[perm]
+    qs = {q: ranked[int(q / 100 * (n - 1))] for q in percentiles}
+    k = min(top_k, n)
+    top = perm[n - k:].to_ndarray()[::-1]
+
+    return DegreeSummary(
+        n=n,
+        m=V.size,
+        min=d.min(),
+        max=max_d,
+        mean=d.sum() / n,
+        bin_edges=np.array(edges),
+        counts=counts,
+        percentiles=qs,
+        top_nodes=top,
+        top_degrees=ranked[n - k:].to_ndarray()[::-1],
+    )
+
+
 def degree_order(V: ak.pdarray, U: ak.pdarray) -> Tuple[ak.pdarray]:
     """
     Relabel nodes and place edges in degree order.
@@ -181,9 +281,8 @@ def degree_order(V: ak.pdarray, U: ak.pdarray) -> Tuple[ak.pdarray]:
     Y : ak.pdarray[int64]
         degree-ordered in nodes
     """
-    g = ak.GroupBy(V)
-    node, deg = g.count()
-    pi = ak.argsort(ak.coargsort([deg, node]))
+    deg = graph_index(V, U).out_degree
+    pi = ak.argsort(ak.coargsort([deg, ak.arange(deg.size)]))
 
     X, Y = pi[V], pi[U]
     mask = X < Y
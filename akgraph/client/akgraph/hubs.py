@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Hub splitting for skewed degree distributions.
+
+Arkouda stores node vectors in contiguous blocks, one per locale. A node with
+10^7 neighbors makes its locale answer 10^7 gathers and owns one enormous
+segment in every reduction. `HubSplit` replaces every node above a degree
+threshold with virtual sub-nodes scattered across the node space. Edges of a
+hub are dealt round-robin over its sub-nodes, gathers read copies of the hub
+value held by the sub-nodes, and reductions produce partial results that are
+combined afterwards.
+
+`adjacency` picks plain `SpMV` or the split `HubSplitSpMV` automatically from
+the degree threshold, so callers do not need to know whether splitting
+happened.
+"""
+__all__ = [
+    "HubSplit",
+    "HubSplitSpMV",
+    "adjacency",
+    "auto_hub_threshold",
+    "segment_imbalance",
+]
+
+
+from typing import Optional, Tuple, Union
+
+import arkouda as ak
+from aksolve.semiring import PLUS_TIMES, Semiring, SpMV
+
+from akgraph.util import GraphIndex, get_perm, graph_index
+
+
+def _num_locales() -> int:
+    """Number of locales of the connected server."""
+    return ak.get_config()['numLocales']
+
+
+def _hub_degree(
+    R: ak.pdarray,
+    C: ak.pdarray,
+    n: int,
+    index: Optional[GraphIndex] = None
+) -> ak.pdarray:
+    """Larger of the row and column entry counts of each of n nodes."""
+    if index is None:
+        index = graph_index(R, C, cache=False)
+    out, inn = index.out_degree, index.in_degree
+    deg = ak.where(out > inn, out, inn)
+    if deg.size < n:
+        deg = ak.concatenate([deg, ak.zeros(n - deg.size, 'int64')])
+    return deg
+
+
+def auto_hub_threshold(
+    m: int,
+    num_locales: Optional[int] = None
+) -> Optional[int]:
+    """
+    Degree above which a node is split, None if splitting cannot help.
+
+    A node is a hub once its degree exceeds a quarter of the per-locale share
+    of the m edges. A single locale has no imbalance to fix.
+    """
+    num_locales = _num_locales() if num_locales is None else num_locales
+    if num_locales < 2:
+        return None
+    return max(1, -(-m // (4 * num_locales)))
+
+
+def segment_imbalance(
+    keys: ak.pdarray,
+    size: Optional[int] = None,
+    num_locales: Optional[int] = None
+) -> float:
+    """
+    Ratio of the busiest locale's work to the mean for a gather or reduction.
+
+    Every entry of `keys` touches the locale holding that key in a
+    block-distributed array of `size` elements. A perfectly balanced
+    operation gives 1.0, a single locale doing everything gives num_locales.
+
+    Parameters
+    ----------
+    keys : ak.pdarray[int64]
+        node touched by each edge
+    size : int (optional)
+        length of the node vector, default max(keys) + 1
+    num_locales : int (optional)
+        default to the connected server's locales
+
+    Return
+    ------
+    imbalance : float
+        max / mean of per-locale entry counts
+    """
+    num_locales = _num_locales() if num_locales is None else num_locales
+    size = keys.max() + 1 if size is None else size
+    block = -(-size // num_locales)
+    _, work = ak.GroupBy(keys // block).count()
+    return work.max() / (keys.size / num_locales)
+
+
+class HubSplit:
+    """
+    Map between n nodes and an extended space with virtual hub sub-nodes.
+
+    Parameters
+    ----------
+    deg : ak.pdarray[int64]
+        degree of each node
+    threshold : int
+        nodes with larger degree get ceil(deg / threshold) sub-nodes
+
+    Attributes
+    ----------
+    n : int
+        number of original nodes
+    size : int
+        number of nodes in the extended space
+    hubs : ak.pdarray[int64]
+        split nodes, ascending
+    ext : ak.pdarray[int64]
+        extended id of each original node
+    virtual : ak.pdarray[int64]
+        extended ids of sub-nodes, grouped by hub
+    owner : ak.pdarray[int64]
+        hub of each sub-node
+    """
+
+    def __init__(self, deg: ak.pdarray, threshold: int):
+        if threshold < 1:
+            raise ValueError(f'threshold must be positive: {threshold}')
+        n = deg.size
+        self.n, self.threshold = n, threshold
+        self.parts = ak.where(deg > threshold, -(-deg // threshold), 1)
+        self.hubs = ak.arange(n)[self.parts > 1]
+        nparts = self.parts[self.hubs]
+        p = nparts.sum() if self.hubs.size > 0 else 0
+        self.size = n + p
+
+        # sub-nodes take evenly spaced slots, shuffled so each hub's
+        # sub-nodes land on different locales
+        self.start = ak.zeros(n, 'int64')
+        is_virtual = ak.zeros(self.size, 'bool')
+        if p > 0:
+            slots = (ak.arange(p) * self.size) // p
+            is_virtual[slots] = True
+            self.virtual = slots[get_perm(p)]
+            starts = ak.cumsum(nparts) - nparts
+            self.start[self.hubs] = starts
+            self.owner = ak.broadcast(starts, self.hubs, p)
+            # owner is sorted and fixed, group it once for every combine
+            self._g = ak.GroupBy(self.owner, assume_sorted=True)
+        else:
+            self.virtual = ak.zeros(0, 'int64')
+            self.owner = ak.zeros(0, 'int64')
+            self._g = None
+        self.ext = ak.arange(self.size)[~is_virtual]
+
+    def keys(self, X: ak.pdarray) -> ak.pdarray:
+        """Extended ids for endpoints `X`, hub edges dealt over sub-nodes."""
+        K = self.ext[X]
+        if self.hubs.size > 0:
+            hub_edge = (self.parts[X] > 1)
+            Xh = X[hub_edge]
+            deal = ak.arange(X.size)[hub_edge] % self.parts[Xh]
+            K[hub_edge] = self.virtual[self.start[Xh] + deal]
+        return K
+
+    def expand(self, x: ak.pdarray) -> ak.pdarray:
+        """Node vector in the extended space, sub-nodes copy their hub."""
+        y = ak.zeros(self.size, x.dtype)
+        y[self.ext] = x
+        if self.hubs.size > 0:
+            y[self.virtual] = x[self.owner]
+        return y
+
+    def combine(self, y: ak.pdarray, op: str = 'sum') -> ak.pdarray:
+        """Reduce sub-node partials with `op` into their hubs."""
+        out = y[self.ext]
+        if self.hubs.size > 0:
+            hubs, partial = self._g.aggregate(y[self.virtual], op)
+            out[hubs] = partial
+        return out
+
+
+class HubSplitSpMV:
+    """
+    `SpMV` on a square matrix with high degree rows and columns split.
+
+    Same call signature and results as `SpMV`; the product runs in the
+    extended space of a `HubSplit` and partial rows are combined with the
+    semiring's add.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    V : ak.pdarray (optional)
+        values (pattern matrix of ones if None)
+    shape : (int, int) Optional
+        square shape, default based on max value in R, C
+    threshold : int (optional)
+        split degree, default `auto_hub_threshold`
+    deg : ak.pdarray[int64] (optional)
+        larger of the row and column entry counts of each node, counted
+        from R and C if None
+
+    Attributes
+    ----------
+    split : HubSplit
+        mapping to the extended space
+    """
+
+    def __init__(
+        self,
+        R: ak.pdarray,
+        C: ak.pdarray,
+        V: Optional[ak.pdarray] = None,
+        shape: Optional[Tuple[int, int]] = None,
+        threshold: Optional[int] = None,
+        deg: Optional[ak.pdarray] = None
+    ):
+        n = max(R.max(), C.max()) + 1 if shape is None else shape[0]
+        if shape is not None and shape[0] != shape[1]:
+            raise ValueError(f'hub splitting needs a square matrix: {shape}')
+        threshold = auto_hub_threshold(R.size) if threshold is None else threshold
+        self.shape, self.nnz = (n, n), R.size
+
+        deg = _hub_degree(R, C, n) if deg is None else deg
+        self.split = HubSplit(deg, threshold if threshold is not None else n + 1)
+        size = self.split.size
+        self.A = SpMV(self.split.keys(R), self.split.keys(C), V, (size, size))
+        self.row_counts = self.split.combine(self.A.row_counts)
+
+    def __call__(
+        self,
+        x: ak.pdarray,
+        semiring: Semiring = PLUS_TIMES,
+        mask: Optional[ak.pdarray] = None,
+        out: Optional[ak.pdarray] = None,
+        sparse: Optional[bool] = False
+    ) -> ak.pdarray:
+        """Compute y = A @ x over `semiring`, see `SpMV.__call__`."""
+        if x.size != self.shape[1]:
+            raise ValueError(f"size mismatch: {self.shape} x ({x.size}, 1)")
+        mask = self.split.expand(mask) if mask is not None else None
+        y = self.A(self.split.expand(x), semiring, mask=mask, sparse=sparse)
+        y = self.split.combine(y, semiring.add)
+        if out is not None:
+            out[:] = y
+            return out
+        return y
+
+
+def adjacency(
+    R: ak.pdarray,
+    C: ak.pdarray,
+    V: Optional[ak.pdarray] = None,
+    shape: Optional[Tuple[int, int]] = None,
+    hub_threshold: Union[int, str, None] = 'auto',
+    index: Optional[GraphIndex] = None
+) -> Union[SpMV, HubSplitSpMV]:
+    """
+    Build a matrix operator, splitting hubs if any degree is above threshold.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    V : ak.pdarray (optional)
+        values (pattern matrix of ones if None)
+    shape : (int, int) Optional
+        number of (rows, columns)
+    hub_threshold : { int | 'auto' | None } (default 'auto')
+        split degree, 'auto' uses `auto_hub_threshold`, None never splits
+    index : GraphIndex (optional)
+        index of the edge list (R, C) or (C, R), its cached degrees decide
+        the split. Without it the degrees are counted once, and only if a
+        split is possible
+
+    Return
+    ------
+    A : { SpMV | HubSplitSpMV }
+        operator with the `SpMV` call signature
+    """
+    if hub_threshold == 'auto':
+        hub_threshold = auto_hub_threshold(R.size)
+    square = shape is None or shape[0] == shape[1]
+    if hub_threshold is None or not square or R.size == 0:
+        return SpMV(R, C, V, shape)
+
+    n = max(R.max(), C.max()) + 1 if shape is None else shape[0]
+    deg = _hub_degree(R, C, n, index)
+    if deg.max() <= hub_threshold:
+        return SpMV(R, C, V, shape)
+    return HubSplitSpMV(R, C, V, shape, hub_threshold, deg)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""Streaming construction of standardized edge lists.
+
+`standardize_edges` needs the whole raw edge list in memory and sorts it
+several times. `EdgeIngest` takes the edges one batch at a time instead: each
+batch is canonicalized, stripped of loops and deduplicated on arrival, and
+deduplicated runs are merged whenever the unmerged runs grow as large as the
+merged edges. The server never holds much more than twice the deduplicated
+edge list plus one raw batch, and `finish` collects the node labels,
+relabels, symmetrizes and sorts only the final edges.
+
+The result is the same as `standardize_edges` on the concatenated batches.
+"""
+__all__ = ["EdgeIngest", "ingest_edges"]
+
+
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+import arkouda as ak
+
+from akgraph.outofcore import EdgeChunks
+from akgraph.util import (
+    from_numpy, maximum, minimum, remove_duplicates, remove_loops,
+    sort_edges, symmetrize_egdes
+)
+
+
+# reductions that can be applied to partial results of earlier batches
+_MERGE_OP = {
+    'count': 'sum',
+    'sum': 'sum',
+    'prod': 'prod',
+    'min': 'min',
+    'max': 'max',
+    'any': 'any',
+    'all': 'all',
+    'or': 'or',
+    'and': 'and',
+}
+
+
+def _dedupe(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: Optional[ak.pdarray],
+    weight_reduce: Optional[str]
+) -> Tuple[ak.pdarray, ak.pdarray, Optional[ak.pdarray]]:
+    """Sort edges by (V, U) and reduce duplicates."""
+    if weight_reduce is None:
+        if W is None:
+            return (*remove_duplicates(V, U), None)
+        return remove_duplicates(V, U, W)
+    g = ak.GroupBy([V, U])
+    if weight_reduce == 'count':
+        (V, U), W = g.count()
+    else:
+        (V, U), W = g.aggregate(W, weight_reduce)
+    return V, U, W
+
+
+def _relabel(
+    g: ak.GroupBy,
+    labels: ak.pdarray,
+    permute: bool
+) -> ak.pdarray:
+    """Replace the keys of g by their position in the sorted `labels`."""
+    new = ak.arange(labels.size)[ak.in1d(labels, g.unique_keys)]
+    return g.broadcast(new, permute=permute)
+
+
+class EdgeIngest:
+    """
+    Build a standardized edge list from batches of raw edges.
+
+    Parameters
+    ----------
+    weighted : bool (default False)
+        batches come with edge weights
+    weight_reduce : { str | None } (default None)
+        reduction applied to the weights of duplicate edges. If unweighted,
+        must be 'count' or None. If weighted, must be one of 'sum', 'prod',
+        'min', 'max', 'any', 'all', 'or', 'and' (reductions that can be
+        applied again when runs are merged) or None for an arbitrary weight.
+    symmetric : bool (default True)
+        ensure all edges go both directions
+    verbose : bool (default False)
+        print progress after each batch
+
+    Attributes
+    ----------
+    batches : int
+        number of batches added
+    edges_read : int
+        number of raw edges added
+
+    Examples
+    --------
+    >>> ingest = EdgeIngest()
+    >>> for V, U in batches:
+    ...     ingest.add(V, U)
+    >>> V, U, labels = ingest.finish(return_labels=True)
+    """
+
+    def __init__(
+        self,
+        weighted: bool = False,
+        weight_reduce: Optional[str] = None,
+        symmetric: bool = True,
+        verbose: bool = False
+    ):
+        valid = (None, 'count') if not weighted else (None, *_MERGE_OP)
+        if weight_reduce not in valid or weight_reduce == 'count' and weighted:
+            raise ValueError('invalid combination of weight and weight_reduce:\n'
+                             f'weighted = {weighted}\n'
+                             f'weight_reduce = {weight_reduce}')
+        self.weighted, self.weight_reduce = weighted, weight_reduce
+        self.symmetric, self.verbose = symmetric, verbose
+        self.batches, self.edges_read = 0, 0
+        self._merged = None
+        self._runs = []
+        self._pending = 0
+
+    @property
+    def _merge_op(self) -> Optional[str]:
+        return _MERGE_OP.get(self.weight_reduce)
+
+    def add(
+        self,
+        V: ak.pdarray,
+        U: ak.pdarray,
+        W: Optional[ak.pdarray] = None
+    ):
+        """Canonicalize, deduplicate and store one batch of edges."""
+        if V.size != U.size:
+            raise ValueError('V and U not the same size.')
+        if (W is not None) != self.weighted:
+            raise ValueError(f'expected weighted={self.weighted} batches')
+        if W is not None and W.size != V.size:
+            raise ValueError('Weight dimensions do not match.')
+        self.batches += 1
+        self.edges_read += V.size
+
+        if self.symmetric:
+            V, U = minimum(V, U), maximum(V, U)
+        if W is None:
+            V, U = remove_loops(V, U)
+        else:
+            V, U, W = remove_loops(V, U, W)
+
+        if V.size > 0:
+            self._runs.append(_dedupe(V, U, W, self.weight_reduce))
+            self._pending += self._runs[-1][0].size
+
+        merged = self._merged[0].size if self._merged is not None else 0
+        if self._pending >= merged:
+            self._merge()
+
+        if self.verbose:
+            kept = self._pending + (self._merged[0].size
+                                    if self._merged is not None else 0)
+            print(f' batch = {self.batches}\n'
+                  f'   |E| = {self.edges_read:,d} read, {kept:,d} kept\n')
+
+    def _merge(self):
+        """Merge pending runs into the deduplicated edges."""
+        runs = self._runs if self._merged is None else [self._merged] + self._runs
+        self._runs, self._pending = [], 0
+        if not runs:
+            return
+        if len(runs) == 1:
+            self._merged = runs[0]
+            return
+
+        V = ak.concatenate([r[0] for r in runs], ordered=False)
+        U = ak.concatenate([r[1] for r in runs], ordered=False)
+        W = None
+        if runs[0][2] is not None:
+            W = ak.concatenate([r[2] for r in runs], ordered=False)
+        del runs
+        self._merged = _dedupe(V, U, W, self._merge_op)
+
+    def finish(
+        self,
+        sort: bool = True,
+        return_labels: bool = False
+    ) -> List[ak.pdarray]:
+        """
+        Return the standardized edge list.
+
+        Parameters
+        ----------
+        sort : bool (default True)
+            sort the returned array. Only used if symmetric == True.
+        return_labels : bool (default False)
+            return original node labels
+
+        Returns
+        -------
+        V : ak.pdarray[int64]
+            standardized out nodes
+        U : ak.pdarray[int64]
+            standardized in nodes
+        W : ak.pdarray (optional)
+            weights of standardized edges if result is weighted
+        labels : ak.pdarray[int64] (optional)
+            labels[i] is the orignal label of node i
+        """
+        self._merge()
+        if self._merged is None:
+            raise ValueError('no edges were added')
+        V, U, W = self._merged
+
+        # edges are sorted by V, so only U needs a sort to find the labels
+        gV = ak.GroupBy(V, assume_sorted=True)
+        gU = ak.GroupBy(U)
+        labels = ak.union1d(gV.unique_keys, gU.unique_keys)
+        V = _relabel(gV, labels, permute=False)
+        U = _relabel(gU, labels, permute=True)
+
+        if W is None:
+            if self.symmetric:          V, U = symmetrize_egdes(V, U)
+            if sort and self.symmetric: V, U = sort_edges(V, U)
+        else:
+            if self.symmetric:          V, U, W = symmetrize_egdes(V, U, W)
+            if sort and self.symmetric: V, U, W = sort_edges(V, U, W)
+
+        out = [V, U]
+        if W is not None: out.append(W)
+        if return_labels: out.append(labels)
+
+        return out
+
+
+def _read_csv(
+    files: List[str],
+    source: str,
+    target: str,
+    weight: Optional[str]
+) -> Tuple[ak.pdarray, ak.pdarray, Optional[ak.pdarray]]:
+    """Read one batch of CSV files on the server."""
+    names = [source, target] + ([weight] if weight is not None else [])
+    data = ak.read_csv(files, datasets=names)
+    # columns of files without an arkouda header come back as Strings
+    cols = [data[name] if isinstance(data[name], ak.pdarray)
+            else ak.cast(data[name], dtype)
+            for name, dtype in zip(names, ('int64', 'int64', 'float64'))]
+    return cols[0], cols[1], (cols[2] if weight is not None else None)
+
+
+def _csv_batches(
+    files: List[str],
+    source: str,
+    target: str,
+    weight: Optional[str],
+    files_per_batch: int
+) -> Iterator[Tuple[ak.pdarray, ak.pdarray, Optional[ak.pdarray]]]:
+    """Yield (V, U, W) read from CSV files with a header row."""
+    server = hasattr(ak, 'read_csv')
+    for i in range(0, len(files), files_per_batch):
+        if server:
+            yield _read_csv(files[i:i + files_per_batch], source, target,
+                            weight)
+            continue
+        cols = {source: [], target: [], weight: []}
+        for file in files[i:i + files_per_batch]:
+            data = np.genfromtxt(file, delimiter=',', names=True,
+                                 dtype=None, encoding='utf-8', ndmin=1)
+            for name in cols:
+                if name is not None:
+                    cols[name].append(data[name])
+        V = from_numpy(np.concatenate(cols[source]).astype(np.int64))
+        U = from_numpy(np.concatenate(cols[target]).astype(np.int64))
+        W = None
+        if weight is not None:
+            W = from_numpy(np.concatenate(cols[weight]))
+        yield V, U, W
+
+
+def ingest_edges(
+    files: Union[str, List[str]],
+    source: str = 'src',
+    target: str = 'dst',
+    weight: Optional[str] = None,
+    weight_reduce: Optional[str] = None,
+    symmetric: bool = True,
+    sort: bool = True,
+    return_labels: bool = False,
+    files_per_batch: int = 1,
+    file_format: Optional[str] = None,
+    verbose: bool = False
+) -> List[ak.pdarray]:
+    """
+    Read a partitioned edge list and standardize it batch by batch.
+
+    Parameters
+    ----------
+    files : { str | List[str] }
+        HDF5 or CSV files holding the edge list, one shard per file
+    source : str (default 'src')
+        dataset (HDF5) or column (CSV) name of out nodes, int64 labels
+    target : str (default 'dst')
+        dataset or column name of in nodes, int64 labels
+    weight : str (optional)
+        dataset or column name of edge weights
+    weight_reduce : { str | None } (default None)
+        reduction applied to weights of duplicate edges, see `EdgeIngest`
+    symmetric : bool (default True)
+        ensure all edges go both directions
+    sort : bool (default True)
+        sort the returned array. Only used if symmetric == True.
+    return_labels : bool (default False)
+        return original node labels
+    files_per_batch : int (default 1)
+        files read into the server at once
+    file_format : str (optional)
+        'hdf5' or 'csv', default 'csv' if every file ends in '.csv'
+    verbose : bool (default False)
+        print progress after each batch
+
+    Returns
+    -------
+    V : ak.pdarray[int64]
+        standardized out nodes
+    U : ak.pdarray[int64]
+        standardized in nodes
+    W : ak.pdarray (optional)
+        weights of standardized edges if result is weighted
+    labels : ak.pdarray[int64] (optional)
+        labels[i] is the orignal label of node i
+
+    Notes
+    -----
+    HDF5 files are read by the server directly, and so are CSV files if the
+    server supports `ak.read_csv`. Otherwise CSV files are parsed by the
+    client and transferred.
+
+    See Also
+    --------
+    EdgeIngest
+    standardize_edges()
+    """
+    files = [files] if isinstance(files, str) else list(files)
+    if files_per_batch < 1:
+        raise ValueError(f'files_per_batch must be positive: {files_per_batch}')
+    if file_format is None:
+        csv = all(f.lower().endswith('.csv') for f in files)
+        file_format = 'csv' if csv else 'hdf5'
+
+    if file_format == 'hdf5':
+        batches = EdgeChunks(files, source, target, weight, files_per_batch)
+    elif file_format == 'csv':
+        batches = _csv_batches(files, source, target, weight, files_per_batch)
+    else:
+        raise ValueError(f'invalid file_format: {file_format}')
+
+    ingest = EdgeIngest(weight is not None, weight_reduce, symmetric, verbose)
+    for V, U, W in batches:
+        ingest.add(V, U, W)
+    return ingest.finish(sort, return_labels)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Matrix-free graph Laplacians for the aksolve solvers.
+
+A Laplacian is the degree diagonal minus the adjacency matrix. Building it as
+COO arrays concatenates the diagonal with a negated copy of every edge, and
+the solver then sorts and groups that copy again. `laplacian` applies
+
+    L x = D x - A x
+
+instead, from the weighted degrees and the adjacency `SpMV` that
+`graph_index` caches for the edge list (and shares with BFS, connected
+components, vertex programs, ...). A product is one segmented sum over the
+edges plus elementwise work on the nodes.
+
+Edges must be symmetric (u, v) <==> (v, u) for the combinatorial and
+normalized Laplacians to be symmetric, as `cg` and `minres` require.
+"""
+__all__ = [
+    "LaplacianOperator",
+    "laplacian",
+    "laplacian_preconditioner",
+]
+
+
+from typing import Optional
+
+import arkouda as ak
+from aksolve.semiring import SpMV
+from aksolve.util import Operator
+
+from akgraph.util import graph_index
+
+
+_KINDS = ('combinatorial', 'normalized', 'random_walk')
+
+
+def _inverse(d: ak.pdarray) -> ak.pdarray:
+    """Elementwise inverse, 0 where d is 0."""
+    nonzero = (d != 0)
+    return ak.where(nonzero, 1.0 / ak.where(nonzero, d, 1.0), 0.0)
+
+
+class LaplacianOperator:
+    """
+    Matrix-free Laplacian of the graph (V, U, W).
+
+    With D the diagonal of weighted out degrees, A the adjacency matrix (rows
+    are out nodes) and I' the identity restricted to nodes with edges, `kind`
+    selects
+
+        'combinatorial' : L = D - A
+        'normalized'    : L = I' - D^-1/2 A D^-1/2
+        'random_walk'   : L = I' - D^-1 A
+
+    each plus `shift` I. Rows and columns of isolated nodes are zero apart
+    from the shift.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray (optional)
+        non-negative edge weights
+    kind : str (default 'combinatorial')
+        'combinatorial', 'normalized' or 'random_walk'
+    shift : float (default 0.0)
+        added to the diagonal. A positive shift makes the Laplacian of a
+        symmetric graph positive-definite
+
+    Attributes
+    ----------
+    n : int
+        number of nodes
+    shape : (int, int)
+        (n, n)
+    kind : str
+        type of Laplacian
+    shift : float
+        diagonal shift
+    degree : ak.pdarray[float64]
+        weighted out degree of each node
+    diagonal : ak.pdarray[float64]
+        diagonal of L
+
+    Examples
+    --------
+    >>> L = LaplacianOperator(V, U, shift=1e-3)
+    >>> x, istop, niter, rnorm = aks.cg(L, b, precon=L.preconditioner())
+    """
+
+    def __init__(
+        self,
+        V: ak.pdarray,
+        U: ak.pdarray,
+        W: Optional[ak.pdarray] = None,
+        kind: str = 'combinatorial',
+        shift: float = 0.0
+    ):
+        if kind not in _KINDS:
+            raise ValueError(f"kind must be one of {_KINDS}: {kind!r}")
+        self._index = graph_index(V, U, W)
+        self.n = self._index.n
+        self.shape = (self.n, self.n)
+        self.kind, self.shift = kind, shift
+
+        self.degree = ak.cast(self._index.out_weight, 'float64')
+        if kind == 'combinatorial':
+            self._pre = self._post = None
+            self.diagonal = self.degree + shift
+        else:
+            linked = ak.cast(self.degree != 0, 'float64')
+            self.diagonal = linked + shift
+            if kind == 'normalized':
+                self._pre = self._post = _inverse(ak.sqrt(self.degree))
+            else:
+                self._pre, self._post = None, _inverse(self.degree)
+
+    @property
+    def _A(self) -> SpMV:
+        return self._index.spmv()
+
+    @property
+    def _AT(self) -> SpMV:
+        return self._index.spmv(transpose=True)
+
+    def _product(
+        self,
+        A: SpMV,
+        x: ak.pdarray,
+        pre: Optional[ak.pdarray],
+        post: Optional[ak.pdarray],
+        out: Optional[ak.pdarray]
+    ) -> ak.pdarray:
+        """y = diagonal * x - post * (A @ (pre * x))."""
+        if x.size != self.n:
+            raise ValueError(f"size mismatch: {self.shape} x ({x.size}, 1)")
+        # dense input: skip the count of non-zeros SpMV makes by default
+        Ax = A(x if pre is None else pre * x, sparse=False)
+        y = self.diagonal * x - (Ax if post is None else post * Ax)
+        if out is None:
+            return y
+        out[:] = y
+        return out
+
+    def matvec(
+        self,
+        x: ak.pdarray,
+        out: Optional[ak.pdarray] = None
+    ) -> ak.pdarray:
+        """Compute y = L @ x, into `out` if given."""
+        return self._product(self._A, x, self._pre, self._post, out)
+
+    def rmatvec(
+        self,
+        x: ak.pdarray,
+        out: Optional[ak.pdarray] = None
+    ) -> ak.pdarray:
+        """Compute y = L.T @ x, into `out` if given."""
+        return self._product(self._AT, x, self._post, self._pre, out)
+
+    def preconditioner(self) -> Operator:
+        """Jacobi preconditioner of L, see `laplacian_preconditioner`."""
+        return laplacian_preconditioner(self)
+
+    def __call__(self, x: ak.pdarray) -> ak.pdarray:
+        """Compute y = L @ x in a new vector, usable as an `Operator`."""
+        return self.matvec(x)
+
+
+def laplacian(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: Optional[ak.pdarray] = None,
+    kind: str = 'combinatorial',
+    shift: float = 0.0
+) -> LaplacianOperator:
+    """
+    Return the matrix-free Laplacian of a graph, usable as an `Operator`.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray (optional)
+        non-negative edge weights
+    kind : str (default 'combinatorial')
+        'combinatorial' (D - A), 'normalized' (I - D^-1/2 A D^-1/2) or
+        'random_walk' (I - D^-1 A)
+    shift : float (default 0.0)
+        added to the diagonal
+
+    Return
+    ------
+    L : LaplacianOperator
+        callable calculating y = Lx, with `matvec`, `rmatvec` and
+        `preconditioner`
+
+    See Also
+    --------
+    LaplacianOperator
+    laplacian_preconditioner()
+    aksolve.matvec_from_coo()
+    """
+    return LaplacianOperator(V, U, W, kind, shift)
+
+
+def laplacian_preconditioner(L: LaplacianOperator) -> Operator:
+    """
+    Create the diagonal (Jacobi) preconditioner of a Laplacian.
+
+    The diagonal is known from the degrees, so nothing is extracted from
+    edges. Nodes with a zero diagonal (isolated, unshifted) are mapped to 0.
+
+    Parameters
+    ----------
+    L : LaplacianOperator
+        Laplacian from `laplacian`
+
+    Return
+    ------
+    P : Operator
+        like getting multiplied by the inverse diagonal of L
+    """
+    v = _inverse(L.diagonal)
+    def inv_diag(x: ak.pdarray) -> ak.pdarray:
+        """Jacobi preconditioner."""
+        return x * v
+
+    return inv_diag
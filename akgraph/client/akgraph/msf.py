@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """Algorithm for calculating a minimum spanning forest on graphs."""
-__all__ = ["msf_boruvka"]
+__all__ = ["msf_boruvka", "msf_contract", "msf_filter_kruskal"]
 
 
 from typing import Optional, Tuple
 
 import arkouda as ak
 
-from akgraph.util import maximum, minimum, remove_duplicates
+from akgraph.util import canonize_partition, maximum, minimum, remove_duplicates
 
 
 def msf_boruvka(
@@ -107,3 +107,243 @@ def msf_boruvka(
     return c, vF, uF, wF
 
 
+def _rank_edges(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: ak.pdarray,
+    assume_sorted: bool = False
+) -> Tuple[ak.pdarray]:
+    """
+    Keep one copy of each undirected edge and order them by weight.
+
+    The position of an edge in the returned arrays is its rank. Ranks are
+    unique, so they give a strict total order on edges that breaks weight ties
+    consistently (both directions of an edge share the same rank).
+    """
+    fwd = V < U
+    A, B, X = V[fwd], U[fwd], W[fwd]
+    if not (assume_sorted and X.is_sorted()):
+        pi = ak.coargsort([X, A, B])
+        A, B, X = A[pi], B[pi], X[pi]
+    return A, B, X
+
+
+def _contract_rounds(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    R: ak.pdarray,
+    c: ak.pdarray,
+    verbose: bool = False
+) -> Tuple[ak.pdarray]:
+    """
+    Run Boruvka rounds with graph contraction until no edges remain.
+
+    V and U hold component labels (roots) rather than node labels, edges are
+    symmetric and R holds the rank of each edge. After every round edges are
+    relabeled to their new roots, intra-component edges are dropped and only
+    the lowest ranked edge between each pair of components survives.
+
+    Returns the updated component of each node and the ranks of the edges
+    added to the forest.
+    """
+    n = c.size
+    nodes_all = ak.arange(n)
+    forest = []
+
+    k = 0
+    while V.size > 0:
+        k += 1
+
+        # lightest edge out of each component
+        g = ak.GroupBy(V)
+        nodes, idx = g.argmin(R)
+        nbr, r_min = U[idx], R[idx]
+        forest.append(r_min)
+
+        # hook each component onto its neighbor, mutual pairs pick a root
+        parent = nodes_all[:]
+        parent[nodes] = nbr
+        mutual = (parent[nbr] == nodes) & (nodes < nbr)
+        parent[nodes[mutual]] = nodes[mutual]
+
+        # pointer jump to the roots of the new components
+        grand = parent[parent]
+        while not ak.all(grand == parent):
+            parent, grand = grand, grand[grand]
+
+        # contract: relabel, drop internal edges, keep lightest parallel edge
+        c = parent[c]
+        V, U = parent[V], parent[U]
+        external = V != U
+        V, U, R = V[external], U[external], R[external]
+        if V.size > 0:
+            g = ak.GroupBy([V, U])
+            (V, U), R = g.min(R)
+
+        if verbose:
+            print(f'   k = {k}\n'
+                  f' |C| = {mutual.sum()}\n'
+                  f' |E| = {V.size}\n')
+
+    F = ak.concatenate(forest, ordered=False) if forest else ak.zeros(0, 'int64')
+    return c, F
+
+
+def _forest_edges(
+    A: ak.pdarray,
+    B: ak.pdarray,
+    X: ak.pdarray,
+    F: ak.pdarray
+) -> Tuple[ak.pdarray]:
+    """Translate ranks of forest edges back to sorted (v, u, w) triples."""
+    F = ak.unique(F)
+    return remove_duplicates(A[F], B[F], X[F])
+
+
+def msf_contract(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: ak.pdarray,
+    verbose: bool = False
+) -> Tuple[ak.pdarray]:
+    """
+    Calculate the minimum spanning forest using Boruvka with contraction.
+
+    Edges must be symmetric (v, u, w) <==> (u, v, w).
+
+    Unlike `msf_boruvka`, which keeps all m edges around for every round, each
+    round contracts the graph: edges are relabeled to component ids, edges
+    inside a component are dropped and only the minimum-weight edge between
+    each pair of components is kept. The edge set shrinks geometrically.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray
+        edge weights
+    verbose : bool (default False)
+        print progress
+
+    Returns
+    -------
+    c : ak.pdarray[int64]
+        connected component of each node (minimal node in component)
+    vF : ak.pdarray[int64]
+        out nodes of MSF
+    uF : ak.pdarray[int64]
+        in nodes of MSF
+    wF : ak.pdarray
+        edge weights of MSF
+
+    See Also
+    --------
+    msf_boruvka()
+    msf_filter_kruskal()
+    """
+    n = max(V.max(), U.max()) + 1
+    A, B, X = _rank_edges(V, U, W)
+    R = ak.arange(A.size)
+    V, U, R = (ak.concatenate([A, B], ordered=False),
+               ak.concatenate([B, A], ordered=False),
+               ak.concatenate([R, R], ordered=False))
+
+    c, F = _contract_rounds(V, U, R, ak.arange(n), verbose)
+    vF, uF, wF = _forest_edges(A, B, X, F)
+
+    return canonize_partition(c), vF, uF, wF
+
+
+def msf_filter_kruskal(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: ak.pdarray,
+    chunk_size: Optional[int] = None,
+    verbose: bool = False
+) -> Tuple[ak.pdarray]:
+    """
+    Calculate the minimum spanning forest using a filter-Kruskal strategy.
+
+    Edges must be symmetric (v, u, w) <==> (u, v, w).
+
+    Edges are processed in weight order, `chunk_size` edges at a time. Before a
+    chunk is processed it is filtered against the forest built so far: edges
+    whose ends already lie in the same component are discarded. The surviving
+    edges are contracted with Boruvka rounds. Heavy edges are therefore
+    usually discarded without ever taking part in a round.
+
+    If the weights of the forward edges (v < u) are already sorted the initial
+    sort is skipped.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray
+        edge weights
+    chunk_size : int (default 2 * n)
+        number of undirected edges examined per chunk
+    verbose : bool (default False)
+        print progress
+
+    Returns
+    -------
+    c : ak.pdarray[int64]
+        connected component of each node (minimal node in component)
+    vF : ak.pdarray[int64]
+        out nodes of MSF
+    uF : ak.pdarray[int64]
+        in nodes of MSF
+    wF : ak.pdarray
+        edge weights of MSF
+
+    See Also
+    --------
+    msf_contract()
+
+    References
+    ----------
+    The Filter-Kruskal Minimum Spanning Tree Algorithm.
+        Vitaly Osipov, Peter Sanders, Johannes Singler. ALENEX (2009)
+    """
+    n = max(V.max(), U.max()) + 1
+    A, B, X = _rank_edges(V, U, W, assume_sorted=True)
+    m = A.size
+    chunk_size = 2 * n if chunk_size is None else chunk_size
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be positive: {chunk_size}')
+
+    c = ak.arange(n)
+    forest = []
+    for lo in range(0, m, chunk_size):
+        hi = min(lo + chunk_size, m)
+
+        # filter: drop edges already inside a component
+        cA, cB = c[A[lo:hi]], c[B[lo:hi]]
+        R = ak.arange(lo, hi)
+        external = cA != cB
+        cA, cB, R = cA[external], cB[external], R[external]
+
+        if verbose:
+            print(f' chunk = [{lo}, {hi})\n'
+                  f'  kept = {cA.size}\n')
+
+        if cA.size == 0:
+            continue
+
+        Vc, Uc, Rc = (ak.concatenate([cA, cB], ordered=False),
+                      ak.concatenate([cB, cA], ordered=False),
+                      ak.concatenate([R, R], ordered=False))
+        g = ak.GroupBy([Vc, Uc])
+        (Vc, Uc), Rc = g.min(Rc)
+        c, F = _contract_rounds(Vc, Uc, Rc, c, verbose)
+        forest.append(F)
+
+    F = ak.concatenate(forest, ordered=False) if forest else ak.zeros(0, 'int64')
+    vF, uF, wF = _forest_edges(A, B, X, F)
+
+    return canonize_partition(c), vF, uF, wF
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Locality-aware node orderings.
+
+Arkouda distributes arrays in contiguous blocks, one per locale, so node i
+lives on locale i // ceil(n / numLocales). Gathers along an edge stay on one
+locale only when both endpoints fall in the same block. Random labels (from
+`rmat(permute=True)` or hashing) put almost every edge across locales. The
+orderings here relabel nodes so that neighbors get nearby labels.
+
+An ordering is a permutation `pi` with pi[old] = new. Relabel edges with
+`apply_order`. Node vectors computed on the relabeled graph map back with
+x = x_new[pi], and node vectors map forward with x_new = x[inverse_order(pi)].
+
+Edges must be symmetric (u, v) <==> (v, u).
+"""
+__all__ = [
+    "apply_order",
+    "cut_fraction",
+    "degree_sort_order",
+    "inverse_order",
+    "label_propagation_order",
+    "locality_order",
+    "rcm_order",
+]
+
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+import arkouda as ak
+from aksolve.semiring import MIN_SELECT2ND, SpMV
+
+from akgraph.community import cdlp
+from akgraph.components import fast_sv
+from akgraph.util import graph_index, sort_edges
+
+
+def inverse_order(pi: ak.pdarray) -> ak.pdarray:
+    """Return the inverse permutation, inv[new] = old."""
+    inv = ak.zeros_like(pi)
+    inv[pi] = ak.arange(pi.size)
+    return inv
+
+
+def apply_order(
+    pi: ak.pdarray,
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: Optional[ak.pdarray] = None,
+    sort: bool = True
+) -> Tuple[ak.pdarray]:
+    """
+    Relabel edges with the ordering `pi`.
+
+    Parameters
+    ----------
+    pi : ak.pdarray[int64]
+        pi[old] = new label
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray (optional)
+        edge weights
+    sort : bool (default True)
+        sort relabeled edges by out node then in node
+
+    Return
+    ------
+    X : ak.pdarray[int64]
+        relabeled out nodes
+    Y : ak.pdarray[int64]
+        relabeled in nodes
+    W : ak.pdarray (optional)
+        edge weights, in the same order as X, Y
+    """
+    X, Y = pi[V], pi[U]
+    if sort:
+        return sort_edges(X, Y, W)
+    return (X, Y, W) if W is not None else (X, Y)
+
+
+def degree_sort_order(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    descending: bool = True
+) -> ak.pdarray:
+    """
+    Order nodes by degree, ties broken by label.
+
+    High-degree nodes are gathered most often, so packing them together keeps
+    the hottest part of every node vector on as few locales as possible.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    descending : bool (default True)
+        largest degree first
+
+    Return
+    ------
+    pi : ak.pdarray[int64]
+        pi[old] = new label
+    """
+    deg = graph_index(V, U).out_degree
+    key = -deg if descending else deg
+    return inverse_order(ak.coargsort([key, ak.arange(deg.size)]))
+
+
+def rcm_order(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    reverse: bool = True,
+    verbose: bool = False
+) -> ak.pdarray:
+    """
+    Reverse Cuthill-McKee style breadth first ordering.
+
+    Every connected component is searched from a minimal degree node at the
+    same time, one level per step. New nodes in a level are numbered in order
+    of their earliest numbered parent, then degree. Finally components are
+    made contiguous, so each component occupies a narrow band of labels.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    reverse : bool (default True)
+        reverse the Cuthill-McKee order
+    verbose : bool (default False)
+        display progress
+
+    Return
+    ------
+    pi : ak.pdarray[int64]
+        pi[old] = new label
+
+    References
+    ----------
+    Reducing the bandwidth of sparse symmetric matrices. E. Cuthill and J.
+        McKee. Proceedings of the 24th National Conference of the ACM, 1969.
+    """
+    n = V.max() + 1
+    A_T = SpMV(U, V, shape=(n, n))
+    deg = A_T.row_counts
+    inf = np.iinfo(np.int64).max
+
+    # start every component at one of its minimal degree nodes
+    _, comp = fast_sv(V, U)
+    _, seeds = ak.GroupBy(comp).argmin(deg)
+    seeds = seeds[ak.coargsort([deg[seeds], seeds])]
+
+    label = ak.zeros(n, 'int64') - 1
+    node_at = ak.zeros(n, 'int64')
+    root = ak.zeros(n, 'int64')
+    label[seeds] = ak.arange(seeds.size)
+    node_at[:seeds.size] = seeds
+    root[seeds] = seeds
+    frontier = (label >= 0)
+    k, depth = seeds.size, 0
+
+    while k < n and frontier.any():
+        depth += 1
+        parent = A_T(ak.where(frontier, label, inf), MIN_SELECT2ND,
+                     mask=(label < 0), sparse=None)
+        frontier = (parent < inf)
+        new = ak.arange(n)[frontier]
+        new = new[ak.coargsort([parent[new], deg[new], new])]
+        label[new] = ak.arange(k, k + new.size)
+        node_at[k:k + new.size] = new
+        root[new] = root[node_at[parent[new]]]
+        k += new.size
+
+        if verbose:
+            print(f' depth = {depth}')
+            print(f'   |F| = {new.size:,d}\n')
+
+    # keep components contiguous, in order of their seeds
+    pi = inverse_order(ak.coargsort([label[root], label]))
+    return (n - 1) - pi if reverse else pi
+
+
+def label_propagation_order(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    max_iter: int = 10
+) -> ak.pdarray:
+    """
+    Order nodes by label propagation community, then by degree.
+
+    Communities become contiguous label ranges, so consecutive blocks of
+    labels (one per locale) approximate a partition with few cut edges.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    max_iter : int (default 10)
+        label propagation iterations, communities need not converge
+
+    Return
+    ------
+    pi : ak.pdarray[int64]
+        pi[old] = new label
+
+    See Also
+    --------
+    cdlp()
+    """
+    comm = cdlp(V, U, randomize=False, max_iter=max_iter)[3]
+    deg = graph_index(V, U).out_degree
+    return inverse_order(ak.coargsort([comm, -deg, ak.arange(deg.size)]))
+
+
+def locality_order(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    method: str = 'rcm',
+    **kwargs
+) -> ak.pdarray:
+    """
+    Compute a locality improving node ordering.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    method : str (default 'rcm')
+        'degree', 'rcm' or 'label_propagation'
+    kwargs
+        passed to the ordering function
+
+    Return
+    ------
+    pi : ak.pdarray[int64]
+        pi[old] = new label
+    """
+    methods = {
+        'degree': degree_sort_order,
+        'label_propagation': label_propagation_order,
+        'rcm': rcm_order,
+    }
+    if method not in methods:
+        raise ValueError(f'invalid method: {method}')
+    return methods[method](V, U, **kwargs)
+
+
+def cut_fraction(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    num_locales: Optional[int] = None
+) -> float:
+    """
+    Fraction of edges whose endpoints live on different locales.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    num_locales : int (optional)
+        number of blocks, default to the connected server's locales
+
+    Return
+    ------
+    f : float
+        cut edges / all edges
+    """
+    if num_locales is None:
+        num_locales = ak.get_config()['numLocales']
+    n = max(V.max(), U.max()) + 1
+    block = -(-n // num_locales)
+    return ((V // block) != (U // block)).sum() / V.size
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Out-of-core versions of GroupBy-broadcast/reduce algorithms.
+
+The edge list stays on disk in HDF5 files and is streamed through the server a
+chunk at a time, while node vectors stay resident. Each pass over the edges
+accumulates per-node partial results, so peak memory is bounded by the node
+vectors plus one chunk of edges. The price is re-reading the edges from disk
+every iteration; `EdgeChunks.pass_bytes` records how much was read per pass.
+
+Node labels must be integers in [0..n-1].
+"""
+__all__ = [
+    "EdgeChunks",
+    "ooc_bfs_distance",
+    "ooc_degree",
+    "ooc_eigenvector_centrality",
+    "ooc_in_degree",
+    "ooc_out_degree",
+    "ooc_pagerank",
+]
+
+
+from typing import Iterator, List, Optional, Tuple, Union
+from warnings import warn
+
+import numpy as np
+
+import arkouda as ak
+
+
+class EdgeChunks:
+    """
+    An edge list stored in HDF5 files and read a few files at a time.
+
+    Parameters
+    ----------
+    files : { str | List[str] }
+        HDF5 files holding the edge list, one shard per file
+    source : str (default 'src')
+        dataset name of out nodes
+    target : str (default 'dst')
+        dataset name of in nodes
+    weight : str (optional)
+        dataset name of edge weights
+    files_per_chunk : int (default 1)
+        number of files loaded into the server at once
+    n : int (optional)
+        number of nodes, found with an extra pass if not given
+
+    Attributes
+    ----------
+    bytes_read : int
+        total bytes loaded from disk
+    pass_bytes : List[int]
+        bytes loaded during each complete pass over the edges
+    """
+
+    def __init__(
+        self,
+        files: Union[str, List[str]],
+        source: str = 'src',
+        target: str = 'dst',
+        weight: Optional[str] = None,
+        files_per_chunk: int = 1,
+        n: Optional[int] = None
+    ):
+        if files_per_chunk < 1:
+            raise ValueError(f'files_per_chunk must be positive: {files_per_chunk}')
+        self.files = [files] if isinstance(files, str) else list(files)
+        self.source, self.target, self.weight = source, target, weight
+        self.files_per_chunk = files_per_chunk
+        self.bytes_read = 0
+        self.pass_bytes = []
+        self._n = n
+
+    @property
+    def weighted(self) -> bool:
+        return self.weight is not None
+
+    @property
+    def n(self) -> int:
+        """Number of nodes (max label + 1)."""
+        if self._n is None:
+            n = 0
+            for V, U, _ in self:
+                n = max(n, V.max() + 1, U.max() + 1)
+            self._n = int(n)
+        return self._n
+
+    def __iter__(self) -> Iterator[Tuple[ak.pdarray, ak.pdarray, Optional[ak.pdarray]]]:
+        """Yield (V, U, W) for each chunk, W is None if unweighted."""
+        start = self.bytes_read
+        step = self.files_per_chunk
+        for i in range(0, len(self.files), step):
+            chunk = self.files[i:i + step]
+            V = ak.read_hdf(self.source, chunk)
+            U = ak.read_hdf(self.target, chunk)
+            W = ak.read_hdf(self.weight, chunk) if self.weighted else None
+            self.bytes_read += V.size * V.itemsize + U.size * U.itemsize
+            if W is not None:
+                self.bytes_read += W.size * W.itemsize
+            yield V, U, W
+        self.pass_bytes.append(self.bytes_read - start)
+
+
+def ooc_degree(
+    edges: EdgeChunks,
+    direction: str = 'out',
+    normalize: bool = False,
+    verbose: bool = False
+) -> ak.pdarray:
+    """
+    Compute node degrees one chunk of edges at a time.
+
+    For weighted edge lists, the degree is the sum of edge weights.
+
+    Parameters
+    ----------
+    edges : EdgeChunks
+        edge list on disk
+    direction : str (default 'out')
+        'out', 'in' or 'all' (in + out, counts each edge at both ends)
+    normalize : bool (default False)
+        output sums to one
+    verbose : bool (default False)
+        print bytes read
+
+    Returns
+    -------
+    d : ak.pdarray
+        degree of each node
+    """
+    if direction not in ('out', 'in', 'all'):
+        raise ValueError(f'invalid direction: {direction}')
+
+    n = edges.n
+    d = ak.zeros(n, 'float64' if edges.weighted else 'int64')
+    for V, U, W in edges:
+        ends = {'out': [V], 'in': [U], 'all': [V, U]}[direction]
+        for X in ends:
+            g = ak.GroupBy(X)
+            node, deg = g.sum(W) if W is not None else g.count()
+            d[node] += deg
+
+    if verbose:
+        print(f' bytes = {edges.pass_bytes[-1]:,d}\n')
+
+    return d / d.sum() if normalize else d
+
+
+def ooc_in_degree(
+    edges: EdgeChunks,
+    normalize: bool = False,
+    verbose: bool = False
+) -> ak.pdarray:
+    """Compute in-degrees one chunk of edges at a time, see `ooc_degree`."""
+    return ooc_degree(edges, 'in', normalize, verbose)
+
+
+def ooc_out_degree(
+    edges: EdgeChunks,
+    normalize: bool = False,
+    verbose: bool = False
+) -> ak.pdarray:
+    """Compute out-degrees one chunk of edges at a time, see `ooc_degree`."""
+    return ooc_degree(edges, 'out', normalize, verbose)
+
+
+def ooc_pagerank(
+    edges: EdgeChunks,
+    p_vec: Optional[ak.pdarray] = None,
+    x_start: Optional[ak.pdarray] = None,
+    max_iter: int = 100,
+    alpha: float = 0.85,
+    tol: float = 1.0e-8,
+    verbose: bool = False
+) -> ak.pdarray:
+    """
+    Compute PageRank streaming the edges from disk every iteration.
+
+    Same model and parameters as `pagerank`, but the edges are read from
+    `edges` once per iteration (plus once to compute out-degrees).
+
+    Parameters
+    ----------
+    edges : EdgeChunks
+        edge list on disk
+    p_vec : ak.pdarray[float64] (optional)
+        personalization vector, uniform if None
+    x_start : ak.pdarray[float64] (optional)
+        starting PageRank for each node
+    max_iter : int (default 100)
+        maximum_number of iterations in power method
+    alpha : float (default 0.85)
+        damping factor
+    tol : float (default 1.0e-8)
+        tolerance for convergance test
+    verbose : bool (default False)
+        print bytes read per iteration
+
+    Return
+    ------
+    x : ak.pdarray[float64]
+        PageRank centrality for each node
+
+    See Also
+    --------
+    pagerank()
+    """
+    n = edges.n
+
+    if p_vec is None:
+        p = ak.ones(n, 'float64') / n
+    else:
+        if p_vec.size != n:
+            raise ValueError(f'Bad personalization vector.')
+        p = p_vec / p_vec.sum()
+
+    if x_start is None:
+        y = ak.ones(n, 'float64') / n
+    else:
+        if x_start.size != n:
+            raise ValueError(f'Bad starting vector.')
+        y = x_start / x_start.sum()
+
+    deg = ooc_degree(edges, 'out')
+    is_dangling = (deg == 0)
+    inv_deg = 1.0 / ak.where(is_dangling, 1, deg)
+
+    x = ak.zeros_like(y)
+    for k in range(max_iter):
+        x[:] = y[:]
+        y[:] = 0
+
+        # y = a * x @ L_rw, one chunk at a time
+        for V, U, W in edges:
+            x_edge = x[V] * inv_deg[V]
+            if W is not None:
+                x_edge *= W
+            g = ak.GroupBy(U)
+            u_nodes, xu = g.sum(x_edge)
+            y[u_nodes] += xu
+        y *= alpha
+
+        # y += a * w_dangling * p  - (1 - a) * p
+        y += alpha * x[is_dangling].sum() * p
+        y += (1 - alpha) * p
+
+        y /= y.sum()
+        delta = ak.abs(y - x).sum()
+
+        if verbose:
+            print(f'     k = {k + 1}\n'
+                  f' delta = {delta:0.3e}\n'
+                  f' bytes = {edges.pass_bytes[-1]:,d}\n')
+
+        # check convergence
+        if delta < tol * n:
+            break
+    else:
+        warn(f"did not converge in {max_iter} steps beware...")
+
+    return y
+
+
+def ooc_eigenvector_centrality(
+    edges: EdgeChunks,
+    max_iter: int = 100,
+    tol: float = 1e-08,
+    verbose: bool = False
+) -> Tuple[float, ak.pdarray]:
+    """
+    Compute eigenvector centrality streaming the edges from disk.
+
+    Same model as `eigenvector_centrality`; edge weights are used when
+    `edges` is weighted.
+
+    Parameters
+    ----------
+    edges : EdgeChunks
+        edge list on disk
+    max_iter : int (default 100)
+        maximum number of iterations in power method
+    tol : float (default 1.0e-8)
+        tolerance for convergence test
+    verbose : bool (default False)
+        print bytes read per iteration
+
+    Returns
+    -------
+    c : float
+        largest (absolute value) eigenvalue of A
+    e : ap.pdarray[float64]
+        dominant eigenvector of A
+
+    See Also
+    --------
+    eigenvector_centrality()
+    """
+    n = edges.n
+    e = ak.ones(n, 'float64') / np.sqrt(n)
+    e_prev = ak.zeros_like(e)
+
+    for k in range(max_iter):
+        e_prev[:] = e[:]
+        e[:] = 0
+
+        # e = A @ e, one chunk at a time
+        for V, U, W in edges:
+            e_edge = e_prev[U] * W if W is not None else e_prev[U]
+            g = ak.GroupBy(V)
+            v_nodes, new_e = g.sum(e_edge)
+            e[v_nodes] += new_e
+
+        # calculate eigenvalue and normalize
+        c = ak.sum(e_prev * e)
+        e /= np.sqrt(ak.sum(e * e))
+        delta = ak.abs(e - e_prev).sum()
+
+        if verbose:
+            print(f'     k = {k + 1}\n'
+                  f' delta = {delta:0.3e}\n'
+                  f' bytes = {edges.pass_bytes[-1]:,d}\n')
+
+        # check convergence
+        if delta < tol * n:
+            break
+    else:
+        warn(f"did not converge in {max_iter} steps, beware...")
+
+    return (c, e)
+
+
+def ooc_bfs_distance(
+    edges: EdgeChunks,
+    source: Union[int, ak.pdarray],
+    depth_limit: Optional[int] = None,
+    verbose: bool = False
+) -> ak.pdarray:
+    """
+    Breadth first search distances streaming the edges from disk.
+
+    Each level of the search is one pass over the edges.
+
+    Parameters
+    ----------
+    edges : EdgeChunks
+        edge list on disk
+    source : { int | ak.pdarray[int64] }
+        source node(s)
+    depth_limit : int, optional (default n)
+        only traverse this many levels
+    verbose : bool (default False)
+        print frontier size and bytes read per level
+
+    Return
+    ------
+    dist : ak.pdarray[int64]
+        distance from source nodes if visited, else -1
+
+    See Also
+    --------
+    bfs_distance()
+    """
+    n = edges.n
+    depth_limit = n if depth_limit is None else depth_limit
+
+    depth = 0
+    dist = ak.zeros(n, 'int64') - 1
+    dist[source] = depth
+    frontier = (dist == depth)
+    reached = ak.zeros(n, 'bool')
+
+    while frontier.sum() > 0 and depth < depth_limit:
+        depth += 1
+        reached[:] = False
+        for V, U, _ in edges:
+            nbrs = U[frontier[V]]
+            if nbrs.size > 0:
+                reached[nbrs] = True
+        frontier = reached & (dist < 0)
+        dist[frontier] = depth
+
+        if verbose:
+            print(f' depth = {depth}\n'
+                  f'   |F| = {frontier.sum():,d}\n'
+                  f' bytes = {edges.pass_bytes[-1]:,d}\n')
+
+    return dist
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Estimate the server memory algorithms need and pick variants that fit.
+
+The estimates are built from the arrays each function allocates (edge-length
+temporaries, GroupBys and node vectors) and include the input edge list. They
+are deliberately coarse: the goal is to catch a job that needs several times
+the available memory before it runs for hours, not to predict usage exactly.
+
+When no in-memory variant fits, algorithms with an out-of-core counterpart
+(see `akgraph.outofcore`) are planned with the largest edge chunk that fits
+next to the resident node vectors.
+
+A GroupBy over m keys keeps a permutation (m int64s) plus unique keys and
+segments (2 * n int64s), and needs roughly two more key-length int64 buffers
+per key while it sorts.
+"""
+__all__ = [
+    "MemoryPlan",
+    "available_memory",
+    "estimate_memory",
+    "plan_algorithm",
+    "run_planned",
+]
+
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import arkouda as ak
+
+
+INT, FLOAT, BOOL = 8, 8, 1
+
+
+class MemoryPlan(NamedTuple):
+    """Outcome of `plan_algorithm`."""
+    requested: str                # algorithm asked for
+    algorithm: str                # algorithm recommended
+    estimate: int                 # peak bytes of the recommended algorithm
+    available: int                # bytes the server can still allocate
+    fits: bool                    # recommended algorithm fits in budget
+    estimates: Dict[str, int]     # peak bytes of every candidate
+    chunk_edges: Optional[int] = None  # edges per chunk if out-of-core
+
+
+def _groupby(m: int, n: int, nkeys: int = 1) -> Tuple[int, int]:
+    """Return (persistent, transient) bytes of a GroupBy over m keys."""
+    return m * INT + 2 * n * INT, 2 * nkeys * m * INT
+
+
+def _peak(resident: int, *groupbys: Tuple[int, int]) -> int:
+    """Resident arrays plus all GroupBys plus the worst single sort."""
+    return (resident
+            + sum(p for p, _ in groupbys)
+            + max((t for _, t in groupbys), default=0))
+
+
+def _degree(n, m, weighted):
+    # cached gV and gU with in and out degrees; unweighted also matches
+    # packed (V, U) keys against their reverses with in1d (one 2m key sort)
+    resident = 4 * n * (FLOAT if weighted else INT)
+    if weighted:
+        return _peak(resident, _groupby(m, n), _groupby(m, n))
+    resident += 2 * m * INT + m * BOOL
+    return _peak(resident, _groupby(m, n), _groupby(m, n), (0, 2 * 2 * m * INT))
+
+
+def _dir_degree(n, m, weighted):
+    return _peak(n * INT, _groupby(m, n))
+
+
+def _power_method(n, m, weighted):
+    # eigenvector_centrality / hub_auth: gV, gU, gathered and weighted edges
+    resident = 2 * m * FLOAT + 6 * n * FLOAT
+    return _peak(resident, _groupby(m, n), _groupby(m, n))
+
+
+def _pagerank(n, m, weighted):
+    # normalized weights, gathered edge values and their product
+    resident = 3 * m * FLOAT + 6 * n * FLOAT + n * BOOL
+    return _peak(resident, _groupby(m, n), _groupby(m, n))
+
+
+def _bfs(n, m, weighted):
+    # traversal_prep builds gV, gU and a union of node sets
+    resident = m * BOOL + m * INT + 6 * n * INT
+    return _peak(resident, _groupby(m, n), _groupby(m, n))
+
+
+def _sssp_bf(n, m, weighted):
+    resident = 2 * m * FLOAT + 4 * n * INT
+    return _peak(resident, _groupby(m, n))
+
+
+def _cdlp(n, m, weighted):
+    # GroupBy([U, outC]) with m rows every iteration, plus its outputs
+    resident = m * INT + 3 * m * INT + 4 * n * INT
+    return _peak(resident, _groupby(m, n), _groupby(m, m, 2), _groupby(m, n))
+
+
+def _components(n, m, weighted):
+    # bfs_lp / fast_sv / lps: two GroupBys and gathered labels per edge
+    resident = 3 * m * INT + 6 * n * INT
+    return _peak(resident, _groupby(m, n), _groupby(m, n))
+
+
+def _k_core(n, m, weighted):
+    resident = m * BOOL + 4 * n * INT
+    return _peak(resident, _groupby(m, n))
+
+
+def _mis(n, m, weighted):
+    resident = 2 * m * INT + 4 * m * BOOL + 6 * n * INT
+    return _peak(resident, _groupby(m, n), _groupby(m, n))
+
+
+def _msf_boruvka(n, m, weighted):
+    # cV, cU, W_active, mask every round plus GroupBy(cU) over all m edges
+    resident = 3 * m * INT + m * FLOAT + 2 * m * BOOL + 6 * n * INT
+    return _peak(resident, _groupby(m, n), _groupby(m, n), _groupby(n, n))
+
+
+def _msf_contract(n, m, weighted):
+    # ranked forward edges (m / 2) and symmetric working copy with ranks
+    resident = (m // 2) * (2 * INT + FLOAT) + 3 * m * INT + 3 * n * INT
+    return _peak(resident, _groupby(m, n), _groupby(m, m, 2))
+
+
+def _msf_filter_kruskal(n, m, weighted):
+    # like msf_contract but only one chunk (2 * n edges) is expanded
+    k = min(m, 4 * n)
+    resident = (m // 2) * (2 * INT + FLOAT) + 3 * k * INT + 3 * n * INT
+    return _peak(resident, _groupby(k, n), _groupby(k, k, 2))
+
+
+def _standardize_edges(n, m, weighted):
+    # min/max copies, dedup sort, relabel GroupBys, symmetrize and sort
+    resident = 4 * m * INT + (2 * m * FLOAT if weighted else 0) + n * INT
+    return _peak(resident, _groupby(2 * m, n, 2), _groupby(m, n),
+                 _groupby(m, n))
+
+
+ESTIMATORS: Dict[str, Callable[[int, int, bool], int]] = {
+    'bfs_distance': _bfs,
+    'bfs_forest': _bfs,
+    'bfs_lp': _components,
+    'bfs_reachable': _bfs,
+    'cdlp': _cdlp,
+    'degree': _degree,
+    'eigenvector_centrality': _power_method,
+    'fast_sv': _components,
+    'hub_auth': _power_method,
+    'in_degree': _dir_degree,
+    'k_core': _k_core,
+    'lps': _components,
+    'maximal_independent_set': _mis,
+    'msf_boruvka': _msf_boruvka,
+    'msf_contract': _msf_contract,
+    'msf_filter_kruskal': _msf_filter_kruskal,
+    'out_degree': _dir_degree,
+    'pagerank': _pagerank,
+    'sssp_bf': _sssp_bf,
+    'standardize_edges': _standardize_edges,
+}
+
+
+def _ooc_degree(n, k, weighted):
+    # one chunk of edges, a GroupBy over it and the degree vector
+    chunk = 2 * k * INT + (k * FLOAT if weighted else 0)
+    return _peak(chunk + n * FLOAT, _groupby(k, n))
+
+
+def _ooc_power_method(n, k, weighted):
+    # node vectors stay resident, chunk plus gathered values per edge
+    chunk = 2 * k * INT + (k * FLOAT if weighted else 0) + 2 * k * FLOAT
+    return _peak(chunk + 6 * n * FLOAT + n * BOOL, _groupby(k, n))
+
+
+def _ooc_bfs(n, k, weighted):
+    chunk = 2 * k * INT + k * BOOL + k * INT
+    return _peak(chunk + n * INT + 3 * n * BOOL)
+
+
+# Out-of-core counterparts and the memory they need for a chunk of k edges.
+# Their input is an `EdgeChunks` rather than in-memory edges.
+OUT_OF_CORE: Dict[str, Tuple[str, Callable[[int, int, bool], int]]] = {
+    'bfs_distance': ('ooc_bfs_distance', _ooc_bfs),
+    'degree': ('ooc_degree', _ooc_degree),
+    'eigenvector_centrality': ('ooc_eigenvector_centrality', _ooc_power_method),
+    'in_degree': ('ooc_in_degree', _ooc_degree),
+    'out_degree': ('ooc_out_degree', _ooc_degree),
+    'pagerank': ('ooc_pagerank', _ooc_power_method),
+}
+
+# Lower memory alternatives in order of preference. Every alternative must
+# accept the same arguments as the algorithm it replaces.
+VARIANTS: Dict[str, List[str]] = {
+    'msf_boruvka': ['msf_filter_kruskal'],
+    'msf_contract': ['msf_filter_kruskal'],
+}
+
+
+def estimate_memory(
+    algorithm: str,
+    n: int,
+    m: int,
+    weighted: bool = False
+) -> int:
+    """
+    Estimate peak server memory (bytes) needed to run `algorithm`.
+
+    Parameters
+    ----------
+    algorithm : str
+        name of an akgraph function (see `ESTIMATORS`)
+    n : int
+        number of nodes
+    m : int
+        number of (directed) edges
+    weighted : bool (default False)
+        edges carry float64 weights
+
+    Returns
+    -------
+    nbytes : int
+        estimated peak, including the input edge list
+    """
+    if algorithm not in ESTIMATORS:
+        raise ValueError(f'no memory model for {algorithm}')
+
+    edges = 2 * m * INT + (m * FLOAT if weighted else 0)
+    return edges + ESTIMATORS[algorithm](n, m, weighted)
+
+
+def available_memory() -> int:
+    """Bytes the arkouda server can still allocate (summed over locales)."""
+    if hasattr(ak, 'get_mem_avail'):
+        return int(ak.get_mem_avail())
+
+    cfg = ak.get_config()
+    total = sum(loc['physicalMemory'] for loc in cfg['LocaleConfigs'])
+    return int(total - ak.get_mem_used())
+
+
+def plan_algorithm(
+    algorithm: str,
+    n: int,
+    m: int,
+    weighted: bool = False,
+    available: Optional[int] = None,
+    safety: float = 0.8
+) -> MemoryPlan:
+    """
+    Decide whether `algorithm` fits in server memory and suggest a variant.
+
+    The requested algorithm is kept if it fits in `safety * available` bytes.
+    Otherwise the first lower memory variant that fits is recommended. Failing
+    that, an out-of-core counterpart is recommended with `chunk_edges` set to
+    the largest chunk that fits. If nothing fits, the variant with the
+    smallest estimate is reported with `fits=False`.
+    When `available` is queried from the server, the input edge list is
+    already resident, so its size is added back before comparing.
+
+    Parameters
+    ----------
+    algorithm : str
+        name of an akgraph function
+    n : int
+        number of nodes
+    m : int
+        number of (directed) edges
+    weighted : bool (default False)
+        edges carry float64 weights
+    available : int (optional)
+        bytes available, default queries the server
+    safety : float (default 0.8)
+        fraction of the available memory the plan may use
+
+    Returns
+    -------
+    plan : MemoryPlan
+        recommended algorithm with its estimate and all candidate estimates
+    """
+    if available is None:
+        available = available_memory() + 2 * m * INT + (m * FLOAT if weighted else 0)
+    budget = safety * available
+
+    candidates = [algorithm] + VARIANTS.get(algorithm, [])
+    estimates = {a: estimate_memory(a, n, m, weighted) for a in candidates}
+
+    for a in candidates:
+        if estimates[a] <= budget:
+            return MemoryPlan(algorithm, a, estimates[a], available, True, estimates)
+
+    if algorithm in OUT_OF_CORE:
+        name, model = OUT_OF_CORE[algorithm]
+        resident = model(n, 0, weighted)
+        per_edge = model(n, 1, weighted) - resident
+        k = int(min(m, (budget - resident) // per_edge))
+        if k > 0:
+            estimates[name] = model(n, k, weighted)
+            return MemoryPlan(algorithm, name, estimates[name], available,
+                              True, estimates, k)
+
+    a = min(candidates, key=estimates.get)
+    return MemoryPlan(algorithm, a, estimates[a], available, False, estimates)
+
+
+def run_planned(
+    algorithm: str,
+    V: ak.pdarray,
+    U: ak.pdarray,
+    *args,
+    weighted: bool = False,
+    safety: float = 0.8,
+    verbose: bool = False,
+    **kwargs
+):
+    """
+    Run `algorithm`, or a lower memory variant if it would not fit.
+
+    Extra positional and keyword arguments are passed through unchanged, so
+    the variants listed in `VARIANTS` share the signature of `algorithm`.
+
+    Raises
+    ------
+    MemoryError
+        if no candidate is expected to fit in server memory
+    """
+    import akgraph
+
+    n, m = max(V.max(), U.max()) + 1, V.size
+    plan = plan_algorithm(algorithm, n, m, weighted, safety=safety)
+    if verbose:
+        print(f'   requested = {plan.requested}\n'
+              f'   algorithm = {plan.algorithm}\n'
+              f'    estimate = {plan.estimate:,d} B\n'
+              f'   available = {plan.available:,d} B\n')
+
+    if not plan.fits:
+        raise MemoryError(f'{algorithm} needs ~{plan.estimate:,d} bytes '
+                          f'(of {plan.available:,d} available) even as '
+                          f'{plan.algorithm}')
+    if plan.chunk_edges is not None:
+        raise MemoryError(f'{algorithm} does not fit in memory, run '
+                          f'{plan.algorithm} on an EdgeChunks with at most '
+                          f'{plan.chunk_edges:,d} edges per chunk')
+
+    return getattr(akgraph, plan.algorithm)(V, U, *args, **kwargs)
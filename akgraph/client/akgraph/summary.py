@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""One-call sanity report for an edge list.
+
+`graph_summary` answers the checks usually run before an analysis (counts,
+loops, duplicates, symmetry, isolated nodes, degrees, sortedness, components,
+diameter) from the cached `graph_index` of the edge list. Degrees, the
+reciprocal edge test and the sorted adjacency matrix are computed once and
+stay cached for the algorithms run afterwards.
+"""
+__all__ = ["GraphSummary", "graph_summary"]
+
+
+from typing import NamedTuple, Optional
+
+import arkouda as ak
+from aksolve.semiring import OR_AND, SpMV
+
+from akgraph.components import fast_sv
+from akgraph.util import graph_index
+
+
+class GraphSummary(NamedTuple):
+    """Outcome of `graph_summary`, small enough to live on the client."""
+    n: int                         # number of nodes, max label + 1
+    m: int                         # number of edges
+    self_loops: int                # edges (v, v)
+    duplicates: int                # edges repeating an earlier (v, u)
+    symmetric: bool                # (v, u) <==> (u, v)
+    sorted: bool                   # sorted by out node then in node
+    isolated: int                  # labels in [0..n-1] without edges
+    min_degree: int                # smallest number of distinct neighbors
+    max_degree: int                # largest number of distinct neighbors
+    mean_degree: float             # average number of distinct neighbors
+    components: Optional[int]      # (weakly) connected components
+    largest_component: Optional[int]  # nodes in the largest component
+    diameter: Optional[int]        # lower bound from BFS sweeps
+
+
+def _eccentricity(A_T: SpMV, source: int) -> ak.pdarray:
+    """BFS distances from `source` with a prebuilt transposed adjacency."""
+    dist = ak.zeros(A_T.shape[0], 'int64') - 1
+    dist[source] = 0
+    frontier = (dist == 0)
+    depth = 0
+    while frontier.any():
+        depth += 1
+        frontier = A_T(frontier, OR_AND, mask=(dist < 0), sparse=None)
+        dist[frontier] = depth
+    return dist
+
+
+def graph_summary(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    components: bool = True,
+    diameter_sweeps: int = 0,
+    verbose: bool = False
+) -> GraphSummary:
+    """
+    Report basic statistics and sanity checks of an edge list.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    components : bool (default True)
+        count connected components (weakly connected for directed graphs)
+    diameter_sweeps : int (default 0)
+        number of BFS sweeps for a diameter lower bound. The first starts at
+        a maximum degree node, each later one at the farthest node found so
+        far. 2 sweeps are usually exact on real-world graphs.
+    verbose : bool (default False)
+        print the report
+
+    Return
+    ------
+    summary : GraphSummary
+        statistics of the edge list
+
+    See Also
+    --------
+    degree_summary()
+    """
+    if V.size == 0:
+        raise ValueError('empty edge list')
+    index = graph_index(V, U)
+    n, m = index.n, index.m
+
+    # sortedness and duplicates from adjacent pairs, one sort if unsorted
+    is_sorted = index.is_sorted
+    duplicates = index.duplicates
+
+    # distinct neighbors, from the deduplicated edges if any edge repeats
+    symmetric = bool(index.reciprocal.all())
+    deg = index.out_degree if symmetric and duplicates == 0 else index.degree
+    isolated = ((index.out_degree + index.in_degree) == 0).sum()
+
+    num_comps, largest = None, None
+    if components:
+        # reuses this index, weak components if not symmetric
+        _, comp = fast_sv(V, U, symmetrize=not symmetric)
+        _, size = ak.GroupBy(comp).count()
+        num_comps, largest = size.size, size.max()
+
+    diameter = None
+    if diameter_sweeps > 0:
+        A_T = index.spmv(transpose=True)
+        start, diameter = deg.argmax(), 0
+        for _ in range(diameter_sweeps):
+            dist = _eccentricity(A_T, start)
+            start = dist.argmax()
+            diameter = max(diameter, dist[start])
+
+    summary = GraphSummary(
+        n=n,
+        m=m,
+        self_loops=(V == U).sum(),
+        duplicates=duplicates,
+        symmetric=symmetric,
+        sorted=is_sorted,
+        isolated=isolated,
+        min_degree=deg.min(),
+        max_degree=deg.max(),
+        mean_degree=deg.sum() / n,
+        components=num_comps,
+        largest_component=largest,
+        diameter=diameter,
+    )
+
+    if verbose:
+        for field, value in summary._asdict().items():
+            print(f' {field:>17} = {value}')
+
+    return summary
@@ -1,11 +1,24 @@
 #!/usr/bin/env python3
 """Algorithms for traversing graphs."""
-__all__ = ["bfs_reachable", "bfs_distance", "bfs_forest"]
+__all__ = [
+    "bfs_reachable",
+    "bfs_distance",
+    "bfs_forest",
+    "bidirectional_bfs",
+    "bidirectional_sssp",
+    "sssp_bf",
+]
 
 
 from typing import Optional, Tuple, Union
 
+import numpy as np
+
 import arkouda as ak
+from aksolve.semiring import OR_AND, SpMV
+
+from akgraph.hubs import adjacency
+from akgraph.util import graph_index
 
 
 def traversal_prep(V: ak.pdarray, U: ak.pdarray):
@@ -54,7 +67,8 @@ def bfs_reachable(
     U: ak.pdarray,
     source: Union[int, ak.pdarray],
     depth_limit: Optional[int] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    hub_threshold: Union[int, str, None] = 'auto'
 ) -> ak.pdarray:
     """
     Perform a breadth-first search to determine reachability from `source`.
@@ -73,6 +87,8 @@ def bfs_reachable(
         assumes the edge list is sorted (by source vertex) and symmetric
     verbose : bool (default False)
         display progress
+    hub_threshold : { int | 'auto' | None } (default 'auto')
+        split nodes with larger degree into sub-nodes, see `adjacency`
 
     Return
     ------
@@ -84,29 +100,27 @@ def bfs_reachable(
     May take too long on high-diameter graphs.
     Nodes need not be consecutively labelled (still must be non-negative).
     """
-    N, n, nodes, vNodes, uNodes, vSort, uSort, gV, gU = traversal_prep(V, U)
-    depth_limit = n if depth_limit is None else depth_limit
+    index = graph_index(V, U)
+    N = index.n
+    A_T = adjacency(U, V, shape=(N, N), hub_threshold=hub_threshold,
+                    index=index)
+    depth_limit = N if depth_limit is None else depth_limit
 
-    depth = count = 0
-    if isinstance(source, int):
-        reachable = (nodes == source)
-    else:
-        reachable = ak.in1d(nodes, source)
+    depth = 0
+    reachable = ak.zeros(N, 'bool')
+    reachable[source] = True
+    frontier = reachable[:]
 
-    while count < reachable.sum() and depth < depth_limit:
+    while frontier.any() and depth < depth_limit:
         depth += 1
-        count = reachable.sum()
-        reachable_edge = gV.broadcast(reachable[vNodes], permute=bool(1 - vSort))
-        _, reachable_nbr = gU.any(reachable_edge)
-        reachable[uNodes] |= reachable_nbr
+        frontier = A_T(frontier, OR_AND, mask=~reachable, sparse=None)
+        reachable |= frontier
 
         if verbose:
             print(f' depth = {depth}')
-            print(f'   |F| = {reachable.sum() - count:,d}\n')
+            print(f'   |F| = {frontier.sum():,d}\n')
 
-    out = ak.zeros(N, 'bool')
-    out[nodes] = reachable
-    return out
+    return reachable
 
 
 def bfs_distance(
@@ -114,7 +128,8 @@ def bfs_distance(
     U: ak.pdarray,
     source: Union[int, ak.pdarray],
     depth_limit: Optional[int] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    hub_threshold: Union[int, str, None] = 'auto'
 ) -> ak.pdarray:
     """
     Perform a breadth first search to determine distances from `source`.
@@ -131,6 +146,8 @@ def bfs_distance(
         only traverse this many levels
     verbose : bool (default False)
         display progress
+    hub_threshold : { int | 'auto' | None } (default 'auto')
+        split nodes with larger degree into sub-nodes, see `adjacency`
 
     Return
     ------
@@ -142,32 +159,27 @@ def bfs_distance(
     May take too long on high-diameter graphs.
     Nodes need not be consecutively labelled (still must be non-negative).
     """
-    N, n, nodes, vNodes, uNodes, vSort, uSort, gV, gU = traversal_prep(V, U)
-    depth_limit = n if depth_limit is None else depth_limit
+    index = graph_index(V, U)
+    N = index.n
+    A_T = adjacency(U, V, shape=(N, N), hub_threshold=hub_threshold,
+                    index=index)
+    depth_limit = N if depth_limit is None else depth_limit
 
     depth = 0
-    dist = ak.zeros_like(nodes) - 1
-    if isinstance(source, int):
-        dist[nodes == source] = depth
-    else:
-        dist[ak.in1d(nodes, source)] = depth
+    dist = ak.zeros(N, 'int64') - 1
+    dist[source] = depth
     frontier = (dist == depth)
 
-    while frontier.sum() > 0 and depth < depth_limit:
+    while frontier.any() and depth < depth_limit:
         depth += 1
-        frontier_edge = gV.broadcast(frontier[vNodes], permute=bool(1 - vSort))
-        _, frontier_nbr = gU.any(frontier_edge)
-        frontier[:] = 0
-        frontier[uNodes] = frontier_nbr & (dist[uNodes] < 0)
+        frontier = A_T(frontier, OR_AND, mask=(dist < 0), sparse=None)
         dist[frontier] = depth
 
         if verbose:
             print(f' depth = {depth}')
             print(f'   |F| = {frontier.sum():,d}\n')
 
-    out = ak.zeros(N, 'int64') - 1
-    out[nodes] = dist
-    return out
+    return dist
 
 
 def bfs_forest(
@@ -312,4 +324,223 @@ def sssp_bf(
     return (tree, dist)
 
 
+class _SearchSide:
+    """
+    Sparse search state of one direction for a batch of point-to-point queries.
+
+    Nodes are keyed by q * n + node for query q, so every query explores its
+    own copy of the graph. Only reached nodes are stored.
+    """
+
+    def __init__(self, A: SpMV, start: ak.pdarray, n: int):
+        self.A, self.n = A, n
+        self.keys = ak.arange(start.size) * n + start   # sorted, unique
+        self.dist = ak.zeros(start.size, 'float64')
+        self.front = self.keys[:]
+        self.front_dist = self.dist[:]
+
+    def expand(self):
+        """Relax the out edges of the frontier, keep improved nodes."""
+        query, node = self.front // self.n, self.front % self.n
+        entries, item = self.A.row_entries(node)
+        if entries.size == 0:
+            self.front = self.front[:0]
+            self.front_dist = self.front_dist[:0]
+            return
+        step = 1.0 if self.A.vals is None else self.A.vals[entries]
+        new = query[item] * self.n + self.A.cols[entries]
+        new_dist = self.front_dist[item] + step
+
+        # merge with reached nodes: a node improved if its new distance
+        # beats the old one (inf for unreached nodes)
+        k = self.keys.size
+        inf_old = ak.zeros(k, 'float64') + np.inf
+        inf_new = ak.zeros(new.size, 'float64') + np.inf
+        g = ak.GroupBy(ak.concatenate([self.keys, new], ordered=False))
+        self.keys, old = g.min(ak.concatenate([self.dist, inf_new],
+                                              ordered=False))
+        _, tent = g.min(ak.concatenate([inf_old, new_dist], ordered=False))
+        improved = (tent < old)
+        self.dist = ak.where(improved, tent, old)
+        self.front = self.keys[improved]
+        self.front_dist = tent[improved]
+
+    def retain(self, active: ak.pdarray):
+        """Drop frontier nodes of finished queries."""
+        keep = active[self.front // self.n]
+        self.front = self.front[keep]
+        self.front_dist = self.front_dist[keep]
+
+    def front_min(self, num_queries: int) -> ak.pdarray:
+        """Smallest frontier distance of each query, inf if empty."""
+        m = ak.zeros(num_queries, 'float64') + np.inf
+        if self.front.size > 0:
+            q, d = ak.GroupBy(self.front // self.n).min(self.front_dist)
+            m[q] = d
+        return m
+
+
+def _bidirectional(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: Optional[ak.pdarray],
+    source: Union[int, ak.pdarray],
+    target: Union[int, ak.pdarray],
+    max_dist: float,
+    verbose: bool
+) -> ak.pdarray:
+    """Shortest s-t distances, searching from both ends of every pair."""
+    if W is not None and W.min() < 0:
+        raise ValueError('edge weights must be non-negative')
+    index = graph_index(V, U, W)
+    n = index.n
+    size = max(s.size if isinstance(s, ak.pdarray) else 1
+               for s in (source, target))
+    source = ak.zeros(size, 'int64') + source
+    target = ak.zeros(size, 'int64') + target
+    if source.size != target.size:
+        raise ValueError(f'size mismatch: {source.size} sources, '
+                         f'{target.size} targets')
+    if size > 0 and (max(source.max(), target.max()) >= n
+                     or min(source.min(), target.min()) < 0):
+        raise ValueError(f'sources and targets must be nodes in [0, {n})')
+
+    fwd = _SearchSide(index.spmv(), source, n)
+    bwd = _SearchSide(index.spmv(transpose=True), target, n)
+    best = ak.where(source == target, 0.0, np.inf)
+    active = (source != target)
+    fwd.retain(active)
+    bwd.retain(active)
+
+    k = 0
+    while active.any():
+        k += 1
+        # expand the smaller frontier, then look for meetings in the other
+        side, other = (fwd, bwd) if fwd.front.size <= bwd.front.size else (bwd, fwd)
+        side.expand()
+        if side.front.size > 0:
+            g = ak.GroupBy(ak.concatenate([side.front, other.keys],
+                                          ordered=False))
+            keys, count = g.count()
+            _, total = g.sum(ak.concatenate([side.front_dist, other.dist],
+                                            ordered=False))
+            met = (count == 2)
+            if met.any():
+                q, d = ak.GroupBy(keys[met] // n).min(total[met])
+                best[q] = ak.where(d < best[q], d, best[q])
+
+        # no unexplored path can beat best once the frontier minima sum to it
+        bound = fwd.front_min(size) + bwd.front_min(size)
+        active &= (bound < best) & (bound <= max_dist)
+        fwd.retain(active)
+        bwd.retain(active)
+
+        if verbose:
+            print(f' round = {k}')
+            print(f'   |F| = {fwd.front.size:,d} + {bwd.front.size:,d}')
+            print(f'   |Q| = {active.sum():,d}\n')
+
+    return ak.where((best <= max_dist) & (best < np.inf), best, -1.0)
+
+
+def bidirectional_bfs(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    source: Union[int, ak.pdarray],
+    target: Union[int, ak.pdarray],
+    depth_limit: Optional[int] = None,
+    verbose: bool = False
+) -> Union[int, ak.pdarray]:
+    """
+    Hop distance between pairs of nodes, searching from both ends.
+
+    Each query expands breadth first from its source along out edges and from
+    its target along in edges, always growing the smaller frontier, and stops
+    as soon as the searches meet. A query between nodes at distance d touches
+    roughly two balls of radius d / 2 instead of the whole reachable set.
+    Queries are answered together in one batch.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    source : { int | ak.pdarray[int64] }
+        start node(s) of each query
+    target : { int | ak.pdarray[int64] }
+        end node(s) of each query, paired with `source`
+    depth_limit : int (optional)
+        give up on pairs further apart than this many hops
+    verbose : bool (default False)
+        display progress
+
+    Return
+    ------
+    dist : { int | ak.pdarray[int64] }
+        number of hops from source to target, -1 if not reachable (within
+        depth_limit). An int if both source and target are ints.
+
+    See Also
+    --------
+    bfs_distance()
+    bidirectional_sssp()
+    """
+    max_dist = np.inf if depth_limit is None else depth_limit
+    dist = ak.cast(_bidirectional(V, U, None, source, target, max_dist,
+                                  verbose), 'int64')
+    scalar = not isinstance(source, ak.pdarray) and not isinstance(target, ak.pdarray)
+    return int(dist[0]) if scalar else dist
+
+
+def bidirectional_sssp(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: ak.pdarray,
+    source: Union[int, ak.pdarray],
+    target: Union[int, ak.pdarray],
+    max_dist: Optional[float] = None,
+    verbose: bool = False
+) -> Union[float, ak.pdarray]:
+    """
+    Weighted shortest path distance between pairs of nodes, from both ends.
+
+    Both searches relax edges out of the nodes whose distance improved in the
+    last round (Bellman-Ford style), growing the smaller frontier each round.
+    Every node reached from both sides gives an upper bound on the distance.
+    A query stops when the smallest forward and backward frontier distances
+    sum to at least its best bound, so paths are never explored past the
+    meeting point.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray
+        non-negative edge weights
+    source : { int | ak.pdarray[int64] }
+        start node(s) of each query
+    target : { int | ak.pdarray[int64] }
+        end node(s) of each query, paired with `source`
+    max_dist : float (optional)
+        give up on pairs further apart than this
+    verbose : bool (default False)
+        display progress
 
+    Return
+    ------
+    dist : { float | ak.pdarray[float64] }
+        shortest path length from source to target, -1 if not reachable
+        (within max_dist). A float if both source and target are ints.
+
+    See Also
+    --------
+    sssp_bf()
+    bidirectional_bfs()
+    """
+    max_dist = np.inf if max_dist is None else max_dist
+    dist = _bidirectional(V, U, W, source, target, max_dist, verbose)
+    scalar = not isinstance(source, ak.pdarray) and not isinstance(target, ak.pdarray)
+    return float(dist[0]) if scalar else dist
@@ -1,3 +1,4 @@
 """Utility functions for akgraph."""
 from akgraph.util.general import *
 from akgraph.util.graph import *
+from akgraph.util.index import *
@@ -23,7 +23,7 @@ __all__ = [
 ]
 
 
-from typing import List
+from typing import List, Optional
 import os
 import subprocess
 
@@ -100,38 +100,39 @@ def maximum(A: ak.pdarray, B: ak.pdarray) -> ak.pdarray:
     return ak.where(A <= B, B, A)
 
 
-def to_numpy(A: ak.pdarray, tmp_dir: str = '') -> np.ndarray:
-    """
-    Transfer an arkouda array to numpy using HDF5 on disk.
+def _transfer_chunk_size(itemsize: int, chunk_bytes: Optional[int]) -> int:
+    """Number of elements moved per request over the client connection."""
+    if chunk_bytes is None:
+        chunk_bytes = ak.client.maxTransferBytes
+    return max(1, chunk_bytes // max(1, itemsize))
 
-    TODOS
-    -----
-    Test for resulting size (make sure you don't overload a worker node.
-    """
+
+def _to_numpy_hdf5(A: ak.pdarray, tmp_dir: str = '') -> np.ndarray:
+    """Transfer an arkouda array to numpy using HDF5 on disk."""
     rng = np.random.randint(2 ** 64, dtype=np.uint64)
     tmp_dir = os.getcwd() if not tmp_dir else tmp_dir
     A.save(f"{tmp_dir}/{rng}")
     files = sorted(f"{tmp_dir}/{f}"
                    for f in os.listdir(tmp_dir) if f.startswith(str(rng)))
 
-    B = np.zeros(A.size, dtype=np.int64)
+    B = np.empty(A.size, dtype=A.dtype)
     i = 0
     for file in files:
         with h5py.File(file, 'r') as hf:
             a = hf["array"]
-            B[i : i + a.size] = a[:]
+            a.read_direct(B, dest_sel=np.s_[i : i + a.size])
             i += a.size
         os.remove(file)
 
     return B
 
 
-def from_numpy(A: np.ndarray, tmp_dir: str = '') -> ak.pdarray:
-    """Transfer a numpy array to arkouda using HDF5."""
-    rng = np.random.randint(2**64, dtype=np.uint64)
+def _from_numpy_hdf5(A: np.ndarray, tmp_dir: str = '') -> ak.pdarray:
+    """Transfer a numpy array to arkouda using HDF5 on disk."""
+    rng = np.random.randint(2 ** 64, dtype=np.uint64)
     tmp_dir = os.getcwd() if not tmp_dir else tmp_dir
     with h5py.File(f'{tmp_dir}/{rng}.hdf5', 'w') as f:
-        arr = f.create_dataset('arr', data=A)
+        f.create_dataset('arr', data=A)
 
     B = ak.read_hdf('arr', f'{tmp_dir}/{rng}.hdf5')
     os.remove(f'{tmp_dir}/{rng}.hdf5')
@@ -139,6 +140,107 @@ def from_numpy(A: np.ndarray, tmp_dir: str = '') -> ak.pdarray:
     return B
 
 
+def to_numpy(
+    A: ak.pdarray,
+    tmp_dir: str = '',
+    method: str = 'auto',
+    chunk_bytes: Optional[int] = None,
+    max_direct_bytes: int = 2 ** 34,
+) -> np.ndarray:
+    """
+    Transfer an arkouda array to numpy.
+
+    By default the array is streamed over the client connection in chunks of
+    at most `chunk_bytes` into a preallocated numpy buffer of the same dtype.
+    Arrays larger than `max_direct_bytes` go through HDF5 files in `tmp_dir`
+    instead (requires a filesystem shared with the server).
+
+    Parameters
+    ----------
+    A : ak.pdarray
+        array to transfer
+    tmp_dir : str (default current directory)
+        scratch directory for the HDF5 path
+    method : str (default 'auto')
+        'direct', 'hdf5' or 'auto' (pick based on size)
+    chunk_bytes : int (default ak.client.maxTransferBytes)
+        bytes transferred per request on the direct path
+    max_direct_bytes : int (default 16 GiB)
+        largest array `method='auto'` sends directly
+
+    Returns
+    -------
+    B : np.ndarray
+        copy of A with the same dtype
+    """
+    nbytes = A.size * A.itemsize
+    if method == 'auto':
+        method = 'direct' if nbytes <= max_direct_bytes else 'hdf5'
+    if method == 'hdf5':
+        return _to_numpy_hdf5(A, tmp_dir)
+    elif method != 'direct':
+        raise ValueError(f'invalid method: {method}')
+
+    B = np.empty(A.size, dtype=A.dtype)
+    step = _transfer_chunk_size(A.itemsize, chunk_bytes)
+    for i in range(0, A.size, step):
+        j = min(i + step, A.size)
+        B[i:j] = A[i:j].to_ndarray()
+
+    return B
+
+
+def from_numpy(
+    A: np.ndarray,
+    tmp_dir: str = '',
+    method: str = 'auto',
+    chunk_bytes: Optional[int] = None,
+    max_direct_bytes: int = 2 ** 34,
+) -> ak.pdarray:
+    """
+    Transfer a numpy array to arkouda.
+
+    The counterpart of `to_numpy`. By default the array is sent over the client
+    connection in chunks written into a preallocated arkouda array, with HDF5
+    on disk as the fallback for arrays larger than `max_direct_bytes`.
+
+    Parameters
+    ----------
+    A : np.ndarray
+        one dimensional array to transfer
+    tmp_dir : str (default current directory)
+        scratch directory for the HDF5 path
+    method : str (default 'auto')
+        'direct', 'hdf5' or 'auto' (pick based on size)
+    chunk_bytes : int (default ak.client.maxTransferBytes)
+        bytes transferred per request on the direct path
+    max_direct_bytes : int (default 16 GiB)
+        largest array `method='auto'` sends directly
+
+    Returns
+    -------
+    B : ak.pdarray
+        copy of A with the same dtype
+    """
+    if method == 'auto':
+        method = 'direct' if A.nbytes <= max_direct_bytes else 'hdf5'
+    if method == 'hdf5':
+        return _from_numpy_hdf5(A, tmp_dir)
+    elif method != 'direct':
+        raise ValueError(f'invalid method: {method}')
+
+    step = _transfer_chunk_size(A.itemsize, chunk_bytes)
+    if A.size <= step:
+        return ak.array(A)
+
+    B = ak.zeros(A.size, dtype=A.dtype)
+    for i in range(0, A.size, step):
+        j = min(i + step, A.size)
+        B[i:j] = ak.array(A[i:j])
+
+    return B
+
+
 def numpy_edges_to_hdf5(V: np.ndarray, U: np.ndarray, file: str):
     """Save numpy arrays as an HDF5 file."""
     with h5py.File(file, 'w') as f:
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Cached metadata about an edge list.
+
+Degrees, GroupBys over the edge endpoints and sorted adjacency matrices are
+needed again and again, by degree functions, k-cores, centrality measures and
+interactive analysis. `graph_index` hands out one `GraphIndex` per edge
+list, keyed by the identity of the arrays, so they are computed once.
+
+The cache holds the `GRAPH_INDEX_SIZE` most recently used indexes, so
+repeated calls from a notebook (`degree`, `k_core`, ...) reuse them without the
+caller keeping anything. Older indexes stay reachable as long as some caller
+holds them, and their GroupBys and matrices are released on the server with
+the last reference.
+"""
+__all__ = [
+    "GRAPH_INDEX_SIZE",
+    "GraphIndex",
+    "clear_graph_index",
+    "graph_index",
+]
+
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+import weakref
+
+import arkouda as ak
+from aksolve.semiring import SpMV
+
+
+class GraphIndex:
+    """
+    Lazily computed, reusable metadata for the edge list (V, U, W).
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray (optional)
+        edge weights
+
+    Attributes
+    ----------
+    n : int
+        number of nodes, max label + 1
+    m : int
+        number of edges
+    """
+
+    def __init__(
+        self,
+        V: ak.pdarray,
+        U: ak.pdarray,
+        W: Optional[ak.pdarray] = None
+    ):
+        self.V, self.U, self.W = V, U, W
+        self.n = max(V.max(), U.max()) + 1 if V.size > 0 else 0
+        self.m = V.size
+        self._cache = {}
+
+    def _get(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def gV(self) -> ak.GroupBy:
+        """GroupBy over out nodes."""
+        return self._get('gV', lambda: ak.GroupBy(
+            self.V, assume_sorted=self.V.is_sorted()))
+
+    @property
+    def gU(self) -> ak.GroupBy:
+        """GroupBy over in nodes."""
+        return self._get('gU', lambda: ak.GroupBy(
+            self.U, assume_sorted=self.U.is_sorted()))
+
+    def _per_node(self, g: ak.GroupBy, weighted: bool) -> ak.pdarray:
+        """Edge count or weight sum per node, zero for missing nodes."""
+        d = ak.zeros(self.n, 'float64' if weighted else 'int64')
+        node, deg = g.sum(self.W) if weighted else g.count()
+        d[node] = deg
+        return d
+
+    @property
+    def gVU(self) -> ak.GroupBy:
+        """GroupBy over (out node, in node) pairs."""
+        def compute():
+            # pack (V, U) into one key so the grouping is a single-key sort
+            if self.n < 2 ** 31:
+                return ak.GroupBy(self.V * self.n + self.U)
+            return ak.GroupBy([self.V, self.U])
+        return self._get('gVU', compute)
+
+    @property
+    def is_sorted(self) -> bool:
+        """Are edges sorted by out node then in node?"""
+        def compute():
+            sameV = (self.V[1:] == self.V[:-1])
+            return bool(self.V.is_sorted()
+                        and not (sameV & (self.U[1:] < self.U[:-1])).any())
+        return self._get('is_sorted', compute)
+
+    @property
+    def duplicates(self) -> int:
+        """Number of edges repeating an earlier (v, u)."""
+        def compute():
+            if self.m < 2:
+                return 0
+            if self.is_sorted:
+                # duplicates are adjacent, no sort needed
+                return int(((self.V[1:] == self.V[:-1])
+                            & (self.U[1:] == self.U[:-1])).sum())
+            return self.m - self.gVU.ngroups
+        return self._get('duplicates', compute)
+
+    def _distinct(self) -> 'GraphIndex':
+        """Index of the edge list without repeated (v, u) pairs."""
+        if self.is_sorted:
+            first = ak.ones(self.m, 'bool')
+            first[1:] = ((self.V[1:] != self.V[:-1])
+                         | (self.U[1:] != self.U[:-1]))
+            return GraphIndex(self.V[first], self.U[first])
+        keys = self.gVU.unique_keys
+        if self.n < 2 ** 31:
+            return GraphIndex(keys // self.n, keys % self.n)
+        return GraphIndex(*keys)
+
+    @property
+    def out_degree(self) -> ak.pdarray:
+        """Number of out edges of each node."""
+        return self._get('out_degree', lambda: self._per_node(self.gV, False))
+
+    @property
+    def in_degree(self) -> ak.pdarray:
+        """Number of in edges of each node."""
+        return self._get('in_degree', lambda: self._per_node(self.gU, False))
+
+    @property
+    def out_weight(self) -> ak.pdarray:
+        """Sum of out edge weights of each node (out degree if unweighted)."""
+        if self.W is None:
+            return self.out_degree
+        return self._get('out_weight', lambda: self._per_node(self.gV, True))
+
+    @property
+    def in_weight(self) -> ak.pdarray:
+        """Sum of in edge weights of each node (in degree if unweighted)."""
+        if self.W is None:
+            return self.in_degree
+        return self._get('in_weight', lambda: self._per_node(self.gU, True))
+
+    @property
+    def reciprocal(self) -> ak.pdarray:
+        """Does the reverse of each edge exist?"""
+        return self._get('reciprocal', self._reciprocal)
+
+    def _reciprocal(self) -> ak.pdarray:
+        # pack (V, U) into one key so the match is a single-key sort
+        if self.n < 2 ** 31:
+            return ak.in1d(self.U * self.n + self.V, self.V * self.n + self.U)
+        g = ak.GroupBy([ak.concatenate([self.V, self.U]),
+                        ak.concatenate([self.U, self.V])])
+        _, count = g.count()
+        return g.broadcast(count > 1, permute=True)[:self.m]
+
+    def spmv(self, transpose: bool = False) -> SpMV:
+        """Adjacency matrix A (rows are out nodes), or A.T, as a cached SpMV."""
+        if transpose:
+            return self._get('spmv_T', lambda: SpMV(
+                self.U, self.V, self.W, shape=(self.n, self.n)))
+        return self._get('spmv', lambda: SpMV(
+            self.V, self.U, self.W, shape=(self.n, self.n)))
+
+    @property
+    def degree(self) -> ak.pdarray:
+        """Number of distinct neighbors of each node, in or out."""
+        def compute():
+            # in + out - reciprocated counts each neighbor once, if no edge
+            # repeats
+            if self.duplicates > 0:
+                return self._distinct().degree
+            _, both = self.gV.sum(self.reciprocal)
+            d = self.out_degree + self.in_degree
+            d[self.gV.unique_keys] -= both
+            return d
+        return self._get('degree', compute)
+
+
+GRAPH_INDEX_SIZE = 4
+_GRAPH_INDEX = weakref.WeakValueDictionary()
+_RECENT = OrderedDict()  # strong references to the most recent indexes
+
+
+def _key(V: ak.pdarray, U: ak.pdarray, W: Optional[ak.pdarray]) -> Tuple[int]:
+    # an entry holds its arrays, so their ids are not reused while it exists
+    return (id(V), id(U), id(W))
+
+
+def graph_index(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    W: Optional[ak.pdarray] = None,
+    cache: bool = True
+) -> GraphIndex:
+    """
+    Return the (cached) `GraphIndex` of an edge list.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray (optional)
+        edge weights
+    cache : bool (default True)
+        look up and store the index. It stays cached while it is one of the
+        `GRAPH_INDEX_SIZE` most recently used, or while it is referenced.
+
+    Return
+    ------
+    index : GraphIndex
+        metadata for (V, U, W)
+
+    Notes
+    -----
+    Entries are keyed by the array objects, so modifying V, U or W in place
+    after indexing leaves a stale entry. Call `clear_graph_index` afterwards.
+    A recent entry also keeps its arrays alive on the server; clearing it
+    releases them.
+    """
+    if not cache:
+        return GraphIndex(V, U, W)
+
+    key = _key(V, U, W)
+    index = _GRAPH_INDEX.get(key)
+    if index is None:
+        index = _GRAPH_INDEX[key] = GraphIndex(V, U, W)
+    _RECENT[key] = index
+    _RECENT.move_to_end(key)
+    while len(_RECENT) > GRAPH_INDEX_SIZE:
+        _RECENT.popitem(last=False)
+    return index
+
+
+def clear_graph_index(
+    V: Optional[ak.pdarray] = None,
+    U: Optional[ak.pdarray] = None,
+    W: Optional[ak.pdarray] = None
+):
+    """Forget the index of (V, U, W), or of every edge list if V is None."""
+    if V is None:
+        _GRAPH_INDEX.clear()
+        _RECENT.clear()
+    else:
+        _GRAPH_INDEX.pop(_key(V, U, W), None)
+        _RECENT.pop(_key(V, U, W), None)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""Random walks for DeepWalk and node2vec style embeddings.
+
+All walkers advance one step at a time. Edges are sorted by out node once, so
+a walker at node v picks a uniformly random offset into v's segment of the
+sorted in nodes. Edge weights and node2vec's return (p) and in-out (q)
+parameters are handled by rejection: a candidate is accepted with probability
+proportional to its weight times its bias, and rejected walkers draw again.
+Walkers still rejected after `max_tries` rounds sample their step exactly,
+from the cumulative weights of their node's out edges.
+
+Walks are returned as a list of columns, walk i is
+[walk[0][i], walk[1][i], ...]. A walker at a node without out edges (or only
+zero weight ones) stops, and the rest of its walk is -1.
+"""
+__all__ = ["RandomWalker", "random_walks", "write_random_walks"]
+
+
+from typing import List, Optional
+
+import h5py
+
+import arkouda as ak
+
+from akgraph.util import sort_edges, to_numpy
+
+
+class RandomWalker:
+    """
+    Sampler of biased random walks on an edge list.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    W : ak.pdarray (optional)
+        non-negative edge weights, transitions proportional to weight
+    p : float (default 1.0)
+        return parameter, stepping back to the previous node has bias 1/p
+    q : float (default 1.0)
+        in-out parameter, stepping to a non-neighbor of the previous node has
+        bias 1/q (neighbors of the previous node have bias 1)
+    seed : int (optional)
+        seed for reproducible walks
+    max_tries : int (default 50)
+        rejection rounds before the remaining walkers sample exactly
+
+    References
+    ----------
+    node2vec: Scalable Feature Learning for Networks. Aditya Grover and Jure
+        Leskovec. KDD 2016. https://arxiv.org/abs/1607.00653
+
+    DeepWalk: Online Learning of Social Representations. Bryan Perozzi, Rami
+        Al-Rfou and Steven Skiena. KDD 2014. https://arxiv.org/abs/1403.6652
+    """
+
+    def __init__(
+        self,
+        V: ak.pdarray,
+        U: ak.pdarray,
+        W: Optional[ak.pdarray] = None,
+        p: float = 1.0,
+        q: float = 1.0,
+        seed: Optional[int] = None,
+        max_tries: int = 50
+    ):
+        if p <= 0 or q <= 0:
+            raise ValueError(f'p and q must be positive: p={p}, q={q}')
+        if W is not None and W.min() < 0:
+            raise ValueError('edge weights must be non-negative')
+
+        # node2vec looks edges up by binary search in the sorted in nodes
+        self.biased = (p != 1 or q != 1)
+        if self.biased or not V.is_sorted():
+            if W is None:
+                V, U = sort_edges(V, U)
+            else:
+                V, U, W = sort_edges(V, U, W)
+        self.n = max(V.max(), U.max()) + 1
+        self.U, self.W = U, W
+        self.p, self.q = p, q
+        self.seed, self.max_tries = seed, max_tries
+        self._draws = 0
+
+        g = ak.GroupBy(V, assume_sorted=True)
+        nodes, deg = g.count()
+        self.deg = ak.zeros(self.n, 'int64')
+        self.start = ak.zeros(self.n, 'int64')
+        self.deg[nodes] = deg
+        self.start[nodes] = g.segments
+
+        if W is not None:
+            self.max_w = ak.zeros(self.n, 'float64')
+            self.max_w[nodes] = g.max(W)[1]
+
+        if self.biased:
+            self.max_bias = max(1 / p, 1.0, 1 / q)
+            self._depth = int(deg.max()).bit_length()
+
+    def _uniform(self, size: int) -> ak.pdarray:
+        """Uniform [0, 1) draws, reproducible if seeded."""
+        self._draws += 1
+        if self.seed is None:
+            return ak.uniform(size)
+        return ak.uniform(size, seed=self.seed + self._draws)
+
+    def _has_edge(self, v: ak.pdarray, u: ak.pdarray) -> ak.pdarray:
+        """Does the edge (v, u) exist? Binary search in v's segment."""
+        lo = self.start[v]
+        hi = end = lo + self.deg[v]
+        for _ in range(self._depth):
+            active = (lo < hi)
+            mid = (lo + hi) // 2
+            less = active & (self.U[ak.where(active, mid, 0)] < u)
+            lo = ak.where(less, mid + 1, lo)
+            hi = ak.where(active & ~less, mid, hi)
+        found = (lo < end)
+        return found & (self.U[ak.where(found, lo, 0)] == u)
+
+    def _bias(self, cand: ak.pdarray, pt: ak.pdarray) -> ak.pdarray:
+        """node2vec bias of stepping to `cand` after `pt`."""
+        bias = ak.where(self._has_edge(pt, cand), 1.0, 1 / self.q)
+        return ak.where(cand == pt, 1 / self.p, bias)
+
+    def _exact(
+        self,
+        ct: ak.pdarray,
+        pt: Optional[ak.pdarray]
+    ) -> ak.pdarray:
+        """Sample next nodes from the full distribution of each walker."""
+        r, dt = ct.size, self.deg[ct]
+        seg = ak.cumsum(dt) - dt
+        owner = ak.broadcast(seg, ak.arange(r), dt.sum())
+        edge = self.start[ct][owner] + ak.arange(owner.size) - seg[owner]
+        cand = self.U[edge]
+
+        weight = ak.ones(edge.size, 'float64')
+        if self.W is not None:
+            weight *= self.W[edge]
+        if pt is not None:
+            weight *= self._bias(cand, pt[owner])
+
+        # pick the first edge whose cumulative weight exceeds u * total
+        g = ak.GroupBy(owner, assume_sorted=True)
+        cw = ak.cumsum(weight)
+        cw -= (cw[seg] - weight[seg])[owner]
+        target = self._uniform(r) * g.sum(weight)[1]
+        _, k = g.sum(ak.cast(cw <= target[owner], 'int64'))
+        return cand[seg + ak.where(k < dt, k, dt - 1)]
+
+    def step(
+        self,
+        cur: ak.pdarray,
+        prev: Optional[ak.pdarray] = None
+    ) -> ak.pdarray:
+        """
+        Advance every walker by one edge.
+
+        Parameters
+        ----------
+        cur : ak.pdarray[int64]
+            current node of each walker, -1 if stopped
+        prev : ak.pdarray[int64] (optional)
+            previous node of each walker, needed for node2vec bias
+
+        Return
+        ------
+        nxt : ak.pdarray[int64]
+            next node of each walker, -1 if stopped
+        """
+        c = ak.where(cur >= 0, cur, 0)
+        nxt = ak.zeros(cur.size, 'int64') - 1
+        live = (cur >= 0) & (self.deg[c] > 0)
+        if self.W is not None:
+            live &= (self.max_w[c] > 0)
+        todo = ak.arange(cur.size)[live]
+        biased = self.biased and prev is not None
+
+        tries = 0
+        while todo.size > 0:
+            tries += 1
+            ct, dt = c[todo], self.deg[c[todo]]
+            # rounding can push u * d up to d
+            offset = ak.cast(self._uniform(todo.size) * dt, 'int64')
+            edge = self.start[ct] + ak.where(offset < dt, offset, dt - 1)
+            cand = self.U[edge]
+            if self.W is None and not biased:
+                nxt[todo] = cand
+                break
+            if tries > self.max_tries:
+                nxt[todo] = self._exact(ct, prev[todo] if biased else None)
+                break
+
+            accept = ak.ones(todo.size, 'float64')
+            if self.W is not None:
+                max_w = self.max_w[ct]
+                accept *= self.W[edge] / ak.where(max_w > 0, max_w, 1)
+            if biased:
+                accept *= self._bias(cand, prev[todo]) / self.max_bias
+
+            ok = (self._uniform(todo.size) < accept)
+            nxt[todo[ok]] = cand[ok]
+            todo = todo[~ok]
+
+        return nxt
+
+    def walk(self, start: ak.pdarray, length: int) -> List[ak.pdarray]:
+        """
+        Generate one walk of `length` nodes from each node of `start`.
+
+        Parameters
+        ----------
+        start : ak.pdarray[int64]
+            first node of each walk
+        length : int
+            number of nodes per walk, including the start
+
+        Return
+        ------
+        walks : List[ak.pdarray[int64]]
+            walks[k][i] is the k-th node of walk i, -1 after a dead end
+        """
+        walks = [start[:]]
+        prev = None
+        for _ in range(length - 1):
+            walks.append(self.step(walks[-1], prev))
+            prev = walks[-2]
+        return walks
+
+
+def random_walks(
+    V: ak.pdarray,
+    U: ak.pdarray,
+    length: int = 80,
+    num_walks: int = 1,
+    W: Optional[ak.pdarray] = None,
+    p: float = 1.0,
+    q: float = 1.0,
+    start: Optional[ak.pdarray] = None,
+    seed: Optional[int] = None
+) -> List[ak.pdarray]:
+    """
+    Generate random walks in memory.
+
+    Parameters
+    ----------
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    length : int (default 80)
+        number of nodes per walk
+    num_walks : int (default 1)
+        walks per start node
+    W : ak.pdarray (optional)
+        non-negative edge weights
+    p : float (default 1.0)
+        node2vec return parameter
+    q : float (default 1.0)
+        node2vec in-out parameter
+    start : ak.pdarray[int64] (optional)
+        start nodes, default every node
+    seed : int (optional)
+        seed for reproducible walks
+
+    Return
+    ------
+    walks : List[ak.pdarray[int64]]
+        walks[k][i] is the k-th node of walk i, -1 after a dead end
+
+    See Also
+    --------
+    RandomWalker
+    write_random_walks()
+    """
+    walker = RandomWalker(V, U, W, p, q, seed)
+    start = ak.arange(walker.n) if start is None else start
+    if num_walks > 1:
+        start = ak.concatenate([start] * num_walks)
+    return walker.walk(start, length)
+
+
+def write_random_walks(
+    file: str,
+    V: ak.pdarray,
+    U: ak.pdarray,
+    length: int = 80,
+    num_walks: int = 10,
+    W: Optional[ak.pdarray] = None,
+    p: float = 1.0,
+    q: float = 1.0,
+    chunk_walkers: int = 2 ** 20,
+    seed: Optional[int] = None,
+    compression: Optional[str] = None,
+    verbose: bool = False
+) -> int:
+    """
+    Write `num_walks` walks from every node to an HDF5 file, in chunks.
+
+    Only `chunk_walkers` walks are held by the server and the client at a
+    time. The file holds a dataset 'walks' of shape (num_walks * n, length),
+    where walk i starts at node i % n.
+
+    Parameters
+    ----------
+    file : str
+        output HDF5 file (overwritten)
+    V : ak.pdarray[int64]
+        out nodes
+    U : ak.pdarray[int64]
+        in nodes
+    length : int (default 80)
+        number of nodes per walk
+    num_walks : int (default 10)
+        walks per node
+    W : ak.pdarray (optional)
+        non-negative edge weights
+    p : float (default 1.0)
+        node2vec return parameter
+    q : float (default 1.0)
+        node2vec in-out parameter
+    chunk_walkers : int (default 2**20)
+        walks generated and written at a time
+    seed : int (optional)
+        seed for reproducible walks
+    compression : str (optional)
+        h5py compression filter for the dataset, e.g. 'gzip' or 'lzf'
+    verbose : bool (default False)
+        display progress
+
+    Return
+    ------
+    count : int
+        number of walks written
+    """
+    walker = RandomWalker(V, U, W, p, q, seed)
+    n = walker.n
+    total = n * num_walks
+
+    with h5py.File(file, 'w') as f:
+        dset = f.create_dataset(
+            'walks', shape=(total, length), dtype='int64',
+            chunks=(max(1, min(chunk_walkers, total)), length),
+            compression=compression)
+        dset.attrs.update({'p': p, 'q': q, 'num_walks': num_walks,
+                           'weighted': W is not None})
+
+        for lo in range(0, total, chunk_walkers):
+            hi = min(lo + chunk_walkers, total)
+            walks = walker.walk(ak.arange(lo, hi) % n, length)
+
+            # one transfer per chunk, walks laid out step-major
+            block = to_numpy(ak.concatenate(walks, ordered=True))
+            dset[lo:hi] = block.reshape(length, hi - lo).T
+
+            if verbose:
+                print(f' walks = {hi:,d} / {total:,d}')
+
+    return total
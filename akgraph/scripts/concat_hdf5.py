@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 """Concatenate compatible HDF5 files together."""
-from collections import defaultdict
-from typing import List
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import argparse
 import os
 import sys
 
 import h5py
+import numpy as np
 
 
 def parse_args():
@@ -17,6 +19,13 @@ def parse_args():
                         help='files to concatenate')
     parser.add_argument('-o', '--output', required=True,
                         type=os.path.abspath, help='ouput file')
+    parser.add_argument('-c', '--chunk-size', type=int, default=2 ** 24,
+                        help='elements copied at a time (default 2**24)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='number of reader processes (default all cpus)')
+    parser.add_argument('-z', '--compression', type=str, default=None,
+                        choices=['gzip', 'lzf'],
+                        help='compress output datasets')
     args = parser.parse_args()
 
     if len(args.FILE) == 1:
@@ -28,40 +37,91 @@ def parse_args():
             print(f"error: {f} not found")
             sys.exit(2)
 
+    if args.chunk_size < 1:
+        print("error: chunk size must be positive")
+        sys.exit(2)
+
     return args
 
 
-def concat_hdf5(srcs: List[str], dest: str):
-    """Concatenate `srcs` into `dest` sequentially."""
-    n = len(srcs)
-
-    # find array sizes and types to allocate
-    sizes, types = defaultdict(int), dict()
-    for i in range(n):
-        with h5py.File(srcs[i]) as fin:
-            for key, arr in fin.items():
-                sizes[key] += arr.size
-                if i == 0:
-                    types[key] = arr.dtype
-                else:
-                    if arr.dtype != types[key]:
-                        print(f"clashing types in column {key}")
-                        sys.exit(2)
-
-    # copy data, keeping track of `head` of each array
-    with h5py.File(dest, 'w') as fout:
-        for key, size in sizes.items():
-            fout.create_dataset(key, shape=(size,), dtype=types[key])
+def read_meta(src: str) -> Dict[str, Tuple[int, np.dtype]]:
+    """Find the size and type of every dataset in `src`."""
+    with h5py.File(src, 'r') as fin:
+        return {key: (arr.size, arr.dtype) for key, arr in fin.items()}
+
+
+def read_chunk(task: Tuple[str, str, int, int]) -> np.ndarray:
+    """Read elements [lo, hi) of dataset `key` in file `src`."""
+    src, key, lo, hi = task
+    with h5py.File(src, 'r') as fin:
+        return fin[key][lo:hi]
+
+
+def write_chunk(fout: h5py.File, task: Tuple[str, str, int, int], head: int,
+                future):
+    """Write the chunk read by `future` at position `head` of its dataset."""
+    _, key, lo, hi = task
+    fout[key][head:head + hi - lo] = future.result()
 
+
+def concat_hdf5(
+    srcs: List[str],
+    dest: str,
+    chunk_size: int = 2 ** 24,
+    jobs: Optional[int] = None,
+    compression: Optional[str] = None,
+):
+    """
+    Concatenate `srcs` into `dest`.
+
+    Source files are read `chunk_size` elements at a time by a pool of `jobs`
+    processes while the parent process writes the chunks to `dest` in order,
+    so memory use stays bounded by a few chunks per worker.
+    """
+    jobs = os.cpu_count() if jobs is None else jobs
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        metas = list(pool.map(read_meta, srcs))
+
+        # find array sizes and types to allocate
+        sizes, types = defaultdict(int), dict()
+        for meta in metas:
+            for key, (size, dtype) in meta.items():
+                sizes[key] += size
+                if key not in types:
+                    types[key] = dtype
+                elif dtype != types[key]:
+                    print(f"clashing types in column {key}")
+                    sys.exit(2)
+
+        # plan chunked copies, keeping track of `head` of each array
+        tasks, heads = [], []
         istarts = defaultdict(int)
-        for i in range(n):
-            with h5py.File(srcs[i]) as fin:
-                for key, arr in fin.items():
-                    i, m = istarts[key], arr.size
-                    fout[key][i:i + m] = arr[:]
-                    istarts[key] += m
+        for src, meta in zip(srcs, metas):
+            for key, (size, _) in meta.items():
+                for lo in range(0, size, chunk_size):
+                    hi = min(lo + chunk_size, size)
+                    tasks.append((src, key, lo, hi))
+                    heads.append(istarts[key] + lo)
+                istarts[key] += size
+
+        with h5py.File(dest, 'w') as fout:
+            for key, size in sizes.items():
+                chunks = (min(chunk_size, size, 2 ** 20),) if size else None
+                fout.create_dataset(key, shape=(size,), dtype=types[key],
+                                    chunks=chunks, compression=compression)
+
+            # keep a bounded window of reads in flight, write them in order
+            window = 2 * jobs
+            pending = deque()
+            for task, head in zip(tasks, heads):
+                pending.append((task, head, pool.submit(read_chunk, task)))
+                if len(pending) >= window:
+                    write_chunk(fout, *pending.popleft())
+            while pending:
+                write_chunk(fout, *pending.popleft())
 
 
 if __name__ == "__main__":
     args = parse_args()
-    concat_hdf5(args.FILE, args.output)
+    concat_hdf5(args.FILE, args.output, args.chunk_size, args.jobs,
+                args.compression)
@@ -3,7 +3,8 @@
 
 You should only use this with HDF5 files holding columnar data of the same length.
 """
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
 import argparse
 import os
 import sys
@@ -15,10 +16,11 @@ import numpy as np
 def parse_args() -> argparse.Namespace:
     """Parse and validate command line arguments."""
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument('FILE', type=os.path.abspath,
-                        help='file to translate.')
+    parser.add_argument('FILE', type=os.path.abspath, nargs='+',
+                        help='file(s) to translate.')
     parser.add_argument('-o', '--out', type=str, default='',
-                        help='output file or directory (default FILE.txt)')
+                        help=('output file or directory (default FILE.txt). '
+                              'must be a directory if there are several FILEs'))
     parser.add_argument('-c', '--columns', type=str, nargs='+',
                         help=('columns to load and print, in order. '
                               'default to all in sorted order'))
@@ -26,61 +28,86 @@ def parse_args() -> argparse.Namespace:
                         help='print destination and exit')
     parser.add_argument('-l', '--labels', action='store_true',
                         help='print column keys on the first line of output')
+    parser.add_argument('-s', '--chunk-size', type=int, default=2 ** 20,
+                        help='rows formatted and written at a time')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='number of files translated in parallel')
     args = parser.parse_args()
-    if not os.path.isfile(args.FILE):
-        print(f"{args.FILE} not found.")
+    for f in args.FILE:
+        if not os.path.isfile(f):
+            print(f"{f} not found.")
+            sys.exit(2)
+
+    if len(args.FILE) > 1 and args.out and not os.path.isdir(args.out):
+        print(f"error: {args.out} must be a directory for several FILEs")
         sys.exit(2)
 
-    if not args.out:
-        f = args.FILE
-        args.out = f[:-5] + '.txt' if f.endswith('hdf5') else f + '.txt'
-    elif os.path.isdir(args.out):
-        f = os.path.basename(args.FILE)
-        f = f[:-5] + '.txt' if f.endswith('hdf5') else f + '.txt'
-        args.out = os.path.join(args.out, f)
+    args.outs = [out_name(f, args.out) for f in args.FILE]
 
     return args
 
 
-def read_hdf5(args: argparse.Namespace) -> Dict[str, np.ndarray]:
-    """Load specified columns from the hdf5 file."""
-    with h5py.File(args.FILE, 'r') as f:
-        data = {
-            key: arr[:]
-            for key, arr in f.items()
-            if key in args.columns
-        } if args.columns else {
-            key: arr[:] for key, arr in f.items()
-        }
-
-    if args.columns and not all(c in data for c in args.columns):
-        print(f"error: trouble finding columns:\n    {args.columns}\n"
-              f"found:\n    {data.keys()}")
-        sys.exit(1)
-
-    return data
-
-
-def write_txt(args: argparse.Namespace, data: Dict[str, np.ndarray]):
-    """Save the specified columns in a tabular text file."""
-    header = ' '.join(args.columns) if args.labels else ''
-    cols = args.columns if args.columns else sorted(data)
-    X = np.column_stack([data[col] for col in cols])
-    fmt = ' '.join(
-        '%d' if np.issubdtype(data[col].dtype, np.integer) else '%.15e'
-        for col in cols)
-    np.savetxt(args.out, X, fmt=fmt, header=header)
+def out_name(file: str, out: str) -> str:
+    """Determine the text file `file` is translated into."""
+    if not out:
+        return file[:-5] + '.txt' if file.endswith('hdf5') else file + '.txt'
+    elif os.path.isdir(out):
+        f = os.path.basename(file)
+        f = f[:-5] + '.txt' if f.endswith('hdf5') else f + '.txt'
+        return os.path.join(out, f)
+    return out
+
+
+def column_format(dtype: np.dtype) -> str:
+    """Printf format of a column, as `np.savetxt` takes it."""
+    if dtype == np.bool_ or np.issubdtype(dtype, np.integer):
+        return '%d'
+    return '%.15e'
+
+
+def hdf5_to_txt(
+    src: str,
+    dest: str,
+    columns: Optional[List[str]] = None,
+    labels: bool = False,
+    chunk_size: int = 2 ** 20
+):
+    """Stream the specified columns of `src` into a tabular text file."""
+    with h5py.File(src, 'r') as f:
+        cols = columns if columns else sorted(f)
+        missing = [c for c in cols if c not in f]
+        if missing:
+            print(f"error: trouble finding columns:\n    {missing}\n"
+                  f"found:\n    {list(f.keys())}")
+            sys.exit(1)
+
+        size = f[cols[0]].size
+        if any(f[c].size != size for c in cols):
+            print(f"error: columns of {src} have different lengths")
+            sys.exit(1)
+
+        # one record per row keeps each column's dtype (no uint64 -> float)
+        fmt = ' '.join(column_format(f[c].dtype) for c in cols)
+        with open(dest, 'w') as out:
+            if labels:
+                out.write('# ' + ' '.join(cols) + '\n')
+            for lo in range(0, size, chunk_size):
+                hi = min(lo + chunk_size, size)
+                block = np.rec.fromarrays([f[c][lo:hi] for c in cols])
+                np.savetxt(out, block, fmt=fmt)
 
 
 def main():
     """Translate hdf5 files into txt files."""
     args = parse_args()
     if args.dry_run:
-        print(args.out)
+        print('\n'.join(args.outs))
         sys.exit(0)
 
-    data = read_hdf5(args)
-    write_txt(args, data)
+    n = len(args.FILE)
+    with ProcessPoolExecutor(max_workers=min(args.jobs, n)) as pool:
+        list(pool.map(hdf5_to_txt, args.FILE, args.outs, [args.columns] * n,
+                      [args.labels] * n, [args.chunk_size] * n))
 
 
 if __name__ == '__main__':
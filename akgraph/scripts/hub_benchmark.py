@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark PageRank and BFS with and without hub splitting."""
+from time import time
+from statistics import mean, stdev
+import argparse
+import random
+
+import arkouda as ak
+import akgraph as akg
+
+
+def bench(fn, num_trials):
+    """Time `fn` over several trials. Return the times and the last result."""
+    times = []
+    for _ in range(num_trials):
+        t0 = time()
+        out = fn()
+        times.append(time() - t0)
+    return times, out
+
+
+def report(label, times):
+    """Print timing summary."""
+    s = stdev(times) if len(times) > 1 else 0.0
+    print(f"{label:>12}: {mean(times):0.2f} +/- {s:0.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('SCALE', type=int, help='scale of RMAT graph to generate')
+    parser.add_argument('-k', '--threshold', type=int, default=None,
+                        help='hub degree threshold (default automatic)')
+    parser.add_argument('-t', '--num_trials', type=int, default=4,
+                        help='number of trials for each algorithm')
+    parser.add_argument('-s', '--server', type=str, default='',
+                        help='arkouda server (default first node from squeue)')
+    args = parser.parse_args()
+
+    ak.connect(args.server if args.server else akg.get_nids()[0])
+    num_locales = ak.get_config()['numLocales']
+
+    V, U = akg.rmat(args.SCALE)
+    n = V.max() + 1
+    deg = akg.out_degree(V, U)
+    threshold = args.threshold
+    if threshold is None:
+        threshold = akg.auto_hub_threshold(V.size, num_locales)
+    print(f'n = {n:,}\nm = {V.size:,}\nlocales = {num_locales}\n'
+          f'max degree = {deg.max():,}\nthreshold = {threshold}\n')
+    if threshold is None:
+        print('nothing to split on one locale')
+        return
+
+    split = akg.HubSplit(deg, threshold)
+    print(f'hubs = {split.hubs.size:,}\nsub-nodes = {split.size - n:,}')
+    before = akg.segment_imbalance(U, n, num_locales)
+    after = akg.segment_imbalance(split.keys(U), split.size, num_locales)
+    print(f'imbalance: {before:0.2f} -> {after:0.2f}\n')
+
+    sources = [random.randint(0, n - 1) for _ in range(args.num_trials)]
+    for label, hubs in [('unsplit', None), ('split', threshold)]:
+        print(label)
+        times, _ = bench(lambda: akg.pagerank(V, U, max_iter=20, hub_threshold=hubs),
+                         args.num_trials)
+        report('PageRank', times)
+        trial = iter(sources)
+        times, _ = bench(lambda: akg.bfs_distance(V, U, next(trial), hub_threshold=hubs),
+                         args.num_trials)
+        report('BFS', times)
+        print()
+
+    ak.clear()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark PageRank and BFS before and after locality-aware relabeling."""
+from time import time
+from statistics import mean, stdev
+import argparse
+import random
+
+import arkouda as ak
+import akgraph as akg
+
+
+def bench(fn, num_trials):
+    """Time `fn` over several trials. Return the times and the last result."""
+    times = []
+    for _ in range(num_trials):
+        t0 = time()
+        out = fn()
+        times.append(time() - t0)
+    return times, out
+
+
+def report(label, times):
+    """Print timing summary."""
+    s = stdev(times) if len(times) > 1 else 0.0
+    print(f"{label:>12}: {mean(times):0.2f} +/- {s:0.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('SCALE', type=int, help='scale of RMAT graph to generate')
+    parser.add_argument('-m', '--methods', type=str, nargs='+',
+                        default=['degree', 'rcm', 'label_propagation'],
+                        help='orderings to compare')
+    parser.add_argument('-t', '--num_trials', type=int, default=4,
+                        help='number of trials for each algorithm')
+    parser.add_argument('-s', '--server', type=str, default='',
+                        help='arkouda server (default first node from squeue)')
+    args = parser.parse_args()
+
+    ak.connect(args.server if args.server else akg.get_nids()[0])
+    num_locales = ak.get_config()['numLocales']
+
+    V, U = akg.rmat(args.SCALE, permute=True)
+    n = V.max() + 1
+    sources = [random.randint(0, n - 1) for _ in range(args.num_trials)]
+    print(f'n = {n:,}\nm = {V.size:,}\nlocales = {num_locales}\n')
+
+    graphs = [('original', ak.arange(n), V, U)]
+    for method in args.methods:
+        t0 = time()
+        pi = akg.locality_order(V, U, method)
+        X, Y = akg.apply_order(pi, V, U)
+        print(f'{method} ordering: {time() - t0:0.1f} s')
+        graphs.append((method, pi, X, Y))
+    print()
+
+    for label, pi, X, Y in graphs:
+        print(f'{label} (cut fraction {akg.cut_fraction(X, Y, num_locales):0.3f})')
+        times, _ = bench(lambda: akg.pagerank(X, Y, max_iter=20), args.num_trials)
+        report('PageRank', times)
+
+        # same source nodes under every labeling
+        trial = iter(sources)
+        times, _ = bench(lambda: akg.bfs_distance(X, Y, int(pi[next(trial)])),
+                         args.num_trials)
+        report('BFS', times)
+        print()
+
+    ak.clear()
+
+
+if __name__ == '__main__':
+    main()
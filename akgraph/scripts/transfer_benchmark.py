@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Benchmark client <-> server array transfers (direct vs. HDF5)."""
+from time import time
+from statistics import mean, stdev
+import argparse
+
+import numpy as np
+
+import arkouda as ak
+import akgraph as akg
+
+
+def bench(fn, num_trials):
+    """Time `fn` over several trials. Return the times and the last result."""
+    times = []
+    for _ in range(num_trials):
+        t0 = time()
+        out = fn()
+        times.append(time() - t0)
+    return times, out
+
+
+def report(label, times, nbytes):
+    """Print timing summary and throughput."""
+    t = mean(times)
+    s = stdev(times) if len(times) > 1 else 0.0
+    print(f"{label:>16}: {t:0.2f} +/- {s:0.2f} s  "
+          f"({nbytes / t / 2 ** 20:0.1f} MiB/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('SIZE', type=int, help='number of elements to transfer')
+    parser.add_argument('-d', '--dtype', type=str, default='float64',
+                        help='element type (default float64)')
+    parser.add_argument('-t', '--num_trials', type=int, default=4,
+                        help='number of trials for each method')
+    parser.add_argument('--tmp_dir', type=str, default='',
+                        help='shared scratch directory for the HDF5 path')
+    parser.add_argument('--chunk_bytes', type=int, default=None,
+                        help='bytes per request on the direct path')
+    parser.add_argument('-s', '--server', type=str, default='',
+                        help='arkouda server (default first node from squeue)')
+    args = parser.parse_args()
+
+    ak.connect(args.server if args.server else akg.get_nids()[0])
+
+    A = ak.randint(0, 2 ** 20, args.SIZE, dtype=args.dtype)
+    nbytes = A.size * A.itemsize
+    print(f'n = {A.size:,}\nbytes = {nbytes:,}\n')
+
+    for method in ['direct', 'hdf5']:
+        times, B = bench(lambda: akg.to_numpy(A, args.tmp_dir, method,
+                                              args.chunk_bytes),
+                         args.num_trials)
+        assert B.dtype == np.dtype(args.dtype)
+        report(f'to_numpy {method}', times, nbytes)
+
+        times, C = bench(lambda: akg.from_numpy(B, args.tmp_dir, method,
+                                                args.chunk_bytes),
+                         args.num_trials)
+        assert ak.all(A == C)
+        report(f'from_numpy {method}', times, nbytes)
+
+    ak.clear()
+
+
+if __name__ == '__main__':
+    main()
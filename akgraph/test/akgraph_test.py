@@ -1,6 +1,13 @@
 from base_test import ArkoudaTest
+import os
+import tempfile
+import weakref
+
+import h5py
+import numpy as np
 import arkouda as ak
 import akgraph as akg
+import aksolve as aks
 
 from akgraph.generators import path_graph, complete_graph, karate_club_graph
 
@@ -161,6 +168,33 @@ class akgraphTest(ArkoudaTest):
         _, C = akg.lps(kV, kU)
         self.assertTrue(ak.all(C == kC))
 
+    def test_SCC(self):
+        # cycle {0, 1, 2} -> cycle {3, 4} -> 5, and 6 -> 0
+        V = ak.array([0, 1, 2, 2, 3, 4, 4, 6])
+        U = ak.array([1, 2, 0, 3, 4, 3, 5, 0])
+        _, C = akg.scc(V, U)
+        self.assertEqual(C.to_ndarray().tolist(), [0, 0, 0, 3, 3, 5, 6])
+
+        # weak components follow edges both ways
+        _, C = akg.fast_sv(V, U, symmetrize=True)
+        self.assertTrue(ak.all(C == 0))
+        _, C = akg.fast_sv(U[:7], V[:7], symmetrize=True)
+        self.assertEqual(C.to_ndarray().tolist(), [0, 0, 0, 0, 0, 0])
+
+        # symmetric graphs agree with connected components
+        n = 5
+        pV, pU = path_graph(n)
+        cV, cU = complete_graph(n)
+        V = ak.concatenate([pV, cV + n], ordered=False)
+        U = ak.concatenate([pU, cU + n], ordered=False)
+        _, C = akg.scc(V, U)
+        self.assertTrue(ak.all(C == akg.fast_sv(V, U)[1]))
+
+        # a directed path is all singletons, found by trimming
+        k, C = akg.scc(ak.arange(9), ak.arange(1, 10))
+        self.assertTrue(ak.all(C == ak.arange(10)))
+        self.assertEqual(k, 1)
+
     #core.py tests
     def test_k_Core_Path(self):
         V, U = path_graph(10)
@@ -208,6 +242,90 @@ class akgraphTest(ArkoudaTest):
 
 
 
+    #degree.py tests
+    def test_Degree(self):
+        V = ak.array([0, 1, 2, 3, 4, 5, 5, 5, 5])
+        U = ak.array([5, 5, 5, 5, 5, 6, 7, 8, 0])
+        self.assertTrue(ak.all(akg.out_degree(V, U) == ak.array([1, 1, 1, 1, 1, 4, 0, 0, 0])))
+        self.assertTrue(ak.all(akg.in_degree(V, U) == ak.array([1, 0, 0, 0, 0, 5, 1, 1, 1])))
+        self.assertTrue(ak.all(akg.degree(V, U) == ak.array([1, 1, 1, 1, 1, 8, 1, 1, 1])))
+
+        # cached per edge list, results are safe to modify
+        index = akg.graph_index(V, U)
+        self.assertIs(akg.graph_index(V, U), index)
+        d = akg.out_degree(V, U)
+        d[5] = 0
+        self.assertEqual(index.out_degree[5], 4)
+        akg.clear_graph_index(V, U)
+        self.assertIsNot(akg.graph_index(V, U), index)
+
+        # recent indexes stay cached without being held, older ones are
+        # dropped with their server arrays
+        index = weakref.ref(akg.graph_index(U, V))
+        self.assertIs(akg.graph_index(U, V), index())
+        for _ in range(akg.GRAPH_INDEX_SIZE):
+            akg.graph_index(ak.array([0]), ak.array([1]))
+        self.assertIsNone(index())
+
+        # repeated edges and self loops count each neighbor once
+        for V, U in ((ak.array([0, 0, 1, 2, 2]), ak.array([1, 1, 0, 2, 2])),
+                     (ak.array([2, 0, 1, 0, 2]), ak.array([2, 1, 0, 1, 2]))):
+            self.assertEqual(akg.degree(V, U).to_ndarray().tolist(), [1, 1, 1])
+            self.assertEqual(akg.graph_index(V, U).duplicates, 2)
+
+        _, V, U = karate_club_graph()
+        s = akg.degree_summary(V, U, top_k=3, percentiles=(0, 50, 100))
+        self.assertEqual((s.n, s.m, s.min, s.max), (34, 156, 1, 17))
+        self.assertAlmostEqual(s.mean, 156 / 34)
+        self.assertEqual(s.bin_edges.tolist(), [0, 1, 2, 4, 8, 16])
+        self.assertEqual(s.counts.sum(), 34)
+        self.assertEqual(s.counts[-1], 2)
+        self.assertEqual(s.percentiles[0], 1)
+        self.assertEqual(s.percentiles[100], 17)
+        self.assertEqual(s.top_nodes.tolist(), [33, 0, 32])
+        self.assertEqual(s.top_degrees.tolist(), [17, 16, 12])
+
+    #hubs.py tests
+    def test_Hub_Splitting(self):
+        # star graph, node 0 is a hub
+        leaves = ak.arange(1, 100)
+        V = ak.concatenate([ak.zeros(99, 'int64'), leaves])
+        U = ak.concatenate([leaves, ak.zeros(99, 'int64')])
+        deg = akg.out_degree(V, U)
+
+        split = akg.HubSplit(deg, 10)
+        self.assertEqual(split.hubs.to_ndarray().tolist(), [0])
+        self.assertEqual(split.size, 110)
+        self.assertTrue(ak.all(split.combine(split.expand(deg), 'max') == deg))
+        self.assertTrue(
+            ak.all(split.combine(split.expand(deg)) == deg * split.parts))
+        self.assertTrue(ak.all(split.combine(ak.ones(110, 'int64')) == ak.where(deg > 10, 10, 1)))
+
+        before = akg.segment_imbalance(U, 100, num_locales=4)
+        after = akg.segment_imbalance(split.keys(U), split.size, num_locales=4)
+        self.assertGreater(before, 2)
+        self.assertLess(after, 1.5)
+
+        self.assertIsNone(akg.auto_hub_threshold(V.size, num_locales=1))
+        self.assertEqual(akg.auto_hub_threshold(V.size, num_locales=4), 13)
+
+        # split products agree with unsplit ones
+        A = akg.adjacency(V, U, hub_threshold=None)
+        B = akg.adjacency(V, U, hub_threshold=10)
+        self.assertIsInstance(B, akg.HubSplitSpMV)
+        x = ak.arange(100) * 1.0
+        self.assertTrue(ak.all(A(x) == B(x)))
+        self.assertTrue(ak.all(A.row_counts == B.row_counts))
+        f = ak.arange(100) == 5
+        self.assertTrue(ak.all(A(f, aks.OR_AND) == B(f, aks.OR_AND)))
+        self.assertTrue(ak.all(A(ak.arange(100), aks.MIN_SELECT2ND) == B(ak.arange(100), aks.MIN_SELECT2ND)))
+
+        _, V, U = karate_club_graph()
+        pr = akg.pagerank(V, U, hub_threshold=None)
+        self.assertTrue(ak.all(ak.abs(akg.pagerank(V, U, hub_threshold=4) - pr) < 1e-6))
+        dist = akg.bfs_distance(V, U, 0, hub_threshold=None)
+        self.assertTrue(ak.all(akg.bfs_distance(V, U, 0, hub_threshold=4) == dist))
+
     #mis.py tests
     def test_Maximal_Independent_Set(self):
 
@@ -235,7 +353,239 @@ class akgraphTest(ArkoudaTest):
         self.assertTrue(ak.all(uF == ak.array([1, 3, 4, 4, 5, 6])))
         self.assertTrue(ak.all(wF == ak.array([7, 5, 7, 5, 6, 9])))
 
+    def test_Minimum_Spanning_Forest_Contract(self):
+        V = ak.array([0, 0, 1, 1, 1, 1, 2, 2, 3, 3, 3,
+                      3, 4, 4, 4, 4, 4, 5, 5, 5, 6, 6])
+        U = ak.array([1, 3, 0, 2, 3, 4, 1, 4, 0, 1, 4,
+                      5, 1, 2, 3, 5, 6, 3, 4, 6, 4, 5])
+        W = ak.array([7, 5, 7, 8, 9, 7, 8, 5, 5, 9, 15,
+                      6, 7, 5, 15, 8, 9, 6, 8, 11, 9, 11])
+        for c, vF, uF, wF in [akg.msf_contract(V, U, W),
+                              akg.msf_filter_kruskal(V, U, W),
+                              akg.msf_filter_kruskal(V, U, W, chunk_size=2)]:
+            self.assertTrue(ak.all(c == 0))
+            self.assertTrue(ak.all(vF == ak.array([0, 0, 1, 2, 3, 4])))
+            self.assertTrue(ak.all(uF == ak.array([1, 3, 4, 4, 5, 6])))
+            self.assertTrue(ak.all(wF == ak.array([7, 5, 7, 5, 6, 9])))
+
+        # two components
+        X, Y = V + 7, U + 7
+        c, vF, uF, wF = akg.msf_contract(ak.concatenate([V, X]),
+                                         ak.concatenate([U, Y]),
+                                         ak.concatenate([W, W]))
+        self.assertTrue(ak.all(c == ak.array([0] * 7 + [7] * 7)))
+        self.assertEqual(vF.size, 12)
+        self.assertEqual(wF.sum(), 2 * 39)
+
+
+
+    #ordering.py tests
+    def test_Locality_Order(self):
+        _, V, U = karate_club_graph()
+        pr = akg.pagerank(V, U)
+        dist = akg.bfs_distance(V, U, 0)
 
+        for method in ['degree', 'rcm', 'label_propagation']:
+            pi = akg.locality_order(V, U, method)
+            self.assertTrue(akg.is_perm(pi))
+            self.assertTrue(ak.all(akg.inverse_order(pi)[pi] == ak.arange(34)))
+
+            # results on the relabeled graph map back with x = x_new[pi]
+            X, Y = akg.apply_order(pi, V, U)
+            self.assertTrue(X.is_sorted())
+            self.assertTrue(ak.all(ak.abs(akg.pagerank(X, Y)[pi] - pr) < 1e-6))
+            self.assertTrue(ak.all(akg.bfs_distance(X, Y, int(pi[0]))[pi] == dist))
+
+        # shuffled path graph: rcm recovers bandwidth 1
+        V, U = path_graph(100)
+        pi = akg.get_perm(100)
+        X, Y = akg.apply_order(pi, V, U)
+        self.assertGreater(akg.cut_fraction(X, Y, 4), 0.5)
+        X, Y = akg.apply_order(akg.rcm_order(X, Y), X, Y)
+        self.assertEqual(ak.abs(X - Y).max(), 1)
+        self.assertLess(akg.cut_fraction(X, Y, 4), 0.05)
+
+    #outofcore.py tests
+    def test_Out_Of_Core(self):
+        _, V, U = karate_club_graph()
+        X, Y = V.to_ndarray(), U.to_ndarray()
+        with tempfile.TemporaryDirectory(dir=os.getcwd()) as tmp:
+            files = [os.path.join(tmp, f'edges_{i}.hdf5') for i in range(3)]
+            for i, f in enumerate(files):
+                akg.numpy_edges_to_hdf5(X[i::3], Y[i::3], f)
+            edges = akg.EdgeChunks(files)
+
+            self.assertEqual(edges.n, 34)
+            self.assertTrue(ak.all(akg.ooc_degree(edges) == akg.out_degree(V, U)))
+            self.assertTrue(ak.all(akg.ooc_degree(edges, 'in') == akg.in_degree(V, U)))
+            self.assertTrue(ak.all(akg.ooc_in_degree(edges) == akg.in_degree(V, U)))
+            self.assertTrue(ak.all(akg.ooc_bfs_distance(edges, 0) == akg.bfs_distance(V, U, 0)))
+
+            x = akg.ooc_pagerank(edges)
+            self.assertTrue(ak.all(ak.abs(x - akg.pagerank(V, U)) < 1e-6))
+
+            c, e = akg.ooc_eigenvector_centrality(edges)
+            d, f = akg.eigenvector_centrality(V, U)
+            self.assertLess(abs(c - d), 1e-6)
+            self.assertTrue(ak.all(ak.abs(e - f) < 1e-6))
+
+            self.assertEqual(len(set(edges.pass_bytes)), 1)
+            self.assertEqual(edges.pass_bytes[0], 2 * 8 * V.size)
+
+    #ingest.py tests
+    def test_Ingest(self):
+        A = np.array([7, 3, 3, 9, 7, 5, 5, 3, 9])
+        B = np.array([3, 7, 9, 9, 5, 7, 3, 7, 3])
+        W = np.array([1., 2., 3., 4., 5., 6., 7., 8., 9.])
+        ans = akg.standardize_edges(ak.array(A), ak.array(B), ak.array(W),
+                                    weight_reduce='sum', return_labels=True)
+
+        with tempfile.TemporaryDirectory(dir=os.getcwd()) as tmp:
+            files = [os.path.join(tmp, f'edges_{i}.hdf5') for i in range(3)]
+            for i, f in enumerate(files):
+                with h5py.File(f, 'w') as h:
+                    h['src'], h['dst'], h['wgt'] = A[i::3], B[i::3], W[i::3]
+            out = akg.ingest_edges(files, weight='wgt', weight_reduce='sum',
+                                   return_labels=True)
+            self.assertEqual(len(out), 4)
+            for x, y in zip(out, ans):
+                self.assertTrue(ak.all(x == y))
+
+            csv = [os.path.join(tmp, f'edges_{i}.csv') for i in range(2)]
+            for i, f in enumerate(csv):
+                np.savetxt(f, np.stack([A[i::2], B[i::2]], axis=1), fmt='%d',
+                           delimiter=',', header='src,dst', comments='')
+            V, U = akg.ingest_edges(csv, symmetric=False)
+            X, Y = akg.standardize_edges(ak.array(A), ak.array(B),
+                                         symmetric=False)
+            self.assertTrue(ak.all(V == X) and ak.all(U == Y))
+
+        # counts of duplicates survive merging runs
+        ingest = akg.EdgeIngest(weight_reduce='count', symmetric=False)
+        for _ in range(4):
+            ingest.add(ak.array([10, 10, 20]), ak.array([20, 20, 30]))
+        V, U, C, L = ingest.finish(return_labels=True)
+        self.assertEqual(L.to_ndarray().tolist(), [10, 20, 30])
+        self.assertEqual(C.to_ndarray().tolist(), [8, 4])
+
+        with self.assertRaises(ValueError):
+            akg.EdgeIngest(weighted=True, weight_reduce='mean')
+
+    #walks.py tests
+    def test_Random_Walks(self):
+        V, U = path_graph(10)
+        walks = akg.random_walks(V, U, length=5, num_walks=3, seed=1)
+        self.assertEqual(len(walks), 5)
+        self.assertTrue(ak.all(walks[0] == ak.arange(30) % 10))
+        for a, b in zip(walks[:-1], walks[1:]):
+            self.assertTrue(ak.all(ak.abs(a - b) == 1))
+
+        # dead ends stop the walk
+        walks = akg.random_walks(ak.array([0, 1]), ak.array([1, 2]), length=4)
+        self.assertEqual(walks[3].to_ndarray().tolist(), [-1, -1, -1])
+
+        # zero weight edges are never taken
+        V, U = complete_graph(4)
+        W = ak.where((V == 0) & (U == 1) | (V == 1) & (U == 0), 0.0, 1.0)
+        walks = akg.random_walks(V, U, length=6, num_walks=50, W=W)
+        for a, b in zip(walks[:-1], walks[1:]):
+            self.assertFalse(ak.any((a + b == 1) & (a * b == 0)))
+
+        # exact sampling after the rejection rounds keeps the distribution
+        walker = akg.RandomWalker(V, U, W, q=0.5, max_tries=0)
+        walks = walker.walk(ak.arange(200) % 4, 6)
+        for a, b in zip(walks[:-1], walks[1:]):
+            self.assertFalse(ak.any((a + b == 1) & (a * b == 0)))
+
+        # tiny p always returns on a complete graph
+        walks = akg.random_walks(V, U, length=5, num_walks=50, p=1e-6)
+        self.assertTrue(ak.all(walks[2] == walks[0]))
+        self.assertTrue(ak.all(walks[4] == walks[2]))
+
+        # tiny q never returns on a path, except from its ends
+        V, U = path_graph(10)
+        walks = akg.random_walks(V, U, length=5, num_walks=20, q=1e-6)
+        for a, b, c in zip(walks[:-2], walks[1:-1], walks[2:]):
+            self.assertTrue(ak.all((c != a) | (b == 0) | (b == 9)))
+        with tempfile.TemporaryDirectory() as tmp:
+            file = os.path.join(tmp, 'walks.hdf5')
+            count = akg.write_random_walks(file, V, U, length=4, num_walks=2,
+                                           chunk_walkers=7)
+            self.assertEqual(count, 20)
+            with h5py.File(file, 'r') as f:
+                walks = f['walks'][:]
+            self.assertEqual(walks.shape, (20, 4))
+            self.assertEqual(walks[:, 0].tolist(), list(range(10)) * 2)
+            self.assertTrue(np.all(np.abs(np.diff(walks, axis=1)) == 1))
+
+    #planning.py tests
+    def test_Memory_Planning(self):
+        n, m = 2 ** 20, 2 ** 24
+        boruvka = akg.estimate_memory('msf_boruvka', n, m, True)
+        chunked = akg.estimate_memory('msf_filter_kruskal', n, m, True)
+        self.assertGreater(boruvka, 2 * m * 8)
+        self.assertLess(chunked, boruvka)
+
+        plan = akg.plan_algorithm('msf_boruvka', n, m, True, available=2 * boruvka)
+        self.assertTrue(plan.fits)
+        self.assertEqual(plan.algorithm, 'msf_boruvka')
+
+        plan = akg.plan_algorithm('msf_boruvka', n, m, True, available=chunked,
+                                  safety=1.0)
+        self.assertTrue(plan.fits)
+        self.assertEqual(plan.algorithm, 'msf_filter_kruskal')
+
+        plan = akg.plan_algorithm('pagerank', n, m, available=1)
+        self.assertFalse(plan.fits)
+
+        pagerank = akg.estimate_memory('pagerank', n, m)
+        plan = akg.plan_algorithm('pagerank', n, m, available=pagerank // 2)
+        self.assertTrue(plan.fits)
+        self.assertEqual(plan.algorithm, 'ooc_pagerank')
+        self.assertLess(0, plan.chunk_edges)
+        self.assertLess(plan.chunk_edges, m)
+
+        degree = akg.estimate_memory('in_degree', n, m)
+        plan = akg.plan_algorithm('in_degree', n, m, available=degree // 2)
+        self.assertEqual(plan.algorithm, 'ooc_in_degree')
+
+        with self.assertRaises(ValueError):
+            akg.estimate_memory('not_an_algorithm', n, m)
+
+    #summary.py tests
+    def test_Graph_Summary(self):
+        _, V, U = karate_club_graph()
+        s = akg.graph_summary(V, U, diameter_sweeps=2)
+        self.assertEqual((s.n, s.m), (34, 156))
+        self.assertEqual((s.self_loops, s.duplicates, s.isolated), (0, 0, 0))
+        self.assertTrue(s.symmetric)
+        order = np.lexsort((U.to_ndarray(), V.to_ndarray()))
+        self.assertEqual(s.sorted, bool(np.all(order == np.arange(156))))
+        self.assertEqual((s.min_degree, s.max_degree), (1, 17))
+        self.assertAlmostEqual(s.mean_degree, 156 / 34)
+        self.assertEqual((s.components, s.largest_component), (1, 34))
+        self.assertIn(s.diameter, (4, 5))
+
+        # directed, with a loop, a duplicate and isolated nodes 3 and 4
+        V = ak.array([0, 0, 1, 1, 5])
+        U = ak.array([1, 1, 1, 2, 0])
+        s = akg.graph_summary(V, U)
+        self.assertEqual((s.n, s.m), (6, 5))
+        self.assertEqual((s.self_loops, s.duplicates, s.isolated), (1, 1, 2))
+        self.assertFalse(s.symmetric)
+        self.assertTrue(s.sorted)
+        self.assertEqual((s.min_degree, s.max_degree), (0, 3))
+        self.assertAlmostEqual(s.mean_degree, 7 / 6)
+        self.assertEqual((s.components, s.largest_component), (3, 4))
+        self.assertIsNone(s.diameter)
+
+        # symmetric multigraph, unsorted
+        V = ak.array([1, 0, 0, 1, 2, 1])
+        U = ak.array([0, 1, 1, 0, 1, 2])
+        s = akg.graph_summary(V, U)
+        self.assertEqual((s.duplicates, s.symmetric, s.sorted), (2, True, False))
+        self.assertEqual((s.min_degree, s.max_degree), (1, 2))
+        self.assertAlmostEqual(s.mean_degree, 4 / 3)
 
     #traversal.py tests
     def test_BFS(self):
@@ -325,7 +675,151 @@ class akgraphTest(ArkoudaTest):
         self.assertTrue(ak.all(tree == ans_tree))
         self.assertTrue(ak.all(ak.abs(dist - ans_dist) < 10 ** -7))
     
- 
+    def test_Bidirectional_Search(self):
+        _, V, U = karate_club_graph()
+        dist = akg.bfs_distance(V, U, 0)
+        self.assertEqual(akg.bidirectional_bfs(V, U, 0, 0), 0)
+        self.assertEqual(akg.bidirectional_bfs(V, U, 0, 14), dist[14])
+
+        # batch of pairs, one source against every target
+        targets = ak.arange(34)
+        self.assertTrue(ak.all(akg.bidirectional_bfs(V, U, 0, targets) == dist))
+        capped = akg.bidirectional_bfs(V, U, 0, targets, depth_limit=2)
+        self.assertTrue(ak.all(capped == ak.where(dist <= 2, dist, -1)))
+        sources = ak.array([14, 33, 5])
+        pairs = akg.bidirectional_bfs(V, U, sources, ak.array([15, 0, 16]))
+        self.assertEqual(pairs.to_ndarray().tolist(), [2, 2, 1])
+
+        # disconnected and directed
+        X = ak.array([0, 0, 2, 3, 5])
+        Y = ak.array([1, 2, 3, 4, 6])
+        self.assertEqual(akg.bidirectional_bfs(X, Y, 0, 4), 3)
+        self.assertEqual(akg.bidirectional_bfs(X, Y, 4, 0), -1)
+        self.assertEqual(akg.bidirectional_bfs(X, Y, 0, 6), -1)
+
+        V = ak.array([0, 1, 1, 2, 2, 3, 4, 4, 4, 4, 5, 5, 6, 6, 6, 6])
+        U = ak.array([4, 4, 5, 4, 6, 6, 0, 1, 2, 6, 1, 6, 2, 3, 4, 5])
+        W = ak.array([0.00519276, 0.48041395, 0.82665647, 0.81736032, 0.85313951,
+                      0.40577813, 0.00519276, 0.48041395, 0.81736032, 0.40383667,
+                      0.82665647, 0.84988933, 0.85313951, 0.40577813, 0.40383667,
+                      0.84988933])
+        _, ans = akg.sssp_bf(V, U, W, 0)
+        dist = akg.bidirectional_sssp(V, U, W, 0, ak.arange(7))
+        self.assertTrue(ak.all(ak.abs(dist - ans) < 10 ** -7))
+        self.assertAlmostEqual(akg.bidirectional_sssp(V, U, W, 5, 0), ans[5])
+        dist = akg.bidirectional_sssp(V, U, W, 0, ak.arange(7), max_dist=0.5)
+        self.assertTrue(ak.all(dist == ak.where(ans <= 0.5, ans, -1.0)))
+
+    #vertex_program.py tests
+    def test_Vertex_Program(self):
+        n = 5
+        pV, pU = path_graph(n)
+        cV, cU = complete_graph(n)
+        V = ak.concatenate([pV, cV + n], ordered=False)
+        U = ak.concatenate([pU, cU + n], ordered=False)
+
+        # connected components by minimum label
+        labels, history = akg.vertex_program(
+            V, U, ak.arange(2 * n), lambda e: e.state, 'min',
+            lambda s, c, r: ak.where(r & (c < s), c, s))
+        self.assertTrue(ak.all(labels == akg.fast_sv(V, U)[1]))
+        self.assertEqual(history[-1].changed, 0)
+        # pruning: only the path still sends after the first step
+        self.assertEqual(history[0].active, 2 * n)
+        self.assertLess(history[-1].messages, V.size)
+
+        # BFS distance from 0 and 33
+        _, kV, kU = karate_club_graph()
+        inf = 2 ** 62
+        start = ak.zeros(34, 'int64') + inf
+        start[ak.array([0, 33])] = 0
+        dist, _ = akg.vertex_program(
+            kV, kU, start, lambda e: e.state + 1, 'min',
+            lambda s, c, r: ak.where(r & (c < s), c, s),
+            active=(start == 0))
+        ans = akg.bfs_distance(kV, kU, ak.array([0, 33]))
+        self.assertTrue(ak.all(dist == ans))
+
+        # PageRank needs every message, so sums are not pruned
+        x = ak.ones(34, 'float64') / 34
+        deg = akg.degree(kV, kU, symmetric=True)
+        pr, history = akg.vertex_program(
+            kV, kU, x, lambda e: e.state / deg[e.src], 'sum',
+            lambda s, c, r: 0.15 / 34 + 0.85 * c, tol=1e-10, max_iter=500)
+        self.assertTrue(all(h.active == 34 for h in history))
+        self.assertLess(ak.abs(pr - akg.pagerank(kV, kU)).max(), 1e-6)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, 'cc')
+            _, history = akg.vertex_program(
+                V, U, ak.arange(2 * n), lambda e: e.state, 'min',
+                lambda s, c, r: ak.where(r & (c < s), c, s),
+                checkpoint=prefix, checkpoint_every=1)
+            saved = akg.load_checkpoint(prefix, 1)
+            self.assertEqual(saved.size, 2 * n)
+
+        with self.assertRaises(ValueError):
+            akg.vertex_program(V, U, ak.arange(2 * n), lambda e: e.state,
+                               'median', lambda s, c, r: c)
+
+    #laplacian.py tests
+    def test_Laplacian(self):
+        _, V, U = karate_club_graph()
+        n = 34
+        W = ak.cast(V + U, 'float64') / 10.0  # symmetric weights
+        x = ak.randint(0, 1, n, dtype='float64')
+
+        # same products as the COO Laplacian D - A
+        d = ak.zeros(n)
+        keys, sums = ak.GroupBy(V).sum(W)
+        d[keys] = sums
+        i = ak.arange(n)
+        coo = aks.matvec_from_coo(ak.concatenate([i, V]),
+                                  ak.concatenate([i, U]),
+                                  ak.concatenate([d, -W]))
+        L = akg.laplacian(V, U, W)
+        self.assertTrue(ak.all(ak.abs(L(x) - coo(x)) < 1e-12))
+        self.assertTrue(ak.all(ak.abs(L(ak.ones(n))) < 1e-12))
+        self.assertTrue(ak.all(ak.abs(L.diagonal - d) < 1e-12))
+
+        N = akg.laplacian(V, U, W, kind='normalized')
+        s = 1.0 / ak.sqrt(d)
+        self.assertTrue(ak.all(ak.abs(N(x) - s * L(s * x)) < 1e-12))
+        R = akg.laplacian(V, U, W, kind='random_walk')
+        self.assertTrue(ak.all(ak.abs(R(x) - L(x) / d) < 1e-12))
+        self.assertTrue(ak.all(ak.abs(R.rmatvec(x) - L(x / d)) < 1e-12))
+
+        # shifted Laplacian is positive-definite
+        L = akg.laplacian(V, U, W, shift=0.1)
+        b = L(x)
+        for out in (aks.cg(L, b, tol=1e-10, max_iter=200),
+                    aks.cg(L, b, precon=L.preconditioner(), tol=1e-10,
+                           max_iter=200),
+                    # minres stops relative to norm(A) * norm(x)
+                    aks.minres(L, b, tol=1e-12, max_iter=200)):
+            self.assertLess(out[3], 1e-8)
+            self.assertTrue(ak.all(ak.abs(out[0] - x) < 1e-6))
+        P = akg.laplacian_preconditioner(L)
+        self.assertTrue(ak.all(ak.abs(P(L.diagonal) - 1) < 1e-12))
+
+        with self.assertRaises(ValueError):
+            akg.laplacian(V, U, kind='signless')
+
+    #util/general.py tests
+    def test_Transfer(self):
+        A = ak.randint(0, 1, 1000, dtype='float64')
+        B = akg.to_numpy(A, chunk_bytes=800)
+        self.assertEqual(B.dtype, np.float64)
+        self.assertTrue(np.all(B == A.to_ndarray()))
+        C = akg.from_numpy(B, chunk_bytes=800)
+        self.assertTrue(ak.all(A == C))
+
+        X = np.arange(10 ** 4, dtype=np.int64)
+        Y = akg.from_numpy(X)
+        self.assertTrue(ak.all(Y == ak.arange(10 ** 4)))
+        self.assertTrue(np.all(akg.to_numpy(Y, chunk_bytes=8 * 3000) == X))
+
+
 #TBD: update these tests
 '''
 #/util/general.py tests
@@ -1,2 +1,14 @@
+from aksolve.semiring import *
 from aksolve.util import *
+from aksolve.telemetry import *
+from aksolve.generators import *
 from aksolve.conjugate_gradients import *
+from aksolve.minres import *
+from aksolve.block_cg import *
+from aksolve.gmres import *
+from aksolve.bicgstab import *
+from aksolve.lsqr import *
+from aksolve.preconditioners import *
+from aksolve.amg import *
+from aksolve.eigen import *
+from aksolve.refinement import *
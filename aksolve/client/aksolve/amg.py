@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Smoothed aggregation algebraic multigrid (AMG) for graph Laplacians.
+
+The hierarchy is built from COO arrays on the server:
+
+1. strong couplings |a_ij| >= theta * sqrt(|a_ii a_jj|) define a graph,
+2. a distance-2 maximal independent set of that graph (Luby's algorithm)
+   seeds the aggregates and every other node joins a seed within two
+   steps, all by GroupBy reductions over the strong edges,
+3. the tentative prolongator T is the normalized aggregate indicator and is
+   smoothed by one damped Jacobi step, P = (I - w D^-1 A) T,
+4. the coarse matrix is the Galerkin product P.T A P, computed as two
+   sparse matrix products by expanding the row segments of `SpMV`.
+
+A V-cycle with damped Jacobi smoothing and a dense pseudo-inverse on the
+coarsest level is a symmetric positive (semi-)definite `Operator`, so it can
+precondition `cg` on singular Laplacians too. If coarsening stops above
+`max_coarse` rows, the coarsest level is smoothed by Jacobi sweeps instead of
+being solved densely.
+"""
+__all__ = ['AMGHierarchy', 'amg_preconditioner']
+
+
+from typing import Tuple
+from warnings import warn
+
+import numpy as np
+
+import arkouda as ak
+
+from aksolve.semiring import SpMV
+from aksolve.util import CooOperator
+
+
+Coo = Tuple[ak.pdarray, ak.pdarray, ak.pdarray]
+
+
+def _diagonal(R: ak.pdarray, C: ak.pdarray, V: ak.pdarray, n: int) -> ak.pdarray:
+    """Diagonal of a COO matrix, summing duplicates."""
+    diag = ak.zeros(n, 'float64')
+    on = (R == C)
+    if on.any():
+        keys, sums = ak.GroupBy(R[on]).sum(V[on])
+        diag[keys] = sums
+    return diag
+
+
+def _inverse(diag: ak.pdarray) -> ak.pdarray:
+    """Elementwise inverse of the diagonal, 0 where the diagonal is 0."""
+    nonzero = (diag != 0)
+    return ak.where(nonzero, 1.0 / ak.where(nonzero, diag, 1.0), 0.0)
+
+
+def _jacobi_weight(R: ak.pdarray, V: ak.pdarray, diag: ak.pdarray) -> float:
+    """4 / 3 over the Gershgorin bound of the spectral radius of D^-1 A."""
+    keys, sums = ak.GroupBy(R).sum(ak.abs(V))
+    d = ak.abs(diag[keys])
+    rho = (sums[d > 0] / d[d > 0]).max() if (d > 0).any() else 1.0
+    return 4.0 / (3.0 * rho)
+
+
+def _neighbor_max(
+    g: ak.GroupBy,
+    c: ak.pdarray,
+    x: ak.pdarray
+) -> ak.pdarray:
+    """Maximum of x over each node and its neighbors."""
+    keys, top = g.max(x[c])
+    out = x[:]
+    out[keys] = ak.where(top > x[keys], top, x[keys])
+    return out
+
+
+def _aggregate(
+    R: ak.pdarray,
+    C: ak.pdarray,
+    V: ak.pdarray,
+    diag: ak.pdarray,
+    theta: float,
+    seed: int
+) -> Tuple[int, ak.pdarray]:
+    """Aggregate nodes around a distance-2 maximal independent set."""
+    n = diag.size
+    ad = ak.abs(diag)
+    strong = (R != C) & (ak.abs(V) >= theta * ak.sqrt(ad[R] * ad[C]))
+    r, c = R[strong], C[strong]
+    if r.size == 0:
+        return n, ak.arange(n)
+    g = ak.GroupBy(r)
+
+    # Luby on the square of the strong graph: undecided nodes with the top
+    # priority within distance 2 become seeds, their 2-neighborhoods leave
+    prio = ak.zeros(n, 'int64')
+    prio[ak.argsort(ak.randint(0, 1, n, dtype='float64', seed=seed))] = \
+        ak.arange(n)
+    state = ak.zeros(n, 'int64')        # 0 undecided, 1 seed, -1 excluded
+    while (state == 0).any():
+        open_ = (state == 0)
+        top = _neighbor_max(g, c, _neighbor_max(g, c, ak.where(open_, prio, -1)))
+        state[open_ & (top == prio)] = 1
+        near = _neighbor_max(g, c, _neighbor_max(g, c, ak.cast(state == 1, 'int64')))
+        state[(state == 0) & (near > 0)] = -1
+
+    # seeds, then their neighbors, then the neighbors of those join
+    seeds = ak.arange(n)[state == 1]
+    agg = ak.zeros(n, 'int64') - 1
+    agg[seeds] = ak.arange(seeds.size)
+    for _ in range(2):
+        e = (agg[c] >= 0) & (agg[r] < 0)
+        if e.any():
+            keys, first = ak.GroupBy(r[e]).min(agg[c[e]])
+            agg[keys] = first
+    return seeds.size, agg
+
+
+def _spgemm(A: Coo, B: SpMV) -> Coo:
+    """Sparse product A @ B with the row segments of B."""
+    Ar, Ac, Av = A
+    entries, item = B.row_entries(Ac)
+    vals = Av[item]
+    if B.vals is not None:
+        vals = vals * B.vals[entries]
+    (I, J), X = ak.GroupBy([Ar[item], B.cols[entries]]).sum(vals)
+    return I, J, X
+
+
+def _smoothed_prolongator(
+    R: ak.pdarray,
+    C: ak.pdarray,
+    V: ak.pdarray,
+    dinv: ak.pdarray,
+    agg: ak.pdarray,
+    omega: float
+) -> Coo:
+    """P = (I - omega D^-1 A) T for the normalized aggregate indicator T."""
+    n = agg.size
+    _, size = ak.GroupBy(agg).count()
+    node = ak.arange(n)
+    t = 1.0 / ak.sqrt(ak.cast(size[agg], 'float64'))
+    # (A T)[i, J] = sum of a_ik t_k over the nodes k of aggregate J
+    AT_v = (-omega) * dinv[R] * V * t[C]
+    I = ak.concatenate([node, R])
+    J = ak.concatenate([agg, agg[C]])
+    (I, J), X = ak.GroupBy([I, J]).sum(ak.concatenate([t, AT_v]))
+    keep = (X != 0)
+    return I[keep], J[keep], X[keep]
+
+
+class AMGHierarchy:
+    """
+    Smoothed aggregation multigrid hierarchy, applied as a V-cycle.
+
+    Calling the hierarchy on a vector b runs one V-cycle for Ax = b from
+    x = 0, which makes it an `Operator` approximating the inverse of A.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    V : ak.pdarray
+        values of a symmetric matrix, typically a graph Laplacian
+    max_levels : int (default 10)
+        number of levels including the finest
+    max_coarse : int (default 300)
+        stop coarsening below this size and solve densely on the client. A
+        larger coarsest level (coarsening stalled or `max_levels` reached)
+        gets presmooth + postsmooth damped Jacobi sweeps, at least one,
+        instead
+    theta : float (default 0.08)
+        strength of connection threshold
+    presmooth : int (default 1)
+        damped Jacobi sweeps before the coarse correction
+    postsmooth : int (default 1)
+        damped Jacobi sweeps after the coarse correction
+    seed : int (default 0)
+        seed for the independent set priorities
+    verbose : bool (default False)
+        print the size of each level
+
+    Attributes
+    ----------
+    levels : List[Tuple[int, int]]
+        (rows, nonzeros) of each level, finest first
+    operator_complexity : float
+        total nonzeros of all levels over the nonzeros of A
+
+    References
+    ----------
+    Algebraic Multigrid by Smoothed Aggregation for Second and Fourth Order
+        Elliptic Problems. P. Vanek, J. Mandel and M. Brezina. Computing,
+        Volume 56, 1996, pp. 179-196.
+    """
+
+    def __init__(
+        self,
+        R: ak.pdarray,
+        C: ak.pdarray,
+        V: ak.pdarray,
+        max_levels: int = 10,
+        max_coarse: int = 300,
+        theta: float = 0.08,
+        presmooth: int = 1,
+        postsmooth: int = 1,
+        seed: int = 0,
+        verbose: bool = False
+    ):
+        if max_levels < 1:
+            raise ValueError(f'max_levels must be positive: {max_levels}')
+        if R.size != C.size or R.size != V.size:
+            raise ValueError('R, C and V must be the same size')
+        if presmooth < 0 or postsmooth < 0:
+            raise ValueError('presmooth and postsmooth must be non-negative: '
+                             f'{presmooth}, {postsmooth}')
+        self.presmooth, self.postsmooth = presmooth, postsmooth
+        n = max(R.max(), C.max()) + 1
+        V = ak.cast(V, 'float64')
+
+        # (A, P, weighted inverse diagonal) from fine to coarse
+        self._levels = []
+        self.levels = []
+        while True:
+            self.levels.append((n, R.size))
+            if len(self.levels) == max_levels or n <= max_coarse:
+                break
+            diag = _diagonal(R, C, V, n)
+            omega = _jacobi_weight(R, V, diag)
+            nc, agg = _aggregate(R, C, V, diag, theta, seed)
+            if nc >= n or nc == 0:
+                break
+            dinv = _inverse(diag)
+            P = _smoothed_prolongator(R, C, V, dinv, agg, omega)
+            A_P = _spgemm((R, C, V), SpMV(*P, shape=(n, nc)))
+            Pr, Pc, Pv = P
+            R_c, C_c, V_c = _spgemm((Pc, Pr, Pv), SpMV(*A_P, shape=(n, nc)))
+
+            self._levels.append((CooOperator(R, C, V, (n, n)),
+                                 CooOperator(*P, shape=(n, nc)),
+                                 omega * dinv))
+            R, C, V, n = R_c, C_c, V_c, nc
+
+        # coarsest level, dense pseudo-inverse on the client if small enough
+        if n <= max_coarse:
+            dense = np.zeros((n, n))
+            np.add.at(dense, (R.to_ndarray(), C.to_ndarray()), V.to_ndarray())
+            self._coarse = np.linalg.pinv(dense, hermitian=True)
+        else:
+            warn(f'AMG coarsening stopped at {n:,d} > max_coarse rows, '
+                 'smoothing the coarsest level')
+            diag = _diagonal(R, C, V, n)
+            omega = _jacobi_weight(R, V, diag)
+            self._coarse = (CooOperator(R, C, V, (n, n)),
+                            omega * _inverse(diag))
+
+        total = sum(nnz for _, nnz in self.levels)
+        self.operator_complexity = total / self.levels[0][1]
+        if verbose:
+            print(' level       rows        nnz')
+            for i, (rows, nnz) in enumerate(self.levels):
+                print(f' {i:>5} {rows:>10,d} {nnz:>10,d}')
+            print(f' operator complexity = {self.operator_complexity:0.3f}')
+
+    @staticmethod
+    def _smooth(
+        A: CooOperator,
+        wdinv: ak.pdarray,
+        b: ak.pdarray,
+        sweeps: int
+    ) -> ak.pdarray:
+        """Damped Jacobi sweeps for Ax = b from x = 0."""
+        if sweeps == 0:
+            return ak.zeros(b.size, 'float64')
+        x = wdinv * b
+        for _ in range(sweeps - 1):
+            x = x + wdinv * (b - A(x))
+        return x
+
+    def _cycle(self, level: int, b: ak.pdarray) -> ak.pdarray:
+        """V-cycle for A_level x = b from x = 0."""
+        if level == len(self._levels):
+            if isinstance(self._coarse, np.ndarray):
+                return ak.array(self._coarse @ b.to_ndarray())
+            A, wdinv = self._coarse
+            return self._smooth(A, wdinv, b,
+                                max(1, self.presmooth + self.postsmooth))
+        A, P, wdinv = self._levels[level]
+        x = self._smooth(A, wdinv, b, self.presmooth)
+        x = x + P(self._cycle(level + 1, P.rmatvec(b - A(x))))
+        for _ in range(self.postsmooth):
+            x = x + wdinv * (b - A(x))
+        return x
+
+    def __call__(self, b: ak.pdarray) -> ak.pdarray:
+        """Apply one V-cycle, usable as an `Operator`."""
+        return self._cycle(0, b)
+
+
+def amg_preconditioner(
+    R: ak.pdarray,
+    C: ak.pdarray,
+    V: ak.pdarray,
+    **kwargs
+) -> AMGHierarchy:
+    """
+    Create a smoothed aggregation AMG preconditioner.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    V : ak.pdarray
+        values of a symmetric matrix, typically a graph Laplacian
+    **kwargs
+        options of `AMGHierarchy`
+
+    Return
+    ------
+    P : AMGHierarchy
+        V-cycle operator approximating the inverse of A
+
+    See Also
+    --------
+    AMGHierarchy
+    diagonal_preconditioner()
+    """
+    return AMGHierarchy(R, C, V, **kwargs)
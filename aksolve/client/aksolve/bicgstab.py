@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""BiConjugate Gradient STABilized solver for nonsymmetric Ax = b.
+
+BiCGSTAB keeps a fixed handful of vectors, so its memory does not grow with
+the iteration count like GMRES. The textbook iteration has five inner
+products. Here they are grouped into three `batched_inner` reductions: the
+norm of the new residual travels with the next shadow product, and the
+stabilization products travel together.
+"""
+__all__ = ['bicgstab']
+
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+import arkouda as ak
+
+from aksolve.util import (
+    _STOP_STATUS, batched_inner, eye, EPS, inner, norm, Operator
+)
+from aksolve.telemetry import _record, _tracked, SolverHistory
+
+
+@_tracked
+def bicgstab(
+    matvec: Operator,
+    b: ak.pdarray,
+    x_start: Optional[ak.pdarray] = None,
+    precon: Operator = eye,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+) -> Tuple[ak.pdarray, int, int, float]:
+    """
+    Solve Ax = b by the biconjugate gradient stabilized method.
+
+    A can be any nonsingular square matrix. Each iteration costs two matvecs,
+    two preconditioner applications and three reductions. The
+    preconditioner is applied on the right.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y
+    b : ak.pdarray
+        right hand side of desired equation
+    x_start : { ak.pdarray | None }
+        initial guess at solution
+    precon : Operator (default `eye`)
+        preconditioner for A.  This should approximate the inverse of A.
+    max_iter : int (default 100)
+        number of iterations to perform
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norm
+    verbose : bool (default False)
+        print a summary of iterations
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+
+    Return
+    ------
+    x : ak.pdarray
+        computed solution
+    istop : int
+        reason for termination (istop == 4 --> not converged, istop == 5 -->
+        breakdown)
+    niter : int
+        number of iterations
+    rnorm : float
+        norm of final residual vector
+
+    References
+    ----------
+    Bi-CGSTAB: A Fast and Smoothly Converging Variant of Bi-CG for the
+        Solution of Nonsymmetric Linear Systems. H. A. van der Vorst. SIAM
+        Journal on Scientific and Statistical Computing, Volume 13, 1992.
+
+    https://en.wikipedia.org/wiki/Biconjugate_gradient_stabilized_method
+    """
+    n = b.size
+    if verbose:
+        print('\nEnter BiCGSTAB Solver.\n')
+        print(f"            n = {n}\n"
+              f"     max_iter = {max_iter}\n"
+              f"    tolerance = {tol}\n")
+
+    istop = niter = 0
+    rnorm = 0.0
+
+    if norm(b) < EPS:
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (b, istop, niter, rnorm)
+
+    x = ak.zeros(n)
+    if x_start is not None:
+        x[:] = x_start[:]
+    r = b - matvec(x)
+    rhat = r[:]
+    rho = inner(r, r)
+    rnorm = r0 = np.sqrt(rho)
+
+    if rnorm < EPS:
+        istop = 1
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (x, istop, niter, rnorm)
+
+    if verbose:
+        columns = ['niter', 'rnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    p = r[:]
+    while niter < max_iter and rnorm >= tol and rnorm >= EPS:
+        if abs(rho) < EPS * r0 * rnorm:
+            istop = 5
+            break
+        phat = precon(p)
+        v = matvec(phat)
+        alfa = rho / inner(rhat, v)
+        s = r - alfa * v
+        shat = precon(s)
+        t = matvec(shat)
+
+        tt, ts, ss = batched_inner([t, t, s], [t, s, s])
+        niter += 1
+        if np.sqrt(ss) < tol or tt < EPS * EPS:
+            x = x + alfa * phat
+            r, rnorm = s, np.sqrt(ss)
+            if verbose: print(f'{niter:>10} {rnorm:>10.2e}')
+            _record(niter, rnorm)
+            if rnorm >= tol:
+                istop = 5   # A shat = 0, s cannot be reduced
+            break
+
+        omega = ts / tt
+        x = x + alfa * phat + omega * shat
+        r = s - omega * t
+        rr, rho_new = batched_inner([r, rhat], [r, r])
+        rnorm = np.sqrt(rr)
+        if verbose: print(f'{niter:>10} {rnorm:>10.2e}')
+        _record(niter, rnorm)
+        if abs(omega) < EPS and rnorm >= tol:
+            istop = 5
+            break
+
+        beta = (rho_new / rho) * (alfa / omega)
+        p = r + beta * (p - omega * v)
+        rho = rho_new
+
+    if istop != 5:
+        if niter >= max_iter : istop = 4
+        if rnorm < tol       : istop = 3
+        if rnorm < EPS       : istop = 2
+
+    if verbose:
+        print('\nExit BiCGSTAB Solver.\n')
+        print(f'Status: {_STOP_STATUS[istop]}')
+        print(f' niter = {niter}\n'
+              f' rnorm = {rnorm:0.3e}\n')
+
+    return (x, istop, niter, rnorm)
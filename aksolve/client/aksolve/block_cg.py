@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Block Conjugate Gradients for AX = B with many right hand sides.
+
+The k right hand sides are stored as k vectors of size n laid end to end in
+one array, column j is B[j * n:(j + 1) * n]. Every iteration applies A to all
+k search directions at once (`CooOperator.matmat` multiplies them in a few
+blocks of 2^i columns) and the k x k coefficient algebra runs on the client.
+"""
+__all__ = ['block_cg']
+
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+import arkouda as ak
+
+from aksolve.util import (
+    _segment_sums, block_combine, block_inner, eye, EPS, Operator
+)
+from aksolve.telemetry import _record, _tracked, SolverHistory
+
+
+def _apply(op: Operator, X: ak.pdarray, k: int) -> ak.pdarray:
+    """Apply `op` to k stacked vectors, in one pass if it supports matmat."""
+    if op is eye:
+        return X[:]
+    if hasattr(op, 'matmat'):
+        return op.matmat(X, k)
+    n = X.size // k
+    Y = [op(X[j * n:(j + 1) * n]) for j in range(k)]
+    return ak.concatenate(Y, ordered=True) if k > 1 else Y[0]
+
+
+def _columns(cols: np.ndarray, n: int) -> ak.pdarray:
+    """Positions of the stacked vectors `cols` in a stacked array."""
+    size = len(cols) * n
+    return ak.array(cols)[ak.arange(size) // n] * n + ak.arange(size) % n
+
+
+def _solve(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Least squares solution of A @ X = B, robust to rank deficiency."""
+    return np.linalg.lstsq(A, B, rcond=None)[0]
+
+
+@_tracked
+def block_cg(
+    matvec: Operator,
+    B: ak.pdarray,
+    k: int,
+    X_start: Optional[ak.pdarray] = None,
+    precon: Operator = eye,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+) -> Tuple[ak.pdarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Solve AX = B for k right hand sides by block conjugate gradients.
+
+    All k systems share one block Krylov space, so each converges in fewer
+    iterations than alone and every iteration costs one (block) matvec.
+    When a column converges it is removed and the search directions restart
+    from the remaining residuals, so the block shrinks as systems finish.
+
+    A must be a symmetric, positive-definite matrix.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y. A `CooOperator`
+        (as from `matvec_from_coo`) multiplies all columns in one pass,
+        other operators are applied to one column at a time.
+    B : ak.pdarray
+        k right hand sides of size n, stacked end to end
+    k : int
+        number of right hand sides
+    X_start : { ak.pdarray | None }
+        initial guesses, stacked like B
+    precon : Operator (default `eye`)
+        preconditioner for A, applied to every column
+    max_iter : int (default 100)
+        number of iterations to perform
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norm of each column
+    verbose : bool (default False)
+        print a summary of iterations
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+
+    Return
+    ------
+    X : ak.pdarray
+        computed solutions, stacked like B
+    istop : np.ndarray[int]
+        reason for termination of each column, as in `cg`
+    niter : np.ndarray[int]
+        iterations until each column stopped
+    rnorm : np.ndarray[float]
+        norm of the final residual of each column
+
+    References
+    ----------
+    The block conjugate gradient algorithm and related methods. Dianne P.
+        O'Leary. Linear Algebra and its Applications, Volume 29, 1980,
+        pp. 293-322.
+    """
+    n = B.size // k
+    if k < 1 or B.size != k * n:
+        raise ValueError(f'B must hold {k} vectors of the same size')
+    if X_start is not None and X_start.size != B.size:
+        raise ValueError(f'size mismatch: {X_start.size} != {B.size}')
+    if verbose:
+        print('\nEnter Block Conjugate Gradient Solver.\n')
+        print(f"            n = {n}\n"
+              f"            k = {k}\n"
+              f"     max_iter = {max_iter}\n"
+              f"    tolerance = {tol}\n")
+
+    istop = np.full(k, 4)
+    niters = np.zeros(k, dtype=np.int64)
+    rnorm = np.zeros(k)
+
+    X = ak.zeros(k * n)
+    if X_start is not None:
+        X[:] = X_start[:]
+    bnorm = np.sqrt(_segment_sums(B * B, n))
+    R = B - _apply(matvec, X, k)
+    rn = np.sqrt(np.maximum(_segment_sums(R * R, n), 0))
+
+    # zero right hand sides and lucky guesses are finished already
+    zero, lucky = (bnorm < EPS), (bnorm >= EPS) & (rn < EPS)
+    istop[zero], istop[lucky] = 0, 1
+    rnorm[lucky] = rn[lucky]
+    if zero.any():
+        X[_columns(np.flatnonzero(zero), n)] = 0.0
+
+    cols = np.flatnonzero(~(zero | lucky))
+    rn = rn[cols]
+    if cols.size < k:
+        idx = _columns(cols, n)
+        Xa, Ra = X[idx], R[idx]
+    else:
+        Xa, Ra = X, R
+
+    if verbose:
+        columns = ['niter', 'active', 'max rnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    niter, restart = 0, True
+    while niter < max_iter and cols.size > 0:
+        ka = cols.size
+        if restart:
+            Z = _apply(precon, Ra, ka)
+            P = Z
+            ZR = block_inner(Ra, Z, ka)
+            restart = False
+
+        Q = _apply(matvec, P, ka)
+        alfa = _solve(block_inner(P, Q, ka), ZR)
+        Xa = Xa + block_combine(P, alfa)
+        Ra = Ra - block_combine(Q, alfa)
+        niter += 1
+
+        rn = np.sqrt(np.maximum(_segment_sums(Ra * Ra, n), 0))
+        if verbose: print(f'{niter:>10} {ka:>10} {rn.max():>10.2e}')
+        _record(niter, rn.max())
+
+        done = (rn < tol)
+        if done.any():
+            # finished columns leave the block, the rest restart
+            fin = np.flatnonzero(done)
+            X[_columns(cols[fin], n)] = Xa[_columns(fin, n)]
+            istop[cols[fin]] = np.where(rn[fin] < EPS, 2, 3)
+            niters[cols[fin]] = niter
+            rnorm[cols[fin]] = rn[fin]
+            keep = np.flatnonzero(~done)
+            cols, rn = cols[keep], rn[keep]
+            if cols.size > 0:
+                idx = _columns(keep, n)
+                Xa, Ra = Xa[idx], Ra[idx]
+            restart = True
+            continue
+
+        Z = _apply(precon, Ra, ka)
+        ZR_new = block_inner(Ra, Z, ka)
+        beta = _solve(ZR, ZR_new)
+        P = Z + block_combine(P, beta)
+        ZR = ZR_new
+
+    if cols.size > 0:
+        X[_columns(cols, n)] = Xa
+        niters[cols] = niter
+        rnorm[cols] = rn
+
+    if verbose:
+        print('\nExit Block Conjugate Gradient Solver.\n')
+        print(f' converged = {(istop < 4).sum()} / {k}\n'
+              f'     niter = {niter}\n'
+              f' max rnorm = {rnorm.max():0.3e}\n')
+
+    return (X, istop, niters, rnorm)
@@ -1,17 +1,29 @@
 #!/usr/bin/env python3
-"""Iterative Conjugate Gradients Method solver sparse Ax = b."""
-__all__ = ['cg']
+"""Iterative Conjugate Gradients Method solver sparse Ax = b.
 
+`cg` is the textbook method with three global reductions per iteration.
+`pipelined_cg` and `sstep_cg` rearrange the recurrences so that the inner
+products of an iteration (or of s iterations) are computed together by one
+`batched_inner` reduction. This matters when reduction latency, not the
+matvec, dominates an iteration.
+"""
+__all__ = ['cg', 'pipelined_cg', 'sstep_cg']
 
-from typing import Optional, Tuple
+
+from typing import Callable, Optional, Tuple
 
 import numpy as np
 
 import arkouda as ak
 
-from aksolve.util import eye, EPS, inner, norm, Operator
+from aksolve.util import (
+    _combine, _gram, _gram_plan, _STOP_STATUS, batched_inner, eye, EPS,
+    inner, norm, Operator
+)
+from aksolve.telemetry import _record, _tracked, SolverHistory
 
 
+@_tracked
 def cg(
     matvec: Operator,
     b: ak.pdarray,
@@ -21,6 +33,8 @@ def cg(
     tol: float = 1.0e-6,
     irestart: Optional[int] = None,
     verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
 ) -> Tuple[ak.pdarray, int, int, float]:
     """
     Solve Ax = b by conjugate gradients.
@@ -47,6 +61,10 @@ def cg(
         iterations between exact residual recalculation
     verbose : bool (default False)
         print a summary of iterations
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
 
     Return
     ------
@@ -66,13 +84,6 @@ def cg(
 
     https://en.wikipedia.org/wiki/Conjugate_gradient_method
     """
-    stop_status = {
-        0 : 'RHS is zero vector. x = 0.',
-        1 : 'lucky guess, x = x_start.',
-        2 : 'converged within machine precision',
-        3 : 'converged within specified tolerance',
-        4 : 'iteration limit reached. not converged'}
-
     n = b.size
     if irestart is None: irestart = int(np.log2(n))
     if verbose:
@@ -86,7 +97,7 @@ def cg(
     rnorm = 0.0 
 
     if norm(b) < EPS:
-        if verbose: print(f'exiting: {stop_status[istop]}')
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
         return (b, istop, niter, rnorm)
 
     x = ak.zeros(n)
@@ -99,7 +110,7 @@ def cg(
 
     if rnorm < EPS:
         istop = 1
-        if verbose: print(f'exiting: {stop_status[istop]}')
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
         return (x, istop, niter, rnorm)
 
     if verbose:
@@ -124,6 +135,7 @@ def cg(
         niter += 1
 
         if verbose: print(f'{niter:>10} {rnorm:>10.2e}')
+        _record(niter, rnorm)
 
     if niter >= max_iter : istop = 4
     if rnorm < tol       : istop = 3
@@ -131,10 +143,309 @@ def cg(
 
     if verbose:
         print('\nExit Conjugate Gradient Solver.\n')
-        print(f'Status: {stop_status[istop]}')
+        print(f'Status: {_STOP_STATUS[istop]}')
         print(f' niter = {niter}\n'
               f' rnorm = {rnorm:0.3e}\n')
 
     return (x, istop, niter, rnorm)
 
 
+@_tracked
+def pipelined_cg(
+    matvec: Operator,
+    b: ak.pdarray,
+    x_start: Optional[ak.pdarray] = None,
+    precon: Operator = eye,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+) -> Tuple[ak.pdarray, int, int, float]:
+    """
+    Solve Ax = b by pipelined conjugate gradients.
+
+    Mathematically equivalent to `cg`, but the recurrences carry A @ r and
+    its preconditioned versions so that the three inner products of an
+    iteration are independent and computed in one reduction. The matvec and
+    preconditioner of an iteration do not depend on that reduction. Rounding
+    errors grow a little faster than in `cg`, so very tight tolerances may
+    take a few more iterations.
+
+    A must be a symmetric, positive-definite matrix.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y
+    b : ak.pdarray
+        right hand side of desired equation
+    x_start : { ak.pdarray | None }
+        initial guess at solution
+    precon : Operator (default `eye`)
+        preconditioner for A.  This should approximate the inverse of A.
+    max_iter : int (default 100)
+        number of iterations to perform
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norm
+    verbose : bool (default False)
+        print a summary of iterations and reductions
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+
+    Return
+    ------
+    x : ak.pdarray
+        computed solution
+    istop : int
+        reason for termination (istop == 4 --> not converged)
+    niter : int
+        number of iterations
+    rnorm : float
+        norm of final residual vector
+
+    References
+    ----------
+    Hiding global synchronization latency in the preconditioned Conjugate
+        Gradient algorithm. P. Ghysels and W. Vanroose. Parallel Computing,
+        Volume 40, Issue 7, 2014, pp. 224-238.
+    """
+    n = b.size
+    if verbose:
+        print('\nEnter Pipelined Conjugate Gradient Solver.\n')
+        print(f"            n = {n}\n"
+              f"     max_iter = {max_iter}\n"
+              f"    tolerance = {tol}\n")
+
+    istop = niter = 0
+    rnorm = 0.0
+
+    if norm(b) < EPS:
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (b, istop, niter, rnorm)
+
+    x = ak.zeros(n)
+    if x_start is not None:
+        x[:] = x_start[:]
+    r = b - matvec(x)
+    u = precon(r)
+    w = matvec(u)
+
+    if verbose:
+        columns = ['niter', 'rnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    reductions = 1  # norm(b)
+    while True:
+        gamma, delta, rr = batched_inner([r, w, r], [u, u, r])
+        reductions += 1
+        rnorm = np.sqrt(max(rr, 0.0))
+        if niter > 0:
+            if verbose: print(f'{niter:>10} {rnorm:>10.2e}')
+            _record(niter, rnorm)
+        if niter == 0 and rnorm < EPS:
+            istop = 1
+            if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+            return (x, istop, niter, rnorm)
+        if niter >= max_iter or rnorm < tol or rnorm < EPS:
+            break
+
+        m = precon(w)
+        Am = matvec(m)
+        if niter == 0:
+            alfa = gamma / delta
+            z, q, s, p = Am, m, w, u
+        else:
+            beta = gamma / gamma_old
+            alfa = gamma / (delta - beta * gamma / alfa_old)
+            z = Am + beta * z
+            q = m + beta * q
+            s = w + beta * s
+            p = u + beta * p
+
+        x = x + alfa * p
+        r = r - alfa * s
+        u = u - alfa * q
+        w = w - alfa * z
+        gamma_old, alfa_old = gamma, alfa
+        niter += 1
+
+    if niter >= max_iter : istop = 4
+    if rnorm < tol       : istop = 3
+    if rnorm < EPS       : istop = 2
+
+    if verbose:
+        print('\nExit Pipelined Conjugate Gradient Solver.\n')
+        print(f'Status: {_STOP_STATUS[istop]}')
+        print(f' niter = {niter}\n'
+              f' rnorm = {rnorm:0.3e}\n'
+              f' reductions = {reductions} (cg: {3 * niter + 3})\n')
+
+    return (x, istop, niter, rnorm)
+
+
+@_tracked
+def sstep_cg(
+    matvec: Operator,
+    b: ak.pdarray,
+    x_start: Optional[ak.pdarray] = None,
+    s: int = 4,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+) -> Tuple[ak.pdarray, int, int, float]:
+    """
+    Solve Ax = b by s-step (communication avoiding) conjugate gradients.
+
+    Every outer step builds the Krylov basis
+        Y = [p, Ap, ..., A^s p, r, Ar, ..., A^(s-1) r]
+    and its Gram matrix Y^T Y. The next s CG iterations run on the client in
+    coordinates of Y, and x, r and p are mapped back to vectors at the end.
+    That is one reduction per s iterations instead of three per iteration,
+    at the cost of 2s - 1 matvecs per s iterations. Once the (s + 1)(2s + 1)
+    products of the Gram matrix exceed `GRAM_BUFFER_SIZE` elements, it is
+    summed in s + 1 reductions over 2s + 1 vectors instead, bounding memory
+    to the size of the basis.
+
+    The monomial basis loses accuracy as s grows; s between 2 and 6 is
+    usually safe. A must be a symmetric, positive-definite matrix.
+    Preconditioning is not supported.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y
+    b : ak.pdarray
+        right hand side of desired equation
+    x_start : { ak.pdarray | None }
+        initial guess at solution
+    s : int (default 4)
+        iterations per outer step
+    max_iter : int (default 100)
+        number of iterations to perform
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norm
+    verbose : bool (default False)
+        print a summary of iterations and reductions
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+
+    Return
+    ------
+    x : ak.pdarray
+        computed solution
+    istop : int
+        reason for termination (istop == 4 --> not converged, istop == 5 -->
+        basis too ill-conditioned, try a smaller s)
+    niter : int
+        number of iterations
+    rnorm : float
+        norm of final residual vector
+
+    References
+    ----------
+    s-step iterative methods for symmetric linear systems. A.T. Chronopoulos
+        and C.W. Gear. Journal of Computational and Applied Mathematics,
+        Volume 25, Issue 2, 1989, pp. 153-168.
+
+    Avoiding Communication in Krylov Subspace Methods. Erin Carson. PhD
+        thesis, UC Berkeley, 2015.
+    """
+    if s < 1:
+        raise ValueError(f's must be positive: {s}')
+    n = b.size
+    if verbose:
+        print('\nEnter s-step Conjugate Gradient Solver.\n')
+        print(f"            n = {n}\n"
+              f"            s = {s}\n"
+              f"     max_iter = {max_iter}\n"
+              f"    tolerance = {tol}\n")
+
+    istop = niter = 0
+    rnorm = 0.0
+
+    if norm(b) < EPS:
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (b, istop, niter, rnorm)
+
+    x = ak.zeros(n)
+    if x_start is not None:
+        x[:] = x_start[:]
+    r = b - matvec(x)
+    p = r[:]
+    rnorm = norm(r)
+
+    if rnorm < EPS:
+        istop = 1
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (x, istop, niter, rnorm)
+
+    if verbose:
+        columns = ['niter', 'rnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    # A @ Y[i] = Y[i + 1] inside the p and r blocks of the basis
+    K = 2 * s + 1
+    B = np.zeros((K, K))
+    for j in range(s):
+        B[j + 1, j] = 1
+    for j in range(s - 1):
+        B[s + 2 + j, s + 1 + j] = 1
+
+    reductions = 2  # norm(b), norm(r)
+    breakdown = False
+    while niter < max_iter and rnorm >= tol and rnorm >= EPS and not breakdown:
+        Y = [p]
+        for _ in range(s):
+            Y.append(matvec(Y[-1]))
+        Y.append(r)
+        for _ in range(s - 1):
+            Y.append(matvec(Y[-1]))
+        G = _gram(Y)
+        reductions += len(_gram_plan(K, 1, n))
+
+        xc, pc, rc = np.zeros(K), np.zeros(K), np.zeros(K)
+        pc[0] = rc[s + 1] = 1
+        rr = rc @ G @ rc
+        for _ in range(s):
+            if niter >= max_iter or rr < tol ** 2 or rr < EPS ** 2:
+                break
+            Bp = B @ pc
+            pAp = pc @ G @ Bp
+            if pAp <= 0:
+                breakdown = True
+                break
+            alfa = rr / pAp
+            xc += alfa * pc
+            rc = rc - alfa * Bp
+            rr, rr_old = rc @ G @ rc, rr
+            pc = rc + (rr / rr_old) * pc
+            niter += 1
+
+            if verbose: print(f'{niter:>10} {np.sqrt(max(rr, 0.0)):>10.2e}')
+            _record(niter, np.sqrt(max(rr, 0.0)))
+
+        x = x + _combine(Y, xc)
+        r = _combine(Y, rc)
+        p = _combine(Y, pc)
+        rnorm = np.sqrt(max(rr, 0.0))
+
+    if niter >= max_iter : istop = 4
+    if breakdown         : istop = 5
+    if rnorm < tol       : istop = 3
+    if rnorm < EPS       : istop = 2
+
+    if verbose:
+        print('\nExit s-step Conjugate Gradient Solver.\n')
+        print(f'Status: {_STOP_STATUS[istop]}')
+        print(f' niter = {niter}\n'
+              f' rnorm = {rnorm:0.3e}\n'
+              f' reductions = {reductions} (cg: {3 * niter + 3})\n')
+
+    return (x, istop, niter, rnorm)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Sparse symmetric eigensolvers: thick-restart Lanczos and LOBPCG.
+
+Basis vectors stay on the server as pdarrays. The small dense Rayleigh-Ritz
+problems are solved by NumPy on the client. Eigenvectors are returned, and
+LOBPCG takes its start, as k vectors of size n stacked end to end like the
+right hand sides of `block_cg`, so a previous result is a warm start.
+"""
+__all__ = ['lanczos', 'lobpcg']
+
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+import arkouda as ak
+
+from aksolve.util import (
+    _combine, _gram, _orthogonalize, _STOP_STATUS, batched_inner, eye, EPS,
+    norm, Operator
+)
+from aksolve.telemetry import _record, _tracked, SolverHistory
+
+
+def _stack(X: List[ak.pdarray]) -> ak.pdarray:
+    """k vectors laid end to end."""
+    return ak.concatenate(X, ordered=True) if len(X) > 1 else X[0][:]
+
+
+def _split(X: ak.pdarray, k: int) -> List[ak.pdarray]:
+    """k stacked vectors as a list."""
+    n = X.size // k
+    if X.size != k * n:
+        raise ValueError(f'X must hold {k} vectors of the same size')
+    return [X[j * n:(j + 1) * n] for j in range(k)]
+
+
+def _pick(theta: np.ndarray, k: int, largest: bool) -> np.ndarray:
+    """Positions of the k wanted values of ascending `theta`, best first."""
+    return np.arange(theta.size)[::-1][:k] if largest else np.arange(k)
+
+
+@_tracked
+def lanczos(
+    matvec: Operator,
+    n: int,
+    k: int = 6,
+    largest: bool = True,
+    ncv: Optional[int] = None,
+    max_iter: int = 1000,
+    tol: float = 1.0e-6,
+    v0: Optional[ak.pdarray] = None,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+) -> Tuple[np.ndarray, ak.pdarray, int, int, np.ndarray]:
+    """
+    Find k extreme eigenpairs of a symmetric A by thick-restart Lanczos.
+
+    The Lanczos basis grows to `ncv` vectors with full reorthogonalization
+    (two batched reductions per step). Then the basis is compressed to the
+    best Ritz vectors and the process continues from the Lanczos residual,
+    which keeps the Krylov information of the kept vectors.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y, A symmetric
+    n : int
+        size of the vectors
+    k : int (default 6)
+        number of eigenpairs
+    largest : bool (default True)
+        find the largest (algebraic) eigenvalues, else the smallest
+    ncv : int (optional)
+        maximum basis size, default max(2k + 1, 20) but at most n
+    max_iter : int (default 1000)
+        number of matvecs to perform, at least k + 1
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norms of the Ritz pairs
+    v0 : ak.pdarray (optional)
+        start vector of size n, or stacked vectors of size n (such as the
+        eigenvectors of a previous run) whose sum is the start vector
+    verbose : bool (default False)
+        print the residuals at every restart
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+
+    Return
+    ------
+    w : np.ndarray
+        eigenvalues, best first
+    X : ak.pdarray
+        eigenvectors, k vectors of size n stacked end to end
+    istop : int
+        reason for termination (istop == 4 --> not converged)
+    niter : int
+        number of matvecs
+    rnorm : np.ndarray
+        residual norms norm(Ax - wx) of the eigenpairs
+
+    References
+    ----------
+    Thick-Restart Lanczos Method for Large Symmetric Eigenvalue Problems.
+        Kesheng Wu and Horst Simon. SIAM Journal on Matrix Analysis and
+        Applications, Volume 22, Number 2, 2000.
+    """
+    if ncv is None:
+        ncv = max(2 * k + 1, 20)
+    ncv = min(ncv, n)
+    if not 0 < k < ncv:
+        raise ValueError(f'need 0 < k < ncv <= n: k = {k}, ncv = {ncv}')
+    keep = min(k + (ncv - k) // 2, ncv - 1)
+    if verbose:
+        print('\nEnter Thick-Restart Lanczos Solver.\n')
+        print(f"            n = {n}\n"
+              f"            k = {k}\n"
+              f"          ncv = {ncv}\n"
+              f"     max_iter = {max_iter}\n"
+              f"    tolerance = {tol}\n")
+
+    if v0 is None:
+        v = ak.randint(0, 1, n, dtype='float64', seed=0) - 0.5
+    else:
+        v = _combine(_split(v0, v0.size // n), np.ones(v0.size // n))
+    basis = [v / norm(v)]
+    T = np.zeros((ncv, ncv))
+    start, niter, istop = 0, 0, 4
+
+    if verbose:
+        columns = ['niter', 'max rnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    while True:
+        # expand the basis to ncv vectors, or as far as max_iter allows
+        m = min(ncv, max(start + max_iter - niter, k + 1))
+        for j in range(start, m):
+            w, h, beta = _orthogonalize(basis, matvec(basis[j]))
+            niter += 1
+            T[:j + 1, j] = T[j, :j + 1] = h
+            if beta < EPS * max(np.abs(T[:j + 1, :j + 1]).max(), 1.0):
+                # invariant subspace, continue with a fresh direction
+                w, _, wnorm = _orthogonalize(
+                    basis, ak.randint(0, 1, n, dtype='float64', seed=niter))
+                beta, w = 0.0, w * (1.0 / wnorm)
+            else:
+                w = w / beta
+            if j + 1 < m:
+                T[j + 1, j] = T[j, j + 1] = beta
+                basis.append(w)
+
+        theta, S = np.linalg.eigh(T[:m, :m])
+        resid = np.abs(beta * S[-1])
+        want = _pick(theta, k, largest)
+        rmax = resid[want].max()
+        if verbose: print(f'{niter:>10} {rmax:>10.2e}')
+        _record(niter, rmax)
+        if rmax < tol:
+            istop = 3
+            break
+        if niter >= max_iter:
+            break
+
+        # thick restart: keep the best Ritz vectors plus the residual
+        kept = _pick(theta, keep, largest)
+        basis = [_combine(basis, S[:, i]) for i in kept] + [w]
+        T = np.zeros((ncv, ncv))
+        T[np.arange(keep), np.arange(keep)] = theta[kept]
+        start = keep
+
+    X = _stack([_combine(basis, S[:, i]) for i in want])
+
+    if verbose:
+        print('\nExit Thick-Restart Lanczos Solver.\n')
+        print(f'Status: {_STOP_STATUS[istop]}')
+        print(f'     niter = {niter}\n'
+              f' max rnorm = {resid[want].max():0.3e}\n')
+
+    return (theta[want], X, istop, niter, resid[want])
+
+
+def _rayleigh_ritz(
+    S: List[ak.pdarray],
+    AS: List[ak.pdarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Ritz values and coefficients of span(S), dropping dependent vectors."""
+    K = len(S)
+    GB, GA = _gram(S, AS)   # both Gram matrices in the same reductions
+    s, U = np.linalg.eigh(GB)
+    ok = s > s.max() * EPS * K * 10
+    Q = U[:, ok] / np.sqrt(s[ok])
+    theta, Y = np.linalg.eigh(Q.T @ GA @ Q)
+    return theta, Q @ Y
+
+
+@_tracked
+def lobpcg(
+    matvec: Operator,
+    X: ak.pdarray,
+    k: int,
+    precon: Operator = eye,
+    largest: bool = False,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+) -> Tuple[np.ndarray, ak.pdarray, int, int, np.ndarray]:
+    """
+    Find k extreme eigenpairs of a symmetric A by LOBPCG.
+
+    Each iteration applies A to the block of k preconditioned residuals and
+    performs Rayleigh-Ritz on the span of the current vectors, the residuals
+    and the previous directions. A good preconditioner (`amg_preconditioner`
+    for Laplacians) speeds up the smallest eigenpairs a lot.
+
+    The Rayleigh-Ritz step needs the Gram matrices of K = 3k vectors. They
+    take one reduction while their K(K + 1) products fit `GRAM_BUFFER_SIZE`
+    elements, and otherwise 1 + K // 2 reductions over a buffer of 2K
+    vectors. Memory stays a small multiple of the k * n block, at the cost
+    of more round trips per iteration on large graphs.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y, A symmetric
+    X : ak.pdarray
+        k start vectors of size n stacked end to end, e.g. random or the
+        eigenvectors of a previous run (warm start)
+    k : int
+        number of eigenpairs
+    precon : Operator (default `eye`)
+        preconditioner applied to the residuals, approximating A^-1
+    largest : bool (default False)
+        find the largest (algebraic) eigenvalues, else the smallest
+    max_iter : int (default 100)
+        number of iterations to perform
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norms of the Ritz pairs
+    verbose : bool (default False)
+        print a summary of iterations
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+
+    Return
+    ------
+    w : np.ndarray
+        eigenvalues, best first
+    X : ak.pdarray
+        eigenvectors, k vectors of size n stacked end to end
+    istop : int
+        reason for termination (istop == 4 --> not converged)
+    niter : int
+        number of iterations
+    rnorm : np.ndarray
+        residual norms norm(Ax - wx) of the eigenpairs
+
+    References
+    ----------
+    Toward the Optimal Preconditioned Eigensolver: Locally Optimal Block
+        Preconditioned Conjugate Gradient Method. Andrew V. Knyazev. SIAM
+        Journal on Scientific Computing, Volume 23, Number 2, 2001.
+    """
+    Xs = _split(X, k)
+    n = Xs[0].size
+    if verbose:
+        print('\nEnter LOBPCG Solver.\n')
+        print(f"            n = {n}\n"
+              f"            k = {k}\n"
+              f"     max_iter = {max_iter}\n"
+              f"    tolerance = {tol}\n")
+
+    AXs = [matvec(x) for x in Xs]
+    theta, C = _rayleigh_ritz(Xs, AXs)
+    want = _pick(theta, k, largest)
+    Xs = [_combine(Xs, C[:, i]) for i in want]
+    AXs = [_combine(AXs, C[:, i]) for i in want]
+    lam = theta[want]
+    P, AP = [], []
+    niter, istop = 0, 4
+
+    if verbose:
+        columns = ['niter', 'max rnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    while True:
+        Rs = [ax - l * x for ax, x, l in zip(AXs, Xs, lam)]
+        resid = np.sqrt(np.maximum(batched_inner(Rs, Rs), 0))
+        if verbose: print(f'{niter:>10} {resid.max():>10.2e}')
+        _record(niter, resid.max())
+        if resid.max() < tol:
+            istop = 3
+            break
+        if niter >= max_iter:
+            break
+
+        W = [precon(r) for r in Rs]
+        AW = [matvec(w) for w in W]
+        S, AS = Xs + W + P, AXs + AW + AP
+        theta, C = _rayleigh_ritz(S, AS)
+        want = _pick(theta, k, largest)
+        lam = theta[want]
+        # new directions are the parts outside the current vectors
+        P = [_combine(S[k:], C[k:, i]) for i in want]
+        AP = [_combine(AS[k:], C[k:, i]) for i in want]
+        Xs = [_combine(Xs, C[:k, i]) + p for i, p in zip(want, P)]
+        AXs = [_combine(AXs, C[:k, i]) + ap for i, ap in zip(want, AP)]
+        niter += 1
+
+    if verbose:
+        print('\nExit LOBPCG Solver.\n')
+        print(f'Status: {_STOP_STATUS[istop]}')
+        print(f'     niter = {niter}\n'
+              f' max rnorm = {resid.max():0.3e}\n')
+
+    return (lam, _stack(Xs), istop, niter, resid)
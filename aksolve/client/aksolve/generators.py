@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Sparse test matrices in COO format."""
+__all__ = ['grid_laplacian']
+
+
+from typing import Tuple
+
+import arkouda as ak
+
+
+def grid_laplacian(
+    m: int,
+    shift: float = 0.0
+) -> Tuple[ak.pdarray, ak.pdarray, ak.pdarray]:
+    """
+    COO arrays of the Laplacian of an m x m grid plus shift * I.
+
+    Node (i, j) is numbered i * m + j and linked to its horizontal and
+    vertical neighbors. Rows hold the edges first, then the diagonal.
+
+    Parameters
+    ----------
+    m : int
+        grid side, the matrix is n x n with n = m * m
+    shift : float (default 0.0)
+        added to the diagonal. A positive shift makes the matrix
+        positive-definite
+
+    Return
+    ------
+    R : ak.pdarray[int64]
+        row indices
+    C : ak.pdarray[int64]
+        column indices
+    V : ak.pdarray[float64]
+        values
+    """
+    n = m * m
+    node = ak.arange(n)
+    i, j = node // m, node % m
+    right, down = node[j < m - 1], node[i < m - 1]
+    V_ = ak.concatenate([right, down])
+    U_ = ak.concatenate([right + 1, down + m])
+    R = ak.concatenate([V_, U_, node])
+    C = ak.concatenate([U_, V_, node])
+    deg = ak.zeros(n, 'float64')
+    keys, counts = ak.GroupBy(ak.concatenate([V_, U_])).count()
+    deg[keys] = counts
+    V = ak.concatenate([ak.zeros(2 * V_.size, 'float64') - 1, deg + shift])
+    return R, C, V
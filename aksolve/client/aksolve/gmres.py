@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Restarted Generalized Minimal RESidual solver for nonsymmetric Ax = b.
+
+The Krylov basis stays on the server as at most `restart` + 1 vectors. Each
+new vector is orthogonalized by classical Gram-Schmidt applied twice, and
+both passes compute all their inner products in one `batched_inner`
+reduction. The second pass also returns the squared norm of the vector, so
+an Arnoldi step costs one matvec and two reductions whatever the basis size.
+The small Hessenberg least squares problem lives on the client.
+"""
+__all__ = ['gmres']
+
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+import arkouda as ak
+
+from aksolve.util import (
+    _combine, _orthogonalize, _STOP_STATUS, eye, EPS, norm, Operator
+)
+from aksolve.telemetry import _record, _tracked, SolverHistory
+
+
+@_tracked
+def gmres(
+    matvec: Operator,
+    b: ak.pdarray,
+    x_start: Optional[ak.pdarray] = None,
+    precon: Operator = eye,
+    restart: int = 20,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+) -> Tuple[ak.pdarray, int, int, float]:
+    """
+    Solve Ax = b by restarted GMRES.
+
+    Minimizes norm(b - Ax) over a Krylov space of dimension at most
+    `restart`, then restarts from the improved solution. A can be any
+    nonsingular square matrix. The preconditioner is applied on the right,
+    so the monitored residual is the true residual of Ax = b.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y
+    b : ak.pdarray
+        right hand side of desired equation
+    x_start : { ak.pdarray | None }
+        initial guess at solution
+    precon : Operator (default `eye`)
+        preconditioner for A.  This should approximate the inverse of A.
+    restart : int (default 20)
+        Krylov vectors kept before restarting, bounds server memory at
+        restart + 1 vectors of size n
+    max_iter : int (default 100)
+        total number of iterations (matvecs) to perform
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norm
+    verbose : bool (default False)
+        print a summary of iterations
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+
+    Return
+    ------
+    x : ak.pdarray
+        computed solution
+    istop : int
+        reason for termination (istop == 4 --> not converged)
+    niter : int
+        number of iterations
+    rnorm : float
+        norm of final residual vector
+
+    References
+    ----------
+    GMRES: A Generalized Minimal Residual Algorithm for Solving Nonsymmetric
+        Linear Systems. Youcef Saad and Martin H. Schultz. SIAM Journal on
+        Scientific and Statistical Computing, Volume 7, Number 3, 1986.
+
+    https://en.wikipedia.org/wiki/Generalized_minimal_residual_method
+    """
+    n = b.size
+    if restart < 1:
+        raise ValueError(f'restart must be positive: {restart}')
+    if verbose:
+        print('\nEnter GMRES Solver.\n')
+        print(f"            n = {n}\n"
+              f"      restart = {restart}\n"
+              f"     max_iter = {max_iter}\n"
+              f"    tolerance = {tol}\n")
+
+    istop = niter = 0
+    rnorm = 0.0
+
+    if norm(b) < EPS:
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (b, istop, niter, rnorm)
+
+    x = ak.zeros(n)
+    if x_start is not None:
+        x[:] = x_start[:]
+    r = b - matvec(x)
+    rnorm = norm(r)
+
+    if rnorm < EPS:
+        istop = 1
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (x, istop, niter, rnorm)
+
+    if verbose:
+        columns = ['niter', 'rnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    while niter < max_iter and rnorm >= tol and rnorm >= EPS:
+        basis = [r / rnorm]
+        H = np.zeros((restart + 1, restart))
+        cs, sn = np.zeros(restart), np.zeros(restart)
+        g = np.zeros(restart + 1)
+        g[0] = rnorm
+
+        j = 0
+        while j < restart and niter < max_iter:
+            w, h, hnorm = _orthogonalize(basis, matvec(precon(basis[j])))
+            k = len(basis)
+            H[:k, j] = h
+            H[k, j] = hnorm
+
+            # rotate the new column of H into upper triangular form
+            for i in range(j):
+                H[i, j], H[i + 1, j] = (cs[i] * H[i, j] + sn[i] * H[i + 1, j],
+                                        cs[i] * H[i + 1, j] - sn[i] * H[i, j])
+            d = np.hypot(H[j, j], H[j + 1, j])
+            cs[j], sn[j] = (H[j, j] / d, H[j + 1, j] / d) if d > 0 else (1, 0)
+            H[j, j], H[j + 1, j] = d, 0.0
+            g[j], g[j + 1] = cs[j] * g[j], -sn[j] * g[j]
+
+            rnorm = abs(g[j + 1])
+            niter += 1
+            j += 1
+            if verbose: print(f'{niter:>10} {rnorm:>10.2e}')
+            _record(niter, rnorm)
+
+            if rnorm < tol or hnorm < EPS:
+                break
+            basis.append(w / hnorm)
+
+        y = np.linalg.solve(H[:j, :j], g[:j])
+        x = x + precon(_combine(basis[:j], y))
+        r = b - matvec(x)
+        rnorm = norm(r)
+
+    if niter >= max_iter : istop = 4
+    if rnorm < tol       : istop = 3
+    if rnorm < EPS       : istop = 2
+
+    if verbose:
+        print('\nExit GMRES Solver.\n')
+        print(f'Status: {_STOP_STATUS[istop]}')
+        print(f' niter = {niter}\n'
+              f' rnorm = {rnorm:0.3e}\n')
+
+    return (x, istop, niter, rnorm)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""LSQR solver for sparse least squares min norm(Ax - b).
+
+A may be rectangular. Golub-Kahan bidiagonalization needs products with A
+and A.T, and keeps four vectors on the server. Norm estimates of A, the
+residual and A.T times the residual come from scalar recurrences, so an
+iteration has only the two normalizations as reductions.
+"""
+__all__ = ['lsqr']
+
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+import arkouda as ak
+
+from aksolve.util import _STOP_STATUS, EPS, norm, Operator
+from aksolve.telemetry import _record, _tracked, SolverHistory
+
+
+@_tracked
+def lsqr(
+    matvec: Operator,
+    b: ak.pdarray,
+    rmatvec: Optional[Operator] = None,
+    x_start: Optional[ak.pdarray] = None,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+) -> Tuple[ak.pdarray, int, int, float]:
+    """
+    Solve min norm(Ax - b) by LSQR.
+
+    Mathematically equivalent to conjugate gradients on A.T A x = A.T b, but
+    without forming A.T A and with better numerical properties. Consistent
+    systems stop when the residual is below `tol`, inconsistent ones when
+    norm(A.T r) / (norm(A) norm(r)) is below `tol`.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y of size A.shape[1]
+    b : ak.pdarray
+        right hand side of size A.shape[0]
+    rmatvec : { Operator | None }
+        function returning the product A.T y. Default to `matvec.rmatvec`,
+        available on operators from `matvec_from_coo`
+    x_start : { ak.pdarray | None }
+        initial guess at solution
+    max_iter : int (default 100)
+        number of iterations to perform
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norm, and on the relative norm of
+        A.T r for least squares problems
+    verbose : bool (default False)
+        print a summary of iterations
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+
+    Return
+    ------
+    x : ak.pdarray
+        computed solution
+    istop : int
+        reason for termination (istop == 4 --> not converged, istop == 6 -->
+        least squares solution)
+    niter : int
+        number of iterations
+    rnorm : float
+        estimated norm of final residual vector b - Ax
+
+    References
+    ----------
+    LSQR: An Algorithm for Sparse Linear Equations and Sparse Least Squares.
+        C. C. Paige and M. A. Saunders. ACM Transactions on Mathematical
+        Software, Volume 8, Number 1, 1982.
+    """
+    if rmatvec is None:
+        if not hasattr(matvec, 'rmatvec'):
+            raise ValueError('rmatvec is required unless matvec has rmatvec')
+        rmatvec = matvec.rmatvec
+    if verbose:
+        print('\nEnter LSQR Solver.\n')
+        print(f"            m = {b.size}\n"
+              f"     max_iter = {max_iter}\n"
+              f"    tolerance = {tol}\n")
+
+    istop = niter = 0
+    rnorm = 0.0
+
+    u = b[:]
+    if x_start is not None:
+        u = b - matvec(x_start)
+    beta = norm(u)
+    if x_start is None and beta < EPS:
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (rmatvec(b) * 0.0, istop, niter, rnorm)
+    if beta < EPS:
+        istop, rnorm = 1, beta
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (x_start[:], istop, niter, rnorm)
+
+    u = u / beta
+    v = rmatvec(u)
+    alfa = norm(v)
+    x = ak.zeros(v.size) if x_start is None else x_start[:]
+    rnorm = beta
+    if alfa < EPS:
+        # b - Ax is orthogonal to the range of A already
+        istop = 6 if x_start is None else 1
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (x, istop, niter, rnorm)
+
+    v = v / alfa
+    w = v[:]
+    phibar, rhobar = beta, alfa
+    anorm = 0.0
+    arnorm = alfa * beta
+
+    if verbose:
+        columns = ['niter', 'rnorm', 'arnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    while niter < max_iter:
+        # continue the bidiagonalization
+        u = matvec(v) - alfa * u
+        beta = norm(u)
+        anorm = np.sqrt(anorm ** 2 + alfa ** 2 + beta ** 2)
+        if beta > 0:
+            u = u / beta
+            v = rmatvec(u) - beta * v
+            alfa = norm(v)
+            if alfa > 0:
+                v = v / alfa
+
+        # eliminate the subdiagonal of the bidiagonal matrix
+        rho = np.hypot(rhobar, beta)
+        c, s = rhobar / rho, beta / rho
+        theta, rhobar = s * alfa, -c * alfa
+        phi, phibar = c * phibar, s * phibar
+
+        x = x + (phi / rho) * w
+        w = v - (theta / rho) * w
+        niter += 1
+
+        rnorm = phibar
+        arnorm = alfa * abs(s * phi)
+        if verbose: print(f'{niter:>10} {rnorm:>10.2e} {arnorm:>10.2e}')
+        _record(niter, rnorm)
+
+        if rnorm < tol or beta == 0 or alfa == 0:
+            break
+        if arnorm <= tol * anorm * rnorm:
+            istop = 6
+            break
+
+    if istop != 6:
+        if niter >= max_iter : istop = 4
+        if rnorm < tol       : istop = 3
+        if rnorm < EPS       : istop = 2
+        if alfa == 0 and rnorm >= tol: istop = 6
+
+    if verbose:
+        print('\nExit LSQR Solver.\n')
+        print(f'Status: {_STOP_STATUS[istop]}')
+        print(f'  niter = {niter}\n'
+              f'  rnorm = {rnorm:0.3e}\n'
+              f' arnorm = {arnorm:0.3e}\n')
+
+    return (x, istop, niter, rnorm)
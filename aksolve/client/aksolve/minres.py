@@ -3,15 +3,17 @@
 __all__ = ['minres']
 
 
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 import numpy as np
 
 import arkouda as ak
 
 from aksolve.util import eye, EPS, FMAX, inner, norm, Operator
+from aksolve.telemetry import _record, _tracked, SolverHistory
 
 
+@_tracked
 def minres(
     matvec: Operator,
     b: ak.pdarray,
@@ -19,7 +21,9 @@ def minres(
     precon: Operator = eye,
     max_iter: int = 100,
     tol: float = 1.0e-6,
-    verbose: bool = False
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
 ) -> Tuple[ak.pdarray, int, int, float]:
     """
     Use MINimum RESidual iteration to solve Ax=b.
@@ -45,6 +49,10 @@ def minres(
         relative stopping tolerance
     verbose : bool (default False)
         print a summary of iterations
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
 
     Returns
     -------
@@ -264,6 +272,7 @@ def minres(
         if verbose:
             print(f"{niter:10} {x[0]:10.2e} {test1:10.2e} {test2:10.2e}"
                   f"{Anorm:10.2e} {Acond:10.2e} {gbar / Anorm:10.2e}")
+        _record(niter, rnorm)
 
         if istop != 0: break
 
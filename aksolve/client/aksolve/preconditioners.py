@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Preconditioners stronger than the diagonal (Jacobi) one.
+
+All builders return an `Operator` approximating the inverse of A, ready for
+the `precon` argument of the solvers. Each one is symmetric positive-definite
+whenever A is, so they are safe to use with `cg`.
+
+- `chebyshev_preconditioner` needs only products with A, so it parallelizes
+  like the matvec. Its polynomial is fixed, not adaptive, and the extreme
+  eigenvalue is estimated by power iteration if not given.
+- `block_jacobi_preconditioner` inverts the diagonal blocks of A for blocks
+  chosen by the client. Every block is inverted at once by a vectorized
+  Gauss-Jordan elimination on the server.
+- `ssor_preconditioner` performs a symmetric Gauss-Seidel (SSOR) sweep. The
+  rows are colored so that rows of one color never couple, which turns the
+  sequential sweep into one parallel update per color.
+"""
+__all__ = [
+    'block_jacobi_preconditioner',
+    'chebyshev_preconditioner',
+    'multicolor',
+    'ssor_preconditioner',
+]
+
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+import arkouda as ak
+
+from aksolve.util import CooOperator, eye, EPS, norm, Operator
+
+
+def _lmax_estimate(
+    matvec: Operator,
+    precon: Operator,
+    n: int,
+    power_iter: int
+) -> float:
+    """Estimate the largest eigenvalue of precon(A) by power iteration."""
+    y = ak.randint(0, 1, n, dtype='float64', seed=0) + 0.5
+    y = y / norm(y)
+    lmax = 0.0
+    for _ in range(power_iter):
+        z = precon(matvec(y))
+        lmax = norm(z)
+        if lmax < EPS:
+            break
+        y = z / lmax
+    return lmax
+
+
+def chebyshev_preconditioner(
+    matvec: Operator,
+    n: int,
+    degree: int = 4,
+    lmin: Optional[float] = None,
+    lmax: Optional[float] = None,
+    precon: Operator = eye,
+    power_iter: int = 15,
+    ratio: float = 30.0,
+    verbose: bool = False
+) -> Operator:
+    """
+    Create a Chebyshev polynomial preconditioner.
+
+    Applying it runs `degree` steps of Chebyshev iteration for Ay = x from
+    y = 0, i.e. multiplies x by the polynomial in A that best approximates
+    the inverse of A on [lmin, lmax]. The cost is degree - 1 matvecs and no
+    reductions.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y
+    n : int
+        size of the vectors
+    degree : int (default 4)
+        degree of the polynomial
+    lmin : float (optional)
+        lower end of the eigenvalue interval. default to lmax / ratio
+    lmax : float (optional)
+        upper end of the eigenvalue interval. default to 1.1 times a power
+        iteration estimate, costing `power_iter` matvecs and reductions
+    precon : Operator (default `eye`)
+        inner preconditioner M. the polynomial is in MA, e.g. Jacobi-scaled
+        Chebyshev with `diagonal_preconditioner`
+    power_iter : int (default 15)
+        power iterations used to estimate lmax
+    ratio : float (default 30.0)
+        lmax / lmin when lmin is not given
+    verbose : bool (default False)
+        print the eigenvalue interval
+
+    Return
+    ------
+    P : Operator
+        like getting multiplied by an approximate inverse of A
+
+    References
+    ----------
+    Iterative Methods for Sparse Linear Systems. Yousef Saad. Second Edition,
+        SIAM, 2003. Section 12.3.
+    """
+    if degree < 1:
+        raise ValueError(f'degree must be positive: {degree}')
+    if lmax is None:
+        lmax = 1.1 * _lmax_estimate(matvec, precon, n, power_iter)
+    if lmin is None:
+        lmin = lmax / ratio
+    if not 0 < lmin < lmax:
+        raise ValueError(f'invalid eigenvalue interval: [{lmin}, {lmax}]')
+    if verbose:
+        print(f' Chebyshev interval = [{lmin:0.3e}, {lmax:0.3e}]')
+
+    theta, delta = (lmax + lmin) / 2, (lmax - lmin) / 2
+    sigma = theta / delta
+
+    def chebyshev(x: ak.pdarray) -> ak.pdarray:
+        """Chebyshev polynomial preconditioner."""
+        r = x[:]
+        d = precon(r) / theta
+        y = d[:]
+        rho = 1 / sigma
+        for _ in range(degree - 1):
+            r = r - matvec(d)
+            rho_new = 1 / (2 * sigma - rho)
+            d = (rho_new * rho) * d + (2 * rho_new / delta) * precon(r)
+            y = y + d
+            rho = rho_new
+        return y
+
+    return chebyshev
+
+
+def _block_layout(
+    blocks: Union[int, ak.pdarray],
+    n: int
+) -> Tuple[ak.pdarray, ak.pdarray, int, int]:
+    """Dense block number and position in block of every row."""
+    if isinstance(blocks, (int, np.integer)):
+        if blocks < 1:
+            raise ValueError(f'block size must be positive: {blocks}')
+        row = ak.arange(n)
+        b = min(int(blocks), n)
+        return row // b, row % b, -(-n // b), b
+
+    if blocks.size != n:
+        raise ValueError(f'size mismatch: {blocks.size} blocks != {n} rows')
+    g = ak.GroupBy(blocks)
+    _, counts = g.count()
+    blk = g.broadcast(ak.arange(g.ngroups), permute=True)
+    loc = ak.zeros(n, 'int64')
+    loc[g.permutation] = ak.arange(n) - g.broadcast(g.segments, permute=False)
+    return blk, loc, g.ngroups, int(counts.max())
+
+
+def block_jacobi_preconditioner(
+    R: ak.pdarray,
+    C: ak.pdarray,
+    V: ak.pdarray,
+    blocks: Union[int, ak.pdarray],
+    max_block: int = 64
+) -> Operator:
+    """
+    Create a block-Jacobi preconditioner from the diagonal blocks of A.
+
+    The entries of A inside each block are scattered into dense b x b
+    matrices (b the largest block, smaller blocks padded with the identity),
+    all blocks are inverted together by Gauss-Jordan elimination without
+    pivoting, and the inverses are applied as one sparse product. The setup
+    costs b steps over n * b values and is meant for small blocks, such as
+    the nodes of a vertex or the rows of a subdomain.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    V : ak.pdarray
+        values. the diagonal blocks must be nonsingular without pivoting,
+        as for symmetric positive-definite or diagonally dominant A
+    blocks : { int | ak.pdarray }
+        an int b for consecutive blocks of b rows, or the block label of
+        every row (any integers)
+    max_block : int (default 64)
+        largest block size allowed
+
+    Return
+    ------
+    P : CooOperator
+        like getting multiplied by the inverse diagonal blocks of A
+
+    See Also
+    --------
+    diagonal_preconditioner()
+    """
+    n = max(R.max(), C.max()) + 1
+    blk, loc, nb, b = _block_layout(blocks, n)
+    if b > max_block:
+        raise ValueError(f'largest block {b} > max_block = {max_block}')
+
+    # dense blocks, entry (i, j) of block k at (k * b + i) * b + j
+    size = nb * b * b
+    inblock = (blk[R] == blk[C])
+    pos = (blk[R[inblock]] * b + loc[R[inblock]]) * b + loc[C[inblock]]
+    keys, sums = ak.GroupBy(pos).sum(V[inblock])
+    D = ak.zeros(size, 'float64')
+    D[keys] = sums
+
+    # rows of a block past its size are padding with a unit diagonal
+    node = ak.zeros(nb * b, 'int64') - 1
+    node[blk * b + loc] = ak.arange(n)
+    pad = ak.arange(nb * b)[node < 0]
+    D[pad * b + pad % b] = 1.0
+
+    idx = ak.arange(size)
+    base, i, j = idx - idx % (b * b), (idx // b) % b, idx % b
+    for p in range(b):
+        piv = D[base + p * b + p]
+        if (ak.abs(piv) < EPS).any():
+            raise ValueError('singular diagonal block, pivoting required')
+        row, col = D[base + p * b + j], D[base + i * b + p]
+        D = ak.where(i == p, row / piv, D - col * row / piv)
+        D = ak.where(j == p, -col / piv, D)
+        D = ak.where((i == p) & (j == p), 1 / piv, D)
+
+    I, J = node[base // b + i], node[base // b + j]
+    keep = (I >= 0) & (J >= 0)
+    return CooOperator(I[keep], J[keep], D[keep], shape=(n, n))
+
+
+def multicolor(
+    R: ak.pdarray,
+    C: ak.pdarray,
+    n: Optional[int] = None,
+    seed: int = 0
+) -> Tuple[int, ak.pdarray]:
+    """
+    Color the rows of A so that rows of the same color are not coupled.
+
+    Jones-Plassmann coloring: every round, the uncolored rows with a higher
+    random priority than all their uncolored neighbors form an independent
+    set and get the next color.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    n : int (optional)
+        number of rows. default to max value in R, C plus 1
+    seed : int (default 0)
+        seed of the random priorities
+
+    Return
+    ------
+    k : int
+        number of colors
+    colors : ak.pdarray[int64]
+        color of each row, 0..k-1
+    """
+    if n is None:
+        n = max(R.max(), C.max()) + 1
+    off = (R != C)
+    r, c = R[off], C[off]
+    prio = ak.zeros(n, 'int64')
+    prio[ak.argsort(ak.randint(0, 1, n, dtype='float64', seed=seed))] = \
+        ak.arange(n)
+
+    colors = ak.zeros(n, 'int64') - 1
+    k = 0
+    while True:
+        todo = (colors < 0)
+        if not todo.any():
+            break
+        beaten = ak.zeros(n, 'bool')
+        e = todo[r] & todo[c] & (prio[c] > prio[r])
+        beaten[r[e]] = True
+        colors[todo & ~beaten] = k
+        k += 1
+    return k, colors
+
+
+def ssor_preconditioner(
+    R: ak.pdarray,
+    C: ak.pdarray,
+    V: ak.pdarray,
+    omega: float = 1.0,
+    sweeps: int = 1,
+    colors: Optional[ak.pdarray] = None,
+    verbose: bool = False
+) -> Operator:
+    """
+    Create a multicolor SSOR (symmetric Gauss-Seidel) preconditioner.
+
+    Applying it performs `sweeps` symmetric sweeps for Ay = x from y = 0:
+    the colors are relaxed in order, then in reverse. Within a color the
+    rows are independent, so each color is one sparse product restricted to
+    its rows and one vector update. Symmetric A gives a symmetric operator.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    V : ak.pdarray
+        values, with a non-zero diagonal
+    omega : float (default 1.0)
+        relaxation parameter in (0, 2). 1.0 is symmetric Gauss-Seidel
+    sweeps : int (default 1)
+        forward and backward sweep pairs per application
+    colors : ak.pdarray[int64] (optional)
+        colors of the rows, 0..k-1, computed by `multicolor` if not given
+    verbose : bool (default False)
+        print the number of colors
+
+    Return
+    ------
+    P : Operator
+        like getting multiplied by the inverse of the SSOR splitting of A
+
+    See Also
+    --------
+    multicolor()
+    diagonal_preconditioner()
+    """
+    if not 0 < omega < 2:
+        raise ValueError(f'omega must be in (0, 2): {omega}')
+    n = max(R.max(), C.max()) + 1
+    diag = ak.zeros(n, 'float64')
+    on = (R == C)
+    keys, sums = ak.GroupBy(R[on]).sum(V[on])
+    diag[keys] = sums
+    if (ak.abs(diag) < EPS).any():
+        raise ValueError('SSOR needs a non-zero diagonal')
+    if colors is None:
+        k, colors = multicolor(R, C, n)
+    else:
+        k = colors.max() + 1
+    if verbose:
+        print(f' SSOR colors = {k}')
+
+    # rows of each color with the matrix restricted to them
+    stages = []
+    color_of = colors[R]
+    for c in range(k):
+        rows = ak.arange(n)[colors == c]
+        if rows.size == 0:
+            continue
+        local = ak.zeros(n, 'int64')
+        local[rows] = ak.arange(rows.size)
+        mine = (color_of == c)
+        A_c = CooOperator(local[R[mine]], C[mine], V[mine], (rows.size, n))
+        stages.append((rows, A_c, omega / diag[rows]))
+    order = stages + stages[::-1]
+
+    def ssor(x: ak.pdarray) -> ak.pdarray:
+        """Multicolor SSOR preconditioner."""
+        y = ak.zeros(n, 'float64')
+        for _ in range(sweeps):
+            for rows, A_c, w in order:
+                y[rows] = y[rows] + w * (x[rows] - A_c(y))
+        return y
+
+    return ssor
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Iterative refinement around a cheap inner Krylov solve.
+
+The outer loop computes the residual b - Ax with the exact operator in
+float64 and solves for a correction with a loose tolerance, optionally with
+a cheaper approximate operator. Each outer step only has to reduce the
+residual by `inner_tol`, so the inner solver runs short, well conditioned
+solves, and the outer loop restores the accuracy. If refinement stalls, the
+remaining error is removed by one full precision solve. A correction that
+increases the residual is discarded, so the best iterate is returned.
+
+Without an approximate operator the inner solves use A itself, and `refine`
+is just `solver` restarted from the true residual every `inner_tol`.
+"""
+__all__ = ['refine']
+
+
+from typing import Callable, Optional, Tuple
+
+import arkouda as ak
+
+from aksolve.conjugate_gradients import cg
+from aksolve.util import _STOP_STATUS, EPS, norm, Operator
+from aksolve.telemetry import _record, _tracked, SolverHistory
+
+
+@_tracked
+def refine(
+    matvec: Operator,
+    b: ak.pdarray,
+    solver: Callable = cg,
+    x_start: Optional[ak.pdarray] = None,
+    inner_matvec: Optional[Operator] = None,
+    inner_tol: float = 1.0e-2,
+    max_outer: int = 20,
+    stall: float = 0.5,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    verbose: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    history: Optional[SolverHistory] = None,
+    **kwargs
+) -> Tuple[ak.pdarray, int, int, float]:
+    """
+    Solve Ax = b by iterative refinement of a loose inner solve.
+
+    Parameters
+    ----------
+    matvec : Operator
+        function returning the product Ay for a given y, used for the outer
+        residuals
+    b : ak.pdarray
+        right hand side of desired equation
+    solver : Callable (default `cg`)
+        inner solver following the `cg` signature and return contract
+    x_start : { ak.pdarray | None }
+        initial guess at solution
+    inner_matvec : Operator (optional)
+        cheaper approximation of A for the inner solves. The default
+        `matvec` gains nothing from refinement, the inner solves are then
+        restarts of `solver`
+    inner_tol : float (default 1.0e-2)
+        residual reduction asked of each inner solve
+    max_outer : int (default 20)
+        number of refinement steps
+    stall : float (default 0.5)
+        fall back to a full precision solve if a refinement step reduces
+        the residual norm by less than this factor
+    max_iter : int (default 100)
+        iterations of each inner solve and of the fallback solve
+    tol : float (default 1.0e-6)
+        stopping tolerance on the residual norm
+    verbose : bool (default False)
+        print a summary of refinement steps
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) after every iteration
+    history : SolverHistory (optional)
+        filled with residuals, timings and call counts of the run
+    **kwargs
+        further arguments of `solver`, like `precon`
+
+    Return
+    ------
+    x : ak.pdarray
+        computed solution
+    istop : int
+        reason for termination (istop == 4 --> not converged)
+    niter : int
+        total number of inner iterations
+    rnorm : float
+        norm of final residual vector
+
+    References
+    ----------
+    Accelerating scientific computations with mixed precision algorithms.
+        Marc Baboulin et al. Computer Physics Communications, Volume 180,
+        Number 12, 2009.
+    """
+    if inner_matvec is None:
+        inner_matvec = matvec
+    if not 0 < inner_tol < 1 or not 0 < stall < 1:
+        raise ValueError('inner_tol and stall must be in (0, 1)')
+    if verbose:
+        print('\nEnter Iterative Refinement.\n')
+        print(f"            n = {b.size}\n"
+              f"    max_outer = {max_outer}\n"
+              f"    inner_tol = {inner_tol}\n"
+              f"    tolerance = {tol}\n")
+
+    istop = niter = 0
+    rnorm = 0.0
+
+    if norm(b) < EPS:
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (b, istop, niter, rnorm)
+
+    x = ak.zeros(b.size)
+    if x_start is not None:
+        x[:] = x_start[:]
+    r = b - matvec(x)
+    rnorm = norm(r)
+
+    if rnorm < EPS:
+        istop = 1
+        if verbose: print(f'exiting: {_STOP_STATUS[istop]}')
+        return (x, istop, niter, rnorm)
+
+    if verbose:
+        columns = ['outer', 'niter', 'rnorm']
+        print(' '.join(f'{c:>10}' for c in columns))
+
+    outer, stalled = 0, False
+    while outer < max_outer and rnorm >= tol and rnorm >= EPS:
+        d, _, it, _ = solver(inner_matvec, r, max_iter=max_iter,
+                             tol=max(inner_tol * rnorm, tol / 2), **kwargs)
+        y = x + d
+        r_y = b - matvec(y)
+        ynorm = norm(r_y)
+        niter += it
+        outer += 1
+        if verbose: print(f'{outer:>10} {niter:>10} {ynorm:>10.2e}')
+        _record(niter, ynorm)
+        if ynorm > stall * rnorm:
+            stalled = True
+            if ynorm < rnorm:
+                x, r, rnorm = y, r_y, ynorm
+            break
+        x, r, rnorm = y, r_y, ynorm
+
+    if stalled and rnorm >= tol:
+        if verbose: print('refinement stalled, full precision solve')
+        y, _, it, ynorm = solver(matvec, b, x_start=x, max_iter=max_iter,
+                                 tol=tol, **kwargs)
+        niter += it
+        if ynorm < rnorm:
+            x, rnorm = y, ynorm
+
+    if rnorm >= tol      : istop = 4
+    if rnorm < tol       : istop = 3
+    if rnorm < EPS       : istop = 2
+
+    if verbose:
+        print('\nExit Iterative Refinement.\n')
+        print(f'Status: {_STOP_STATUS[istop]}')
+        print(f' niter = {niter}\n'
+              f' rnorm = {rnorm:0.3e}\n')
+
+    return (x, istop, niter, rnorm)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Sparse matrix-vector products over arbitrary semirings.
+
+Many graph algorithms are the same gather, multiply, segmented-reduce pattern
+with a different pair of operations: PageRank and eigenvector centrality use
+(+, *), breadth first search uses (or, and), shortest paths use (min, +) and
+connected components use (min, select2nd). `SpMV` sorts a COO matrix once and
+reuses the row (and, when needed, column) segments for every product.
+"""
+__all__ = [
+    'MIN_PLUS',
+    'MIN_SELECT2ND',
+    'OR_AND',
+    'PLUS_TIMES',
+    'Semiring',
+    'SpMV',
+]
+
+
+from typing import Callable, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+import arkouda as ak
+
+
+class Semiring(NamedTuple):
+    """
+    A pair of (add, multiply) operations used in a matrix-vector product.
+
+    Attributes
+    ----------
+    name : str
+        label for display
+    add : str
+        name of the GroupBy aggregation reducing products in a row
+        ('sum', 'min', 'max', 'any', 'all')
+    multiply : Callable[[Optional[ak.pdarray], ak.pdarray], ak.pdarray]
+        combines matrix values (None for a pattern matrix) with gathered
+        vector entries
+    zero : { float | bool }
+        additive identity, the value of rows without entries. Must also
+        annihilate `multiply` so that zero vector entries can be skipped.
+    """
+    name: str
+    add: str
+    multiply: Callable[[Optional[ak.pdarray], ak.pdarray], ak.pdarray]
+    zero: Union[float, bool]
+
+
+PLUS_TIMES = Semiring(
+    'plus_times', 'sum', lambda a, x: x if a is None else a * x, 0)
+# use float vectors with MIN_PLUS so that inf + a stays inf
+MIN_PLUS = Semiring(
+    'min_plus', 'min', lambda a, x: x + 1 if a is None else a + x, np.inf)
+OR_AND = Semiring(
+    'or_and', 'any', lambda a, x: x if a is None else x & (a != 0), False)
+MIN_SELECT2ND = Semiring(
+    'min_select2nd', 'min', lambda a, x: x, np.inf)
+
+
+def _zero(semiring: Semiring, dtype: np.dtype) -> Union[int, float, bool]:
+    """Additive identity of `semiring` represented in `dtype`."""
+    if np.isinf(semiring.zero) and np.issubdtype(dtype, np.integer):
+        return np.iinfo(np.int64).max
+    return semiring.zero
+
+
+def _expand_segments(starts: ak.pdarray, lengths: ak.pdarray) -> ak.pdarray:
+    """Concatenate the ranges [start, start + length) for each segment."""
+    keep = (lengths > 0)
+    starts, lengths = starts[keep], lengths[keep]
+    size = lengths.sum()
+    if size == 0:
+        return ak.zeros(0, 'int64')
+    offsets = ak.cumsum(lengths) - lengths
+    return ak.arange(size) + ak.broadcast(offsets, starts - offsets, size)
+
+
+class SpMV:
+    """
+    Sparse matrix-vector multiplication over a semiring.
+
+    The COO entries are sorted by row once, so every product is a gather,
+    an elementwise multiply and a segmented reduction over precomputed
+    segments. Products restricted by a mask or a sparse input vector reuse
+    the sorted order instead of sorting again.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    V : ak.pdarray (optional)
+        values (pattern matrix of ones if None)
+    shape : (int, int) Optional
+        number of (rows, columns) in matrix. default to square matrix based on
+        max value in R, C.
+
+    Attributes
+    ----------
+    shape : (int, int)
+        number of (rows, columns)
+    nnz : int
+        number of stored entries
+    row_counts : ak.pdarray[int64]
+        number of entries in each row
+    row_starts : ak.pdarray[int64]
+        position of the first entry of each row in the sorted entries
+
+    Examples
+    --------
+    >>> A = SpMV(V, U)                        # adjacency matrix of a graph
+    >>> y = A(x)                              # y = A @ x
+    >>> f = A(g, MIN_SELECT2ND)               # minimum label of neighbors
+    >>> y = A(frontier, OR_AND, mask=~seen)   # next BFS frontier
+    """
+
+    sparse_ratio = 0.1  # sparse=None: sparse input path below this fraction
+
+    def __init__(
+        self,
+        R: ak.pdarray,
+        C: ak.pdarray,
+        V: Optional[ak.pdarray] = None,
+        shape: Optional[Tuple[int, int]] = None
+    ):
+        if R.size != C.size or (V is not None and V.size != R.size):
+            raise ValueError(f"R, C and V must be the same size")
+        if R.size > 0 and (R.min() < 0 or C.min() < 0):
+            raise ValueError(f"row and column indices must be non-negative")
+
+        if shape is not None:
+            if R.size > 0 and (R.max() >= shape[0] or C.max() >= shape[1]):
+                raise ValueError(f"bad shape: ({R.max()},{C.max()}) >= {shape}")
+        elif R.size > 0:
+            shape = (max(R.max(), C.max()) + 1,) * 2
+        else:
+            shape = (0, 0)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.nnz = R.size
+
+        if not R.is_sorted():
+            perm = ak.coargsort([R, C])
+            R, C = R[perm], C[perm]
+            V = V[perm] if V is not None else None
+        self.rows, self.cols, self.vals = R, C, V
+
+        self._gr = ak.GroupBy(R, assume_sorted=True) if R.size > 0 else None
+        self.row_counts = ak.zeros(self.shape[0], 'int64')
+        if self._gr is not None:
+            rows, counts = self._gr.count()
+            self.row_counts[rows] = counts
+        self.row_starts = ak.cumsum(self.row_counts) - self.row_counts
+
+        # column segments are only needed by the sparse input path
+        self._col_perm = None
+        self._col_starts = None
+        self._col_counts = None
+
+    def _column_segments(self):
+        """Sort entries by column, once, for the sparse input path."""
+        if self._col_perm is None:
+            perm = ak.argsort(self.cols)
+            g = ak.GroupBy(self.cols[perm], assume_sorted=True)
+            cols, counts = g.count()
+            self._col_starts = ak.zeros(self.shape[1], 'int64')
+            self._col_counts = ak.zeros(self.shape[1], 'int64')
+            self._col_starts[cols] = g.segments
+            self._col_counts[cols] = counts
+            self._col_perm = perm
+
+    def select(
+        self,
+        active: Optional[ak.pdarray] = None,
+        mask: Optional[ak.pdarray] = None,
+        sparse: Optional[bool] = False
+    ) -> Optional[ak.pdarray]:
+        """
+        Positions of entries in `active` columns and `mask` rows.
+
+        Parameters
+        ----------
+        active : ak.pdarray[bool] (optional)
+            columns to keep, all if None
+        mask : ak.pdarray[bool] (optional)
+            rows to keep, all if None
+        sparse : bool (default False)
+            expand the column segments of `active` columns instead of testing
+            every entry. if None, used when fewer than `sparse_ratio` of
+            columns are active, at the cost of counting them.
+
+        Return
+        ------
+        entries : { ak.pdarray[int64] | None }
+            selected entries in row-sorted order, None if all are selected
+        """
+        n, m = self.shape
+        entries = None
+        if active is not None:
+            if sparse is None:
+                sparse = active.sum() < self.sparse_ratio * m
+            if sparse:
+                self._column_segments()
+                cols = ak.arange(m)[active]
+                idx = _expand_segments(self._col_starts[cols],
+                                       self._col_counts[cols])
+                entries = self._col_perm[idx]
+                # subsets of row-sorted entries stay sorted once sorted
+                entries = entries[ak.argsort(entries)]
+            else:
+                entries = ak.arange(self.nnz)[active[self.cols]]
+
+        if mask is not None:
+            if entries is None:
+                entries = ak.arange(self.nnz)[mask[self.rows]]
+            else:
+                entries = entries[mask[self.rows[entries]]]
+
+        return entries
+
+    def row_entries(
+        self,
+        rows: ak.pdarray
+    ) -> Tuple[ak.pdarray, ak.pdarray]:
+        """
+        Entries of every row in `rows`, which may repeat.
+
+        Return
+        ------
+        entries : ak.pdarray[int64]
+            positions of the entries, row by row in the order of `rows`
+        item : ak.pdarray[int64]
+            index into `rows` of the row each entry belongs to
+        """
+        counts = self.row_counts[rows]
+        keep = (counts > 0)
+        entries = _expand_segments(self.row_starts[rows], counts)
+        if entries.size == 0:
+            return entries, ak.zeros(0, 'int64')
+        lengths = counts[keep]
+        offsets = ak.cumsum(lengths) - lengths
+        item = ak.broadcast(offsets, ak.arange(rows.size)[keep], entries.size)
+        return entries, item
+
+    def gather(
+        self,
+        entries: Optional[ak.pdarray] = None
+    ) -> Tuple[Optional[ak.GroupBy], ak.pdarray, ak.pdarray, Optional[ak.pdarray]]:
+        """
+        GroupBy over the rows of `entries` with their rows, columns and values.
+
+        The GroupBy of all entries is cached; subsets reuse the sorted order
+        so no sort is needed. The GroupBy is None if no entries are selected.
+        """
+        if entries is None:
+            return self._gr, self.rows, self.cols, self.vals
+        rows, cols = self.rows[entries], self.cols[entries]
+        vals = self.vals[entries] if self.vals is not None else None
+        g = ak.GroupBy(rows, assume_sorted=True) if entries.size > 0 else None
+        return g, rows, cols, vals
+
+    def __call__(
+        self,
+        x: ak.pdarray,
+        semiring: Semiring = PLUS_TIMES,
+        mask: Optional[ak.pdarray] = None,
+        out: Optional[ak.pdarray] = None,
+        sparse: Optional[bool] = False
+    ) -> ak.pdarray:
+        """
+        Compute y = A @ x over `semiring`.
+
+        Parameters
+        ----------
+        x : ak.pdarray
+            input vector, one entry per column
+        semiring : Semiring (default PLUS_TIMES)
+            (add, multiply) pair
+        mask : ak.pdarray[bool] (optional)
+            only compute rows where True, others get the semiring zero
+        out : ak.pdarray (optional)
+            preallocated output of size shape[0], overwritten
+        sparse : bool (default False)
+            only touch entries in columns where x is not the semiring zero.
+            if None, used when fewer than `sparse_ratio` of x are non-zero.
+            The check is one more blocking reduction per call, so pass None
+            only for vectors that may thin out, like BFS frontiers.
+
+        Return
+        ------
+        y : ak.pdarray
+            one entry per row, semiring zero for empty rows
+        """
+        n, m = self.shape
+        if x.size != m:
+            raise ValueError(f"size mismatch: ({n}, {m}) x ({x.size}, 1)")
+        if mask is not None and mask.size != n:
+            raise ValueError(f"mask size mismatch: {mask.size} != {n}")
+
+        active = None
+        if sparse is not False and self.nnz > 0:
+            nonzero = (x != _zero(semiring, x.dtype))
+            if sparse or nonzero.sum() < self.sparse_ratio * m:
+                active = nonzero
+        g, rows, cols, vals = self.gather(self.select(active, mask, sparse=True))
+
+        if g is None:
+            vals = self.vals[:1] if self.vals is not None else None
+            dtype = semiring.multiply(vals, x[:1]).dtype
+            y = out if out is not None else ak.zeros(n, dtype)
+            y[:] = _zero(semiring, y.dtype)
+            return y
+
+        keys, y_rows = g.aggregate(semiring.multiply(vals, x[cols]), semiring.add)
+        y = out if out is not None else ak.zeros(n, y_rows.dtype)
+        y[:] = _zero(semiring, y.dtype)
+        y[keys] = y_rows
+        return y
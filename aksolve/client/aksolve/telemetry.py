@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Structured residual history and timings of solver runs.
+
+Pass `history=SolverHistory()` (or just a `callback`) to a solver to record
+the residual of every iteration and the wall time spent in matvecs,
+preconditioner applications and reductions, with their counts. Everything
+is measured on the client around calls the solver makes anyway, so no
+extra server requests are issued.
+
+Reductions are the blocking round trips of an iteration: each returns
+scalars to the client before the solver can continue. They are counted
+where they happen, in `inner` and the segmented sums behind
+`batched_inner`, `block_inner` and the Gram matrices.
+"""
+__all__ = ['SolverHistory']
+
+
+import inspect
+import json
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+
+# solver runs in progress, innermost last. None marks a nested solver
+# without its own history, whose iterations are not recorded.
+_ACTIVE: List[Optional['SolverHistory']] = []
+
+# arguments of tracked solvers that are timed, and as what
+_OPERATORS = {
+    'matvec': 'matvec',
+    'rmatvec': 'matvec',
+    'inner_matvec': 'matvec',
+    'precon': 'precon',
+}
+
+
+class SolverHistory:
+    """
+    Record of a solver run: residuals, timings and call counts.
+
+    Parameters
+    ----------
+    callback : Callable[[int, float], None] (optional)
+        called with (niter, rnorm) whenever an iteration is recorded
+
+    Attributes
+    ----------
+    solver : str
+        name of the solver that ran
+    niter : List[int]
+        iteration number of each record
+    rnorm : List[float]
+        residual norm of each record (the largest one for block solvers)
+    elapsed : List[float]
+        wall seconds since the start of the run at each record
+    seconds : Dict[str, float]
+        wall seconds spent in 'matvec', 'precon' and 'reduce'
+    calls : Dict[str, int]
+        number of matvecs, preconditioner applications and reductions
+    total_seconds : float
+        wall seconds of the whole run
+
+    Examples
+    --------
+    >>> history = SolverHistory()
+    >>> x, istop, niter, rnorm = cg(matvec, b, history=history)
+    >>> history.calls['reduce'], history.seconds['matvec']
+    >>> history.to_json('cg_run.json')
+    """
+
+    def __init__(self, callback: Optional[Callable[[int, float], None]] = None):
+        self.callback = callback
+        self.solver = None
+        self.niter, self.rnorm, self.elapsed = [], [], []
+        self.seconds = {'matvec': 0.0, 'precon': 0.0, 'reduce': 0.0}
+        self.calls = {'matvec': 0, 'precon': 0, 'reduce': 0}
+        self.total_seconds = 0.0
+        self._t0 = None
+
+    def _add(self, kind: str, seconds: float):
+        self.seconds[kind] += seconds
+        self.calls[kind] += 1
+
+    def wrap(self, op: Callable, kind: str) -> '_TimedOperator':
+        """Time every call of `op` (and of its matmat/rmatvec) as `kind`."""
+        return _TimedOperator(op, kind, self)
+
+    def record(self, niter: int, rnorm: float):
+        """Store the residual of an iteration and call the callback."""
+        rnorm = float(rnorm)
+        self.niter.append(int(niter))
+        self.rnorm.append(rnorm)
+        self.elapsed.append(perf_counter() - self._t0 if self._t0 else 0.0)
+        if self.callback is not None:
+            self.callback(niter, rnorm)
+
+    @property
+    def other_seconds(self) -> float:
+        """Wall seconds outside matvecs, preconditioner and reductions."""
+        return self.total_seconds - sum(self.seconds.values())
+
+    def as_dict(self) -> Dict:
+        """Plain dict of the record, as written by `to_json`."""
+        return {
+            'solver': self.solver,
+            'niter': self.niter,
+            'rnorm': self.rnorm,
+            'elapsed': self.elapsed,
+            'seconds': dict(self.seconds, other=self.other_seconds,
+                            total=self.total_seconds),
+            'calls': dict(self.calls),
+        }
+
+    def to_json(self, path: Optional[str] = None, **kwargs) -> str:
+        """Return the record as JSON, also written to `path` if given."""
+        text = json.dumps(self.as_dict(), **kwargs)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+
+class _TimedOperator:
+    """Operator proxy adding the time of every call to a history."""
+
+    def __init__(self, op: Callable, kind: str, history: SolverHistory):
+        self._op, self._kind, self._history = op, kind, history
+
+    def _timed(self, fn: Callable, *args, **kwargs):
+        t0 = perf_counter()
+        out = fn(*args, **kwargs)
+        self._history._add(self._kind, perf_counter() - t0)
+        return out
+
+    def __call__(self, *args, **kwargs):
+        return self._timed(self._op, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._op, name)
+        if name in ('matvec', 'rmatvec', 'matmat') and callable(attr):
+            return lambda *args, **kwargs: self._timed(attr, *args, **kwargs)
+        return attr
+
+
+def _current() -> Optional[SolverHistory]:
+    """History of the innermost recorded solver run, if any."""
+    for history in reversed(_ACTIVE):
+        if history is not None:
+            return history
+    return None
+
+
+def _record(niter: int, rnorm: float):
+    """Record an iteration of the running solver, if it has a history."""
+    if _ACTIVE and _ACTIVE[-1] is not None:
+        _ACTIVE[-1].record(niter, rnorm)
+
+
+def _reduction(fn: Callable) -> Callable:
+    """Count and time calls of `fn` as reductions of the running solver."""
+    @wraps(fn)
+    def reduction(*args, **kwargs):
+        history = _current()
+        if history is None:
+            return fn(*args, **kwargs)
+        t0 = perf_counter()
+        out = fn(*args, **kwargs)
+        history._add('reduce', perf_counter() - t0)
+        return out
+
+    return reduction
+
+
+def _tracked(solver: Callable) -> Callable:
+    """Give `solver` its `callback` and `history` arguments."""
+    signature = inspect.signature(solver)
+
+    @wraps(solver)
+    def run(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        history = bound.arguments.get('history')
+        callback = bound.arguments.get('callback')
+        if history is None and callback is None:
+            if not _ACTIVE:
+                return solver(*args, **kwargs)
+            _ACTIVE.append(None)
+            try:
+                return solver(*args, **kwargs)
+            finally:
+                _ACTIVE.pop()
+
+        if history is None:
+            history = SolverHistory()
+        if callback is not None:
+            history.callback = callback
+        history.solver = solver.__name__
+        extra = bound.arguments.get('kwargs', {})
+        for name, kind in _OPERATORS.items():
+            for args_ in (bound.arguments, extra):
+                op = args_.get(name)
+                if op is not None and getattr(op, '__name__', '') != 'eye':
+                    args_[name] = history.wrap(op, kind)
+
+        _ACTIVE.append(history)
+        history._t0 = perf_counter()
+        try:
+            return solver(*bound.args, **bound.kwargs)
+        finally:
+            history.total_seconds += perf_counter() - history._t0
+            _ACTIVE.pop()
+
+    return run
@@ -1,30 +1,51 @@
 #!/usr/bin/env python3
 """Functions for helping solve sparse matrix equations."""
 __all__ = [
+    'batched_inner',
+    'block_combine',
+    'block_inner',
+    'CooOperator',
     'diagonal_preconditioner',
     'eye',
     'EPS',
     'FMAX',
+    'GRAM_BUFFER_SIZE',
     'inner',
+    'MATMAT_BUFFER_SIZE',
     'matvec_from_coo',
     'norm',
     'Operator',
 ]
 
 
-from typing import Callable, Optional, Tuple
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 import arkouda as ak
 
+from aksolve.semiring import SpMV
+from aksolve.telemetry import _reduction
+
 
 # floating point arithmetic constants for this platform
 EPS = np.finfo(np.float64).eps
 FMAX = np.finfo(np.float64).max
 Operator = Callable[[ak.pdarray], ak.pdarray]
 
+# reasons for termination, the istop returned by the solvers
+_STOP_STATUS = {
+    0 : 'RHS is zero vector. x = 0.',
+    1 : 'lucky guess, x = x_start.',
+    2 : 'converged within machine precision',
+    3 : 'converged within specified tolerance',
+    4 : 'iteration limit reached. not converged',
+    5 : 'breakdown. try another x_start, a preconditioner or a smaller s',
+    6 : 'least squares solution within specified tolerance'}
+
 
+@_reduction
 def inner(u: ak.pdarray, v: ak.pdarray) -> float:
     """Inner product of two vectors."""
     return ak.sum(u * v)
@@ -35,6 +56,210 @@ def norm(v: ak.pdarray) -> float:
     return np.sqrt(inner(v, v))
 
 
+_SEGMENT_GROUPS = OrderedDict()
+
+
+@_reduction
+def _segment_sums(x: ak.pdarray, n: int) -> np.ndarray:
+    """Sums of the consecutive length-n segments of x, in one reduction."""
+    k = x.size // n
+    if k == 1:
+        return np.array([ak.sum(x)])
+    key = (n, k)
+    if key not in _SEGMENT_GROUPS:
+        _SEGMENT_GROUPS[key] = ak.GroupBy(ak.arange(k * n) // n,
+                                          assume_sorted=True)
+        while len(_SEGMENT_GROUPS) > 4:
+            _SEGMENT_GROUPS.popitem(last=False)
+    _SEGMENT_GROUPS.move_to_end(key)
+    return _SEGMENT_GROUPS[key].sum(x)[1].to_ndarray()
+
+
+def batched_inner(
+    U: Sequence[ak.pdarray],
+    V: Sequence[ak.pdarray]
+) -> np.ndarray:
+    """
+    Inner products (U[i], V[i]) computed with a single reduction.
+
+    The elementwise products are laid end to end and summed segment by
+    segment, so k inner products cost one global reduction and one transfer
+    instead of k of each.
+
+    Parameters
+    ----------
+    U, V : Sequence[ak.pdarray]
+        vectors, all of the same size
+
+    Return
+    ------
+    dots : np.ndarray
+        dots[i] = inner(U[i], V[i])
+    """
+    if len(U) != len(V):
+        raise ValueError(f'size mismatch: {len(U)} != {len(V)} vectors')
+    if len(U) == 0:
+        return np.zeros(0)
+    n = U[0].size
+    if any(u.size != n or v.size != n for u, v in zip(U, V)):
+        raise ValueError('all vectors must be the same size')
+    prods = [u * v for u, v in zip(U, V)]
+    if len(prods) > 1:
+        prods = [ak.concatenate(prods, ordered=True)]
+    return _segment_sums(prods[0], n)
+
+
+def block_inner(X: ak.pdarray, Y: ak.pdarray, k: int) -> np.ndarray:
+    """
+    All inner products G[i, j] = inner(x_i, y_j) of k stacked vectors.
+
+    X and Y hold k vectors of size n end to end. Y rotated by d vectors
+    pairs every x_i with y_{(i + d) % k}, so the k x k matrix takes k
+    multiplies and k reductions over k * n elements, not k^2 of each.
+    """
+    n = X.size // k
+    if X.size != k * n or Y.size != X.size:
+        raise ValueError(f'X and Y must hold {k} vectors of the same size')
+    G = np.zeros((k, k))
+    i = np.arange(k)
+    idx = ak.arange(k * n)
+    for d in range(k):
+        Yd = Y if d == 0 else Y[(idx + d * n) % (k * n)]
+        G[i, (i + d) % k] = _segment_sums(X * Yd, n)
+    return G
+
+
+def block_combine(X: ak.pdarray, C: np.ndarray) -> ak.pdarray:
+    """
+    Linear combinations [x_0, ..., x_{k-1}] @ C of k stacked vectors.
+
+    Column i of the result, sum_j C[j, i] x_j, is stored at block i like X.
+    C has shape (k, l) and the result holds l vectors.
+    """
+    k, l = C.shape
+    n = X.size // k
+    tile = ak.arange(l * n) % n
+    seg = ak.arange(l * n) // n
+    Y = ak.zeros(l * n, 'float64')
+    for j in range(k):
+        if np.any(C[j] != 0):
+            Y += X[tile + j * n] * ak.array(C[j].astype(np.float64))[seg]
+    return Y
+
+
+def _combine(basis: Sequence[ak.pdarray], y: np.ndarray) -> ak.pdarray:
+    """Linear combination sum_i y[i] basis[i], skipping zero coefficients."""
+    out = None
+    for yi, bi in zip(y, basis):
+        if yi != 0:
+            if out is None:
+                out = yi * bi
+            else:
+                out += yi * bi
+    return out if out is not None else ak.zeros(basis[0].size)
+
+
+def _orthogonalize(
+    basis: Sequence[ak.pdarray],
+    w: ak.pdarray
+) -> Tuple[ak.pdarray, np.ndarray, float]:
+    """
+    Orthogonalize w against an orthonormal basis in two reductions.
+
+    Classical Gram-Schmidt applied twice, each pass one `batched_inner`.
+    The second pass also returns the squared norm of w, and the norm after
+    the (small) second correction follows from Pythagoras.
+
+    Return
+    ------
+    w : ak.pdarray
+        w minus its projection onto the basis
+    h : np.ndarray
+        coefficients of the removed projection
+    wnorm : float
+        norm of the returned w
+    """
+    k = len(basis)
+    h1 = batched_inner(basis, [w] * k)
+    w = w - _combine(basis, h1)
+    h2 = batched_inner(list(basis) + [w], [w] * (k + 1))
+    w = w - _combine(basis, h2[:k])
+    wnorm = np.sqrt(max(h2[k] - h2[:k] @ h2[:k], 0.0))
+    return w, h1 + h2[:k], wnorm
+
+
+GRAM_BUFFER_SIZE = 2 ** 25  # elements, 256 MB of float64
+MATMAT_BUFFER_SIZE = 2 ** 25  # stored entries of a CooOperator.matmat block
+
+
+def _gram_plan(K: int, stacks: int, n: int) -> List[List[int]]:
+    """
+    Shifts d of the stacks summed together by each `_gram` reduction.
+
+    Shift d adds (K - d) products per stack. Pairing d with K - d fills a
+    buffer the size of the stacks exactly, so the buffer holds
+    max(stacks * K, GRAM_BUFFER_SIZE // n) vectors and K shifts take
+    between 1 and 1 + K // 2 reductions.
+    """
+    cap = max(stacks * K, GRAM_BUFFER_SIZE // max(n, 1))
+    order = [0]
+    for d in range(1, K // 2 + 1):
+        order += [d] if d == K - d else [d, K - d]
+    chunks, used = [[]], 0
+    for d in order:
+        size = stacks * (K - d)
+        if used + size > cap:
+            chunks.append([])
+            used = 0
+        chunks[-1].append(d)
+        used += size
+    return chunks
+
+
+def _gram(
+    Y: Sequence[ak.pdarray],
+    Z: Optional[Sequence[ak.pdarray]] = None
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Gram matrix G[i, j] = inner(Y[i], Y[j]) in few reductions.
+
+    With the vectors stacked end to end, the stack times itself shifted by d
+    vectors holds the products of every pair (i, i + d), so the whole upper
+    triangle takes len(Y) multiplies. Their K(K + 1)/2 products would need
+    that many vectors of memory in a single reduction, so they are written
+    into a buffer no larger than the stacks (or GRAM_BUFFER_SIZE elements,
+    if larger) and summed whenever it is full; see `_gram_plan`. Small
+    vectors take one reduction, large ones about K/2.
+
+    With Z (e.g. Z[j] = A Y[j], A symmetric) the same reductions also return
+    H[i, j] = inner(Y[i], Z[j]) from its upper triangle, as (G, H).
+    """
+    K, n = len(Y), Y[0].size
+    stacks = [ak.concatenate(X, ordered=True) if K > 1 else X[0]
+              for X in ([Y] if Z is None else [Y, Z])]
+    S = stacks[0]
+    plan = _gram_plan(K, len(stacks), n)
+    size = max(sum(len(stacks) * (K - d) for d in ds) for ds in plan)
+    prods = ak.zeros(size * n, 'float64')
+    Gs = [np.zeros((K, K)) for _ in stacks]
+    for ds in plan:
+        lo = 0
+        for d in ds:
+            for T in stacks:
+                hi = lo + (K - d) * n
+                prods[lo:hi] = S[:(K - d) * n] * T[d * n:]
+                lo = hi
+        # the tail of the buffer keeps stale products, their sums are unused
+        sums = _segment_sums(prods, n)
+        k = 0
+        for d in ds:
+            i = np.arange(K - d)
+            for G in Gs:
+                G[i, i + d] = G[i + d, i] = sums[k:k + K - d]
+                k += K - d
+    return Gs[0] if Z is None else tuple(Gs)
+
+
 def eye(x: ak.pdarray) -> ak.pdarray:
     """Identity operator."""
     return x[:]
@@ -74,6 +299,168 @@ def diagonal_preconditioner(
     return inv_diag
 
 
+class CooOperator:
+    """
+    Matrix-vector multiplication by a COO matrix, prepared once for reuse.
+
+    Entries are sorted by row at construction and kept in that order, so each
+    product is one gather of x, one multiply and one segmented sum with no
+    permutation. When every row has an entry the sums are the output vector
+    and the scatter into a zeroed vector is skipped as well. Pass `out` to
+    reuse an output buffer across iterations.
+
+    Parameters
+    ----------
+    R : ak.pdarray
+        row indices, non-negative integers
+    C : ak.pdarray
+        column indices, non-negative integers
+    V : ak.pdarray (optional)
+        values (pattern matrix of ones if None)
+    shape : (int, int) Optional
+        number of (rows, columns) in matrix. default to square matrix based on
+        max value in R, C.
+
+    Attributes
+    ----------
+    shape : (int, int)
+        number of (rows, columns)
+    nnz : int
+        number of stored entries
+
+    Examples
+    --------
+    >>> A = CooOperator(R, C, V)
+    >>> y = ak.zeros(A.shape[0])
+    >>> for _ in range(k):
+    ...     A.matvec(x, out=y)
+    """
+
+    def __init__(
+        self,
+        R: ak.pdarray,
+        C: ak.pdarray,
+        V: Optional[ak.pdarray] = None,
+        shape: Optional[Tuple[int, int]] = None
+    ):
+        self._A = SpMV(R, C, V, shape)
+        self._AT = None
+        self._blocks = {}
+        self.shape, self.nnz = self._A.shape, self._A.nnz
+
+    @staticmethod
+    def _product(
+        A: SpMV,
+        x: ak.pdarray,
+        out: Optional[ak.pdarray]
+    ) -> ak.pdarray:
+        """y = A @ x with the row segments of A."""
+        n, m = A.shape
+        if x.size != m:
+            raise ValueError(f"size mismatch: ({n}, {m}) x ({x.size}, 1)")
+        if out is not None and out.size != n:
+            raise ValueError(f"out size mismatch: {out.size} != {n}")
+
+        y = out if out is not None else ak.zeros(n, 'float64')
+        g, _, cols, vals = A.gather()
+        if g is None:
+            y[:] = 0
+            return y
+
+        xc = x[cols]
+        keys, sums = g.sum(xc if vals is None else vals * xc)
+        if sums.dtype != y.dtype:
+            sums = ak.cast(sums, y.dtype)
+        if keys.size == n:
+            y[:] = sums
+        else:
+            y[:] = 0
+            y[keys] = sums
+        return y
+
+    def matvec(
+        self,
+        x: ak.pdarray,
+        out: Optional[ak.pdarray] = None
+    ) -> ak.pdarray:
+        """Compute y = A @ x, into `out` if given."""
+        return self._product(self._A, x, out)
+
+    def rmatvec(
+        self,
+        x: ak.pdarray,
+        out: Optional[ak.pdarray] = None
+    ) -> ak.pdarray:
+        """Compute y = A.T @ x, into `out` if given."""
+        if self._AT is None:
+            A = self._A
+            self._AT = SpMV(A.cols, A.rows, A.vals, A.shape[::-1])
+        return self._product(self._AT, x, out)
+
+    def _block(self, k: int) -> SpMV:
+        """Block diagonal matrix with k copies of A, built without sorting."""
+        if k == 1:
+            return self._A
+        if k not in self._blocks:
+            A, (n, m) = self._A, self.shape
+            idx = ak.arange(k * self.nnz)
+            e, blk = idx % self.nnz, idx // self.nnz
+            vals = A.vals[e] if A.vals is not None else None
+            # copies are laid out block after block, so rows stay sorted
+            self._blocks[k] = SpMV(A.rows[e] + blk * n, A.cols[e] + blk * m,
+                                   vals, (k * n, k * m))
+        return self._blocks[k]
+
+    def _widths(self, k: int) -> List[int]:
+        """Split k columns into powers of two of at most the widest block."""
+        widest = max(1, MATMAT_BUFFER_SIZE // max(self.nnz, 1))
+        widest = 1 << (widest.bit_length() - 1)
+        widths = [widest] * (k // widest)
+        k %= widest
+        while k > 0:
+            widths.append(1 << (k.bit_length() - 1))
+            k -= widths[-1]
+        return widths
+
+    def matmat(
+        self,
+        X: ak.pdarray,
+        k: int,
+        out: Optional[ak.pdarray] = None
+    ) -> ak.pdarray:
+        """
+        Compute Y = A @ [x_0, ..., x_{k-1}] for k stacked vectors.
+
+        X holds the columns end to end, x_j = X[j * m:(j + 1) * m], and so
+        does Y. Columns are multiplied in blocks of 2^i, each one gather and
+        one segmented sum against 2^i copies of A laid block diagonally. At
+        most one block is built per power of two and kept for reuse, so a
+        shrinking k (as in `block_cg`) rebuilds nothing. Widths are capped so
+        a block holds at most `MATMAT_BUFFER_SIZE` entries (or one copy of A,
+        if larger), and all blocks together hold less than twice that.
+        """
+        n, m = self.shape
+        if X.size != k * m:
+            raise ValueError(f"size mismatch: ({n}, {m}) x {k} x {X.size}")
+        widths = self._widths(k)
+        if len(widths) == 1:
+            return self._product(self._block(k), X, out)
+
+        Y = out if out is not None else ak.zeros(k * n, 'float64')
+        if Y.size != k * n:
+            raise ValueError(f"out size mismatch: {Y.size} != {k * n}")
+        j = 0
+        for w in widths:
+            Y[j * n:(j + w) * n] = self._product(
+                self._block(w), X[j * m:(j + w) * m], None)
+            j += w
+        return Y
+
+    def __call__(self, x: ak.pdarray) -> ak.pdarray:
+        """Compute y = A @ x in a new vector, usable as an `Operator`."""
+        return self.matvec(x)
+
+
 def matvec_from_coo(
     R: ak.pdarray,
     C: ak.pdarray,
@@ -99,32 +486,13 @@ def matvec_from_coo(
 
     Return
     ------
-    matvec : Operator
-        function calculating y = Ax for arbitrary commensurate x
-    """
-    if R.min() < 0 or C.min() < 0:
-        raise ValueError(f"row and column indices must be non-negative")
-
-    if shape is not None:
-        if R.max() >= shape[0] or C.max() >= shape[1]:
-            raise ValueError(f"bad shape: ({R.max()},{C.max()}) >= {shape}")
-        else:
-            n, m = shape
-    else:
-        n = m = max(R.max(), C.max()) + 1
-
-    if V is None:
-        V = ak.zeros(R.size, dtype='float') + 1
-
-    gr = ak.GroupBy(R)
+    matvec : CooOperator
+        callable calculating y = Ax for arbitrary commensurate x
 
-    def matvec(x: ak.pdarray) -> ak.pdarray:
-        """Compute matrix-vector product, y = Ax."""
-        if x.size != m:
-            raise ValueError(f"size mismatch: ({n}, {m}) x ({x.size}, 1)")
-        y = ak.zeros(n)
-        y[gr.unique_keys] = gr.sum(x[C] * V)[1]
-        return y
-
-    return matvec
+    See Also
+    --------
+    CooOperator
+    SpMV
+    """
+    return CooOperator(R, C, V, shape)
 
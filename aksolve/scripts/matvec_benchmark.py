@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark sparse matrix-vector products: closure vs prepared operator."""
+from time import time
+from statistics import mean, stdev
+import argparse
+
+import arkouda as ak
+import aksolve as aks
+
+
+def closure_matvec(R, C, V, shape):
+    """The original `matvec_from_coo` closure, kept for comparison.
+
+    Every product gathers x[C] * V, sums it by row through the GroupBy and
+    scatters the sums into a new zero vector.
+    """
+    gr = ak.GroupBy(R)
+
+    def matvec(x):
+        y = ak.zeros(shape[0], 'float64')
+        keys, sums = gr.sum(x[C] * V)
+        y[keys] = sums
+        return y
+
+    return matvec
+
+
+def bench(fn, num_trials):
+    """Time `fn` over several trials. Return the times and the last result."""
+    times = []
+    for _ in range(num_trials):
+        t0 = time()
+        out = fn()
+        times.append(time() - t0)
+    return times, out
+
+
+def report(label, times):
+    """Print timing summary."""
+    s = stdev(times) if len(times) > 1 else 0.0
+    print(f"{label:>18}: {mean(times):0.4f} +/- {s:0.4f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('n', type=int, help='number of rows and columns')
+    parser.add_argument('-d', '--density', type=int, default=16,
+                        help='average entries per row')
+    parser.add_argument('-t', '--num_trials', type=int, default=20,
+                        help='number of products for each method')
+    parser.add_argument('-s', '--server', type=str, default='localhost',
+                        help='arkouda server')
+    parser.add_argument('-p', '--port', type=int, default=5555,
+                        help='arkouda server port')
+    args = parser.parse_args()
+
+    ak.connect(args.server, args.port)
+    n, m = args.n, args.n * args.density
+    R = ak.randint(0, n, m)
+    C = ak.randint(0, n, m)
+    V = ak.randint(0, 1, m, dtype='float64')
+    x = ak.randint(0, 1, n, dtype='float64')
+    print(f'n = {n:,}\nnnz = {m:,}\n')
+
+    t0 = time()
+    old = closure_matvec(R, C, V, (n, n))
+    print(f'closure setup: {time() - t0:0.4f} s')
+    t0 = time()
+    A = aks.CooOperator(R, C, V, (n, n))
+    print(f'operator setup: {time() - t0:0.4f} s\n')
+
+    y = ak.zeros(n, 'float64')
+    old_times, y_old = bench(lambda: old(x), args.num_trials)
+    new_times, y_new = bench(lambda: A.matvec(x), args.num_trials)
+    out_times, _ = bench(lambda: A.matvec(x, out=y), args.num_trials)
+    report('closure', old_times)
+    report('CooOperator', new_times)
+    report('CooOperator (out)', out_times)
+    print(f'\nmax |difference| = {ak.abs(y_old - y_new).max():0.3e}')
+
+    ak.clear()
+
+
+if __name__ == '__main__':
+    main()
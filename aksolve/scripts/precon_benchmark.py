@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Benchmark CG preconditioners on a 2D grid Laplacian: iterations and time."""
+from time import time
+import argparse
+
+import arkouda as ak
+import aksolve as aks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('m', type=int, help='grid side, n = m * m')
+    parser.add_argument('--shift', type=float, default=1e-3,
+                        help='diagonal shift making the Laplacian definite')
+    parser.add_argument('--tol', type=float, default=1e-6,
+                        help='residual tolerance')
+    parser.add_argument('--max_iter', type=int, default=10000,
+                        help='iteration limit')
+    parser.add_argument('--degree', type=int, default=4,
+                        help='Chebyshev polynomial degree')
+    parser.add_argument('-s', '--server', type=str, default='localhost',
+                        help='arkouda server')
+    parser.add_argument('-p', '--port', type=int, default=5555,
+                        help='arkouda server port')
+    args = parser.parse_args()
+
+    ak.connect(args.server, args.port)
+    R, C, V = aks.grid_laplacian(args.m, args.shift)
+    A = aks.matvec_from_coo(R, C, V)
+    n = args.m * args.m
+    b = ak.randint(0, 1, n, dtype='float64', seed=1)
+    print(f'n = {n:,}\nnnz = {R.size:,}\n')
+
+    jacobi = aks.diagonal_preconditioner(R, C, V)
+    builders = {
+        'none': lambda: aks.eye,
+        'jacobi': lambda: jacobi,
+        'chebyshev': lambda: aks.chebyshev_preconditioner(
+            A, n, degree=args.degree, precon=jacobi),
+        'block-jacobi': lambda: aks.block_jacobi_preconditioner(
+            R, C, V, blocks=args.m),
+        'ssor': lambda: aks.ssor_preconditioner(R, C, V),
+        'amg': lambda: aks.amg_preconditioner(R, C, V),
+    }
+
+    columns = ['precon', 'setup', 'solve', 'niter', 'rnorm']
+    print(' '.join(f'{c:>12}' for c in columns))
+    for name, build in builders.items():
+        t0 = time()
+        P = build()
+        t1 = time()
+        _, istop, niter, rnorm = aks.cg(A, b, precon=P, tol=args.tol,
+                                        max_iter=args.max_iter)
+        t2 = time()
+        flag = '' if istop < 4 else ' (not converged)'
+        print(f'{name:>12} {t1 - t0:>12.3f} {t2 - t1:>12.3f} '
+              f'{niter:>12} {rnorm:>12.2e}{flag}')
+
+    ak.clear()
+
+
+if __name__ == '__main__':
+    main()
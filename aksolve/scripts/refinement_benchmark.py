@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark iterative refinement against a direct CG solve on a grid Laplacian.
+
+The inner solves of `refine` use a sparsified Laplacian: a random `keep`
+fraction of the grid edges, reweighted by 1 / keep, with the diagonal
+recomputed so it stays definite. Its products touch keep * nnz entries, so
+refinement saves time only if the inner iterations do not grow by more than
+1 / keep. Both are reported, with the entries each operator stores.
+"""
+from time import time
+import argparse
+
+import arkouda as ak
+import aksolve as aks
+
+
+def sparsify(R, C, V, n, keep, shift, seed=2):
+    """COO Laplacian of a random `keep` fraction of the edges of (R, C, V)."""
+    upper = (R < C)
+    r, c, v = R[upper], C[upper], V[upper]
+    pick = ak.randint(0, 1, r.size, dtype='float64', seed=seed) < keep
+    r, c, v = r[pick], c[pick], v[pick] / keep
+    deg = ak.zeros(n, 'float64')
+    keys, sums = ak.GroupBy(ak.concatenate([r, c])).sum(ak.concatenate([v, v]))
+    deg[keys] = -sums
+    node = ak.arange(n)
+    return (ak.concatenate([r, c, node]), ak.concatenate([c, r, node]),
+            ak.concatenate([v, v, deg + shift]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('m', type=int, help='grid side, n = m * m')
+    parser.add_argument('--shift', type=float, default=1e-3,
+                        help='diagonal shift making the Laplacian definite')
+    parser.add_argument('--keep', type=float, default=0.5,
+                        help='fraction of edges kept by the inner operator')
+    parser.add_argument('--tol', type=float, default=1e-10,
+                        help='residual tolerance')
+    parser.add_argument('--inner_tol', type=float, default=1e-2,
+                        help='residual reduction of each inner solve')
+    parser.add_argument('--max_iter', type=int, default=10000,
+                        help='iteration limit')
+    parser.add_argument('-s', '--server', type=str, default='localhost',
+                        help='arkouda server')
+    parser.add_argument('-p', '--port', type=int, default=5555,
+                        help='arkouda server port')
+    args = parser.parse_args()
+
+    ak.connect(args.server, args.port)
+    n = args.m * args.m
+    R, C, V = aks.grid_laplacian(args.m, args.shift)
+    A = aks.matvec_from_coo(R, C, V)
+    P = aks.diagonal_preconditioner(R, C, V)
+    Rs, Cs, Vs = sparsify(R, C, V, n, args.keep, args.shift)
+    As = aks.matvec_from_coo(Rs, Cs, Vs, (n, n))
+    Ps = aks.diagonal_preconditioner(Rs, Cs, Vs)
+    b = ak.randint(0, 1, n, dtype='float64', seed=1)
+    print(f'n = {n:,}\nnnz = {A.nnz:,}\ninner nnz = {As.nnz:,}\n')
+
+    runs = {
+        'cg': (A.nnz, lambda: aks.cg(A, b, precon=P, tol=args.tol,
+                                     max_iter=args.max_iter)),
+        'refine(cg)': (As.nnz, lambda: aks.refine(
+            A, b, inner_matvec=As, precon=Ps, tol=args.tol,
+            inner_tol=args.inner_tol, max_iter=args.max_iter)),
+    }
+
+    columns = ['method', 'nnz', 'time', 'niter', 'entries', 'rnorm']
+    print(' '.join(f'{c:>12}' for c in columns))
+    for name, (nnz, run) in runs.items():
+        t0 = time()
+        x, istop, niter, _ = run()
+        t1 = time()
+        rnorm = aks.norm(b - A(x))
+        flag = '' if istop < 4 else ' (not converged)'
+        # matrix entries touched by the iterations, the work saved or not
+        print(f'{name:>12} {nnz:>12,} {t1 - t0:>12.3f} {niter:>12} '
+              f'{niter * nnz:>12,} {rnorm:>12.2e}{flag}')
+
+    ak.clear()
+
+
+if __name__ == '__main__':
+    main()